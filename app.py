@@ -6,11 +6,13 @@ Interface visual para análise de vídeo com IA.
 
 import streamlit as st
 import os
+import shutil
 import json
 from pathlib import Path
 import time
 from datetime import datetime
 
+from src.io.buffer_source import BufferSource
 from src.pipeline.inference import InferencePipeline
 from src.metrics.reporter import Reporter
 
@@ -203,10 +205,10 @@ def process_video(uploaded_file, save_preview, face_backend, emotion_backend):
     os.makedirs("temp", exist_ok=True)
     os.makedirs("outputs", exist_ok=True)
     
-    # Salvar arquivo temporariamente
-    temp_video_path = f"temp/{uploaded_file.name}"
-    with open(temp_video_path, "wb") as f:
-        f.write(uploaded_file.getbuffer())
+    # Expor o upload ao OpenCV com uma cópia em blocos para temp/: o
+    # Streamlit mantém o upload em RAM, então um memfd dobraria o pico de
+    # memória (o page cache do arquivo pode ser despejado)
+    source = BufferSource(uploaded_file, name=uploaded_file.name, temp_dir="temp")
     
     # Caminho do vídeo de saída
     output_video_path = None
@@ -223,11 +225,13 @@ def process_video(uploaded_file, save_preview, face_backend, emotion_backend):
         # Criar pipeline
         status_text.text("Inicializando pipeline...")
         pipeline = InferencePipeline(
-            video_path=temp_video_path,
+            video_path=source.path,
             output_video_path=output_video_path,
             save_preview=save_preview,
             face_backend=face_backend,
-            emotion_backend=emotion_backend
+            emotion_backend=emotion_backend,
+            # H.264 via ffmpeg, se disponível: o st.video não reproduz mp4v
+            writer_backend="ffmpeg" if shutil.which("ffmpeg") else "opencv"
         )
         
         progress_bar.progress(10)
@@ -238,8 +242,9 @@ def process_video(uploaded_file, save_preview, face_backend, emotion_backend):
         # Criar container para logs
         with st.expander("📋 Log de Processamento", expanded=False):
             log_placeholder = st.empty()
-            
+        
         summary = pipeline.run()
+        summary['video_path'] = uploaded_file.name
         
         progress_bar.progress(90)
         status_text.text("Gerando relatórios...")
@@ -254,15 +259,14 @@ def process_video(uploaded_file, save_preview, face_backend, emotion_backend):
         # Mostrar resultados
         time.sleep(0.5)
         show_results(summary, report_files, output_video_path, save_preview)
-        
+    
     except Exception as e:
         st.error(f"❌ Erro durante processamento: {str(e)}")
         st.exception(e)
     
     finally:
-        # Limpar arquivo temporário
-        if os.path.exists(temp_video_path):
-            os.remove(temp_video_path)
+        # Liberar memfd ou remover arquivo temporário
+        source.close()
 
 
 def show_results(summary, report_files, output_video_path, save_preview):
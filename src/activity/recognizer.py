@@ -9,9 +9,10 @@ from typing import List, Dict, Optional, Tuple
 from collections import deque
 import math
 
-import cv2
 import numpy as np
 
+from src.utils.frame_context import FrameContext
+
 
 @dataclass
 class ActivityEvent:
@@ -92,8 +93,8 @@ class ActivityRecognizer:
         self.stride = stride
         self.confidence_threshold = confidence_threshold
         
-        # Buffer deslizante de frames e keypoints
-        self.frame_buffer: deque = deque(maxlen=window_size)
+        # Buffer deslizante de keypoints (frames não são retidos, pois
+        # podem ser buffers reutilizados pelo VideoReader)
         self.keypoints_buffer: deque = deque(maxlen=window_size)
         self.frame_indices: deque = deque(maxlen=window_size)
         
@@ -123,13 +124,20 @@ class ActivityRecognizer:
             self._mediapipe_available = False
             self.pose_detector = None
     
-    def update(self, frame_idx: int, frame: np.ndarray) -> List[dict]:
+    def update(
+        self,
+        frame_idx: int,
+        frame: np.ndarray,
+        context: Optional[FrameContext] = None
+    ) -> List[dict]:
         """
         Atualiza o reconhecedor com novo frame e retorna eventos detectados.
         
         Args:
             frame_idx: Índice do frame atual
             frame: Frame de imagem (numpy array BGR)
+            context: Cache de conversões do frame; o RGB pode já ter sido
+                     calculado por outro estágio (opcional)
             
         Returns:
             Lista de dicionários com eventos detectados no formato:
@@ -141,13 +149,39 @@ class ActivityRecognizer:
         if frame is None or frame.size == 0:
             raise ValueError("Frame is None or empty")
         
-        self.current_frame_idx = frame_idx
+        if context is not None and context.frame is not frame:
+            raise ValueError("FrameContext does not hold the frame being analyzed")
         
         # Extrair keypoints do frame
-        keypoints = self._extract_keypoints(frame)
+        keypoints = self._extract_keypoints(frame, context)
+        
+        return self._push(frame_idx, keypoints)
+    
+    def repeat_last(self, frame_idx: int) -> List[dict]:
+        """
+        Atualiza o reconhecedor repetindo os keypoints do último frame.
+        
+        Usado em frames sem mudança visual (ex: descartados por um
+        MotionGate), mantendo a janela temporal sem executar a pose.
+        
+        Args:
+            frame_idx: Índice do frame atual
+            
+        Returns:
+            Lista de eventos detectados (mesmo formato de update())
+        """
+        keypoints = self.keypoints_buffer[-1] if self.keypoints_buffer else None
+        return self._push(frame_idx, keypoints)
+    
+    def _push(
+        self,
+        frame_idx: int,
+        keypoints: Optional[Dict[str, Tuple[float, float]]]
+    ) -> List[dict]:
+        """Adiciona os keypoints de um frame à janela e analisa se for a hora."""
+        self.current_frame_idx = frame_idx
         
         # Adicionar ao buffer
-        self.frame_buffer.append(frame)
         self.keypoints_buffer.append(keypoints)
         self.frame_indices.append(frame_idx)
         
@@ -162,7 +196,7 @@ class ActivityRecognizer:
     def _should_analyze(self) -> bool:
         """Verifica se deve analisar a janela atual."""
         # Buffer deve estar cheio
-        if len(self.frame_buffer) < self.window_size:
+        if len(self.keypoints_buffer) < self.window_size:
             return False
         
         # Respeitar stride
@@ -171,12 +205,17 @@ class ActivityRecognizer:
         
         return True
     
-    def _extract_keypoints(self, frame: np.ndarray) -> Optional[Dict[str, Tuple[float, float]]]:
+    def _extract_keypoints(
+        self,
+        frame: np.ndarray,
+        context: Optional[FrameContext] = None
+    ) -> Optional[Dict[str, Tuple[float, float]]]:
         """
         Extrai keypoints do frame usando MediaPipe Pose.
         
         Args:
             frame: Frame de imagem
+            context: Cache de conversões do frame (opcional)
             
         Returns:
             Dicionário com keypoints ou None se não detectar pose
@@ -186,8 +225,8 @@ class ActivityRecognizer:
             return self._generate_dummy_keypoints()
         
         try:
-            # Converter BGR para RGB
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            # Converter BGR para RGB (ou reaproveitar a conversão do contexto)
+            rgb_frame = (context or FrameContext(frame)).rgb()
             
             # Detectar pose
             results = self.pose_detector.process(rgb_frame)
@@ -503,11 +542,10 @@ class ActivityRecognizer:
     
     def get_buffer_size(self) -> int:
         """Retorna o tamanho atual do buffer."""
-        return len(self.frame_buffer)
+        return len(self.keypoints_buffer)
     
     def reset(self):
         """Reseta o estado do reconhecedor."""
-        self.frame_buffer.clear()
         self.keypoints_buffer.clear()
         self.frame_indices.clear()
         self.current_frame_idx = 0
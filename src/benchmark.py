@@ -0,0 +1,184 @@
+"""
+Benchmark Script - Tech Challenge Fase 4
+
+Mede a vazão e a latência da detecção de faces em lotes (micro-batching)
+para vários tamanhos de lote, sobre frames de um vídeo carregados em
+memória.
+"""
+
+import argparse
+import sys
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.face.detector import FaceDetector
+from src.io.video_reader import VideoReader
+
+
+def parse_args():
+    """Parse argumentos da linha de comando."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark de detecção em lotes - Tech Challenge Fase 4",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos de uso:
+  # Curva vazão x latência do deepface para lotes de 1 a 16 frames
+  python -m src.benchmark --video input.mp4 --batch-sizes 1 2 4 8 16
+  
+  # Frames reduzidos, prazo de 50 ms por lote
+  python -m src.benchmark --video input.mp4 --max-side 640 --wait-ms 50
+        """
+    )
+    
+    parser.add_argument(
+        '--video',
+        type=str,
+        required=True,
+        help='Vídeo de onde os frames são lidos'
+    )
+    
+    parser.add_argument(
+        '--backend',
+        type=str,
+        default='deepface',
+        choices=['deepface', 'face_recognition', 'opencv'],
+        help='Backend de detecção; os lotes se aplicam ao deepface (default: deepface)'
+    )
+    
+    parser.add_argument(
+        '--batch-sizes',
+        type=int,
+        nargs='+',
+        default=[1, 2, 4, 8, 16],
+        help='Tamanhos de lote medidos (default: 1 2 4 8 16)'
+    )
+    
+    parser.add_argument(
+        '--wait-ms',
+        type=float,
+        default=20.0,
+        help='Espera máxima em ms para completar um lote (default: 20)'
+    )
+    
+    parser.add_argument(
+        '--frames',
+        type=int,
+        default=120,
+        help='Frames lidos do início do vídeo (default: 120)'
+    )
+    
+    parser.add_argument(
+        '--max-side',
+        type=int,
+        default=None,
+        help='Reduzir os frames para este lado maior (default: resolução original)'
+    )
+    
+    return parser.parse_args()
+
+
+def load_frames(video_path: str, count: int, max_side: Optional[int] = None) -> List[np.ndarray]:
+    """Lê até `count` frames do início do vídeo para a memória."""
+    frames = []
+    reader = VideoReader(video_path, max_side=max_side)
+    try:
+        for _, frame, _ in reader:
+            frames.append(frame.copy())
+            if len(frames) >= count:
+                break
+    finally:
+        reader.release()
+    return frames
+
+
+def measure(detector: FaceDetector, frames: List[np.ndarray], in_flight: int) -> Dict[str, Any]:
+    """
+    Detecta os frames com até `in_flight` pendentes e mede o tempo.
+    
+    A latência de cada frame vai do submit() até o resultado ficar pronto,
+    incluindo a espera pelo lote.
+    
+    Returns:
+        Dicionário com vazão (frames/s) e latências média e p95 (ms)
+    """
+    submitted = [0.0] * len(frames)
+    done = [0.0] * len(frames)
+    
+    def on_done(i: int):
+        return lambda _: done.__setitem__(i, time.perf_counter())
+    
+    pending: deque = deque()
+    start = time.perf_counter()
+    for i, frame in enumerate(frames):
+        submitted[i] = time.perf_counter()
+        future = detector.submit(frame)
+        future.add_done_callback(on_done(i))
+        pending.append(future)
+        if len(pending) >= in_flight:
+            pending.popleft().result()
+    while pending:
+        pending.popleft().result()
+    elapsed = time.perf_counter() - start
+    
+    latencies = (np.array(done) - np.array(submitted)) * 1000.0
+    return {
+        'fps': len(frames) / elapsed,
+        'latency_ms': float(latencies.mean()),
+        'latency_p95_ms': float(np.percentile(latencies, 95))
+    }
+
+
+def main():
+    """Função principal."""
+    args = parse_args()
+    
+    if any(size < 1 for size in args.batch_sizes):
+        print("❌ Erro: --batch-sizes devem ser >= 1")
+        sys.exit(1)
+    
+    try:
+        frames = load_frames(args.video, args.frames, args.max_side)
+    except Exception as e:
+        print(f"❌ Erro ao ler o vídeo: {e}")
+        sys.exit(1)
+    
+    if not frames:
+        print("❌ Erro: nenhum frame lido")
+        sys.exit(1)
+    
+    height, width = frames[0].shape[:2]
+    print(f"⏱️  {len(frames)} frames {width}x{height}, backend {args.backend}, espera {args.wait_ms:.0f} ms")
+    print()
+    print(f"{'lote':>6} {'frames/s':>10} {'lat. média':>12} {'lat. p95':>10} {'lote médio':>11}")
+    
+    for batch_size in args.batch_sizes:
+        try:
+            detector = FaceDetector(
+                backend=args.backend,
+                frame_workers=1,
+                batch_size=batch_size,
+                batch_wait_ms=args.wait_ms
+            )
+        except RuntimeError as e:
+            print(f"❌ Erro: {e}")
+            sys.exit(1)
+        
+        try:
+            # Aquecimento: carga do modelo fora da medição
+            detector.detect_batch(frames[0])
+            result = measure(detector, frames, in_flight=2 * batch_size)
+            mean_batch = detector.mean_batch_size() or 1.0
+        finally:
+            detector.close()
+        
+        print(
+            f"{batch_size:>6} {result['fps']:>10.1f} {result['latency_ms']:>9.1f} ms "
+            f"{result['latency_p95_ms']:>7.1f} ms {mean_batch:>11.1f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
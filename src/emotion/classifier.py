@@ -5,11 +5,13 @@ Implementa classificação de emoções faciais usando DeepFace.
 """
 
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 import cv2
 import numpy as np
 
+from src.utils.boxes import clip_boxes
+
 
 @dataclass
 class EmotionResult:
@@ -126,7 +128,7 @@ class EmotionClassifier:
         
         Args:
             frame: Frame de imagem (numpy array BGR)
-            faces: Lista de objetos Face detectados
+            faces: Lista de objetos Face detectados ou FaceBatch
             
         Returns:
             Lista de EmotionResult com emoções detectadas
@@ -142,10 +144,18 @@ class EmotionClassifier:
         
         results = []
         
+        # Recortes de todas as faces limitados ao frame de uma vez (uma
+        # FaceBatch já traz as boxes em um array)
+        boxes = getattr(faces, 'boxes', None)
+        if boxes is None:
+            boxes = [face.box for face in faces]
+        frame_h, frame_w = frame.shape[:2]
+        crops = clip_boxes(boxes, (frame_w, frame_h)).tolist()
+        
         # Processar cada face individualmente
-        for face in faces:
+        for box, crop in zip(np.asarray(boxes).tolist(), crops):
             try:
-                emotion_result = self._predict_single_face(frame, face)
+                emotion_result = self._predict_single_face(frame, tuple(box), crop)
                 if emotion_result:
                     results.append(emotion_result)
             except Exception as e:
@@ -158,27 +168,26 @@ class EmotionClassifier:
     def _predict_single_face(
         self,
         frame: np.ndarray,
-        face
+        box: Tuple[int, int, int, int],
+        crop: Optional[List[int]] = None
     ) -> Optional[EmotionResult]:
         """
         Prediz emoção para uma única face.
         
         Args:
             frame: Frame completo
-            face: Objeto Face com informações da detecção
+            box: Bounding box da face (x, y, width, height)
+            crop: Box da face já limitada ao frame; calculada a partir de
+                  box se omitida
             
         Returns:
             EmotionResult ou None se falhar
         """
-        # Extrair região da face
-        x, y, w, h = face.box
-        
-        # Garantir que coordenadas estão dentro dos limites
-        frame_h, frame_w = frame.shape[:2]
-        x = max(0, min(x, frame_w - 1))
-        y = max(0, min(y, frame_h - 1))
-        w = max(1, min(w, frame_w - x))
-        h = max(1, min(h, frame_h - y))
+        # Extrair região da face, dentro dos limites do frame
+        if crop is None:
+            frame_h, frame_w = frame.shape[:2]
+            crop = clip_boxes([box], (frame_w, frame_h))[0].tolist()
+        x, y, w, h = crop
         
         # Recortar face
         face_roi = frame[y:y+h, x:x+w]
@@ -187,11 +196,15 @@ class EmotionClassifier:
         if face_roi.size == 0 or face_roi.shape[0] < 10 or face_roi.shape[1] < 10:
             return None
         
+        # Frames decodificados em cinza: converter só o recorte da face
+        if face_roi.ndim == 2:
+            face_roi = cv2.cvtColor(face_roi, cv2.COLOR_GRAY2BGR)
+        
         # Classificar emoção baseado no backend
         if self.backend == "deepface" and self._model_loaded:
-            return self._predict_with_deepface(face_roi, face.box)
+            return self._predict_with_deepface(face_roi, box)
         else:
-            return self._predict_fallback(face.box)
+            return self._predict_fallback(box)
     
     def _predict_with_deepface(
         self,
@@ -0,0 +1,183 @@
+"""
+Micro Batcher Module
+
+Implementa a classe MicroBatcher, que agrupa chamadas individuais em lotes
+(até B itens ou T milissegundos de espera) e executa cada lote com uma
+única chamada, devolvendo o resultado de cada item em um Future.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+
+# Sinal de encerramento da thread de lotes
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Agrupa itens enviados um a um em lotes processados de uma vez.
+    
+    Uma thread dedicada retira o primeiro item da fila e continua
+    juntando itens até completar `max_batch` ou até `max_wait_ms` desde o
+    primeiro item, o que vier antes. O lote é passado a `fn`, que deve
+    devolver uma lista de resultados na mesma ordem; cada resultado vai
+    para o Future do respectivo item. Se `fn` falhar, a exceção é repassada
+    a todos os Futures do lote.
+    
+    Com `max_batch` itens sempre pendentes (ex: o pipeline com frames à
+    frente), os lotes saem cheios sem esperar o prazo; o prazo limita a
+    latência quando chegam menos itens.
+    
+    Attributes:
+        max_batch (int): Tamanho máximo de um lote
+        max_wait_ms (float): Espera máxima por mais itens (ms)
+        batches (int): Lotes executados
+        items (int): Itens processados
+    
+    Example:
+        >>> batcher = MicroBatcher(model.predict_many, max_batch=8, max_wait_ms=20)
+        >>> future = batcher.submit(frame)
+        >>> result = future.result()
+        >>> batcher.close()
+    """
+    
+    def __init__(
+        self,
+        fn: Callable[[List[Any]], List[Any]],
+        max_batch: int = 8,
+        max_wait_ms: float = 20.0,
+        name: str = "MicroBatcher"
+    ) -> None:
+        """
+        Inicializa o agrupador (a thread é criada no primeiro submit).
+        
+        Args:
+            fn: Processa uma lista de itens e devolve um resultado por item
+            max_batch: Tamanho máximo de um lote
+            max_wait_ms: Espera máxima (ms) por mais itens após o primeiro
+            name: Nome da thread de lotes
+        
+        Raises:
+            ValueError: Se max_batch ou max_wait_ms forem inválidos
+        """
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be >= 1, got {max_batch}")
+        
+        if max_wait_ms < 0:
+            raise ValueError(f"max_wait_ms must be >= 0, got {max_wait_ms}")
+        
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.name = name
+        self.batches = 0
+        self.items = 0
+        
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    def submit(self, item: Any) -> Future:
+        """
+        Enfileira um item para o próximo lote.
+        
+        Args:
+            item: Item a processar
+        
+        Returns:
+            Future com o resultado do item
+        
+        Raises:
+            RuntimeError: Se o agrupador já foi encerrado
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._queue.put((item, future))
+        return future
+    
+    def _collect(self, first: Tuple[Any, Future]) -> Tuple[List[Tuple[Any, Future]], bool]:
+        """
+        Junta itens ao primeiro até completar o lote ou esgotar o prazo.
+        
+        Returns:
+            Lote e se o encerramento foi pedido durante a coleta
+        """
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+    
+    def _run(self) -> None:
+        """Loop da thread de lotes."""
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            
+            batch, stop = self._collect(first)
+            self._execute(batch)
+            if stop:
+                return
+    
+    def _execute(self, batch: List[Tuple[Any, Future]]) -> None:
+        """Executa um lote e distribui os resultados."""
+        # Futures cancelados saem do lote antes da execução
+        batch = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        
+        try:
+            results = self.fn([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"Batch function returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        
+        self.batches += 1
+        self.items += len(batch)
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+    
+    def mean_batch_size(self) -> float:
+        """Tamanho médio dos lotes executados."""
+        return self.items / self.batches if self.batches else 0.0
+    
+    def close(self) -> None:
+        """Processa os itens pendentes e encerra a thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            if thread is not None:
+                self._queue.put(_STOP)
+        
+        if thread is not None:
+            thread.join()
+    
+    def __repr__(self) -> str:
+        """Representação em string do MicroBatcher."""
+        return (
+            f"MicroBatcher(max_batch={self.max_batch}, max_wait_ms={self.max_wait_ms}, "
+            f"batches={self.batches})"
+        )
@@ -4,12 +4,22 @@ Face Detector Module
 Implementa detecção de faces usando múltiplos backends (face_recognition, deepface, opencv).
 """
 
+import math
+import os
+import threading
+from collections import deque
+from itertools import chain
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional, Sequence, Union
 
 import cv2
 import numpy as np
 
+from src.face.batcher import MicroBatcher
+from src.utils.boxes import nms, scale_boxes
+from src.utils.frame_context import FrameContext
+
 
 @dataclass
 class Face:
@@ -21,10 +31,13 @@ class Face:
         score: Confiança da detecção (0.0 a 1.0)
         landmarks: Pontos faciais chave, dict com nomes dos pontos e coordenadas (x, y)
                   Ex: {'left_eye': (x, y), 'right_eye': (x, y), 'nose': (x, y), ...}
+        track_id: ID estável da face ao longo do vídeo, atribuído pelo
+                  FaceTracker (None sem rastreamento)
     """
     box: tuple[int, int, int, int]
     score: float
     landmarks: Optional[dict[str, tuple[int, int]]] = None
+    track_id: Optional[int] = None
     
     def __post_init__(self):
         """Valida os valores após inicialização."""
@@ -45,6 +58,315 @@ class Face:
         """Retorna a área da bounding box."""
         _, _, w, h = self.box
         return w * h
+    
+    def scaled(self, factor: float) -> "Face":
+        """
+        Retorna uma cópia com box e landmarks multiplicados por `factor`.
+        
+        Usado para projetar detecções feitas em um frame reduzido de volta
+        para as coordenadas do frame original (factor = 1 / escala).
+        
+        Args:
+            factor: Fator multiplicativo das coordenadas
+            
+        Returns:
+            Nova Face com coordenadas em pixels inteiros
+        """
+        x, y, w, h = self.box
+        box = (
+            int(round(x * factor)),
+            int(round(y * factor)),
+            int(round(w * factor)),
+            int(round(h * factor))
+        )
+        
+        landmarks = None
+        if self.landmarks:
+            landmarks = {
+                name: (int(round(px * factor)), int(round(py * factor)))
+                for name, (px, py) in self.landmarks.items()
+            }
+        
+        return Face(box=box, score=self.score, landmarks=landmarks, track_id=self.track_id)
+
+
+FaceResult = Union["FaceBatch", list[Face]]
+
+
+def scale_faces(faces: list[Face], factor: float) -> list[Face]:
+    """
+    Versão em lote de Face.scaled: as boxes de todas as faces são escaladas
+    de uma vez, com NumPy.
+    
+    Args:
+        faces: Faces a escalar
+        factor: Fator multiplicativo das coordenadas
+    
+    Returns:
+        Novas faces com coordenadas em pixels inteiros
+    """
+    if not faces:
+        return []
+    
+    boxes = scale_boxes([face.box for face in faces], factor).tolist()
+    scaled = []
+    for face, box in zip(faces, boxes):
+        landmarks = None
+        if face.landmarks:
+            landmarks = {
+                name: (int(round(px * factor)), int(round(py * factor)))
+                for name, (px, py) in face.landmarks.items()
+            }
+        scaled.append(Face(box=tuple(box), score=face.score, landmarks=landmarks, track_id=face.track_id))
+    return scaled
+
+
+class FaceBatch:
+    """
+    Faces de um frame em formato colunar (structure of arrays).
+    
+    Alternativa compacta a uma lista de Face para o caminho quente da
+    detecção: as coordenadas ficam em arrays NumPy contíguos, validados de
+    uma vez, e operações como escala, deslocamento e seleção (NMS) são
+    vetorizadas. Para compatibilidade, a batch se comporta como uma
+    sequência de Face: indexar ou iterar cria views Face sob demanda.
+    
+    Attributes:
+        boxes (np.ndarray): Boxes N×4 int32 (x, y, width, height)
+        scores (np.ndarray): Confianças N float32 (0.0 a 1.0)
+        landmarks (Optional[np.ndarray]): Pontos N×K×2 float32 (NaN onde
+                                          a face não tem o ponto)
+        landmark_names (tuple): Nomes dos K pontos, na ordem do array
+        track_ids (np.ndarray): IDs de rastreamento N int64 (-1 = nenhum)
+    
+    Example:
+        >>> batch = detector.detect_batch(frame)
+        >>> batch.boxes[:, 2:].prod(axis=1)  # áreas
+        >>> for face in batch:  # views Face
+        ...     print(face.box)
+    """
+    
+    def __init__(
+        self,
+        boxes: np.ndarray,
+        scores: np.ndarray,
+        landmarks: Optional[np.ndarray] = None,
+        landmark_names: Sequence[str] = (),
+        track_ids: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Cria a batch a partir dos arrays (copiados apenas se preciso).
+        
+        Args:
+            boxes: N boxes (x, y, width, height)
+            scores: N confianças
+            landmarks: Pontos N×K×2 (opcional)
+            landmark_names: Nomes dos K pontos
+            track_ids: N IDs de rastreamento (opcional, -1 = nenhum)
+        
+        Raises:
+            ValueError: Se os arrays forem inconsistentes ou algum score
+                        estiver fora de [0, 1]
+        """
+        self.boxes = np.asarray(boxes, dtype=np.int32).reshape(-1, 4)
+        self.scores = np.asarray(scores, dtype=np.float32).reshape(-1)
+        count = len(self.boxes)
+        
+        if len(self.scores) != count:
+            raise ValueError(f"Got {count} boxes and {len(self.scores)} scores")
+        
+        if count and (self.scores.min() < 0.0 or self.scores.max() > 1.0):
+            raise ValueError("Score must be between 0.0 and 1.0")
+        
+        self.landmark_names = tuple(landmark_names)
+        self.landmarks = None
+        if landmarks is not None and self.landmark_names:
+            self.landmarks = np.asarray(landmarks, dtype=np.float32).reshape(
+                count, len(self.landmark_names), 2
+            )
+        
+        if track_ids is None:
+            self.track_ids = np.full(count, -1, dtype=np.int64)
+        else:
+            self.track_ids = np.asarray(track_ids, dtype=np.int64).reshape(-1)
+            if len(self.track_ids) != count:
+                raise ValueError(f"Got {count} boxes and {len(self.track_ids)} track IDs")
+    
+    @classmethod
+    def empty(cls) -> "FaceBatch":
+        """Batch sem faces."""
+        return cls(np.zeros((0, 4), dtype=np.int32), np.zeros(0, dtype=np.float32))
+    
+    @classmethod
+    def from_faces(cls, faces: Union["FaceBatch", Sequence[Face]]) -> "FaceBatch":
+        """
+        Converte uma sequência de Face (ou devolve a própria batch).
+        
+        Args:
+            faces: Faces (os landmarks são alinhados pela união dos nomes)
+        
+        Returns:
+            FaceBatch com as mesmas faces, na mesma ordem
+        """
+        if isinstance(faces, FaceBatch):
+            return faces
+        
+        if not faces:
+            return cls.empty()
+        
+        names: list[str] = []
+        for face in faces:
+            if face.landmarks:
+                names.extend(name for name in face.landmarks if name not in names)
+        
+        landmarks = None
+        if names:
+            column = {name: k for k, name in enumerate(names)}
+            landmarks = np.full((len(faces), len(names), 2), np.nan, dtype=np.float32)
+            for i, face in enumerate(faces):
+                for name, point in (face.landmarks or {}).items():
+                    landmarks[i, column[name]] = point
+        
+        return cls(
+            boxes=[face.box for face in faces],
+            scores=[face.score for face in faces],
+            landmarks=landmarks,
+            landmark_names=names,
+            track_ids=[-1 if face.track_id is None else face.track_id for face in faces]
+        )
+    
+    @classmethod
+    def concatenate(cls, batches: Sequence["FaceBatch"]) -> "FaceBatch":
+        """
+        Junta várias batches (ex: tiles) em uma, na ordem recebida.
+        
+        Args:
+            batches: Batches a juntar
+        
+        Returns:
+            FaceBatch com todas as faces
+        """
+        batches = [batch for batch in batches if len(batch)]
+        if not batches:
+            return cls.empty()
+        if len(batches) == 1:
+            return batches[0]
+        
+        names: list[str] = []
+        for batch in batches:
+            names.extend(name for name in batch.landmark_names if name not in names)
+        
+        landmarks = None
+        if names:
+            parts = []
+            for batch in batches:
+                part = np.full((len(batch), len(names), 2), np.nan, dtype=np.float32)
+                if batch.landmarks is not None:
+                    columns = [names.index(name) for name in batch.landmark_names]
+                    part[:, columns] = batch.landmarks
+                parts.append(part)
+            landmarks = np.concatenate(parts)
+        
+        return cls(
+            boxes=np.concatenate([batch.boxes for batch in batches]),
+            scores=np.concatenate([batch.scores for batch in batches]),
+            landmarks=landmarks,
+            landmark_names=names,
+            track_ids=np.concatenate([batch.track_ids for batch in batches])
+        )
+    
+    def _replace(self, **arrays) -> "FaceBatch":
+        """Nova batch com alguns arrays trocados (sem revalidar scores)."""
+        batch = FaceBatch.__new__(FaceBatch)
+        batch.boxes = arrays.get('boxes', self.boxes)
+        batch.scores = arrays.get('scores', self.scores)
+        batch.landmarks = arrays.get('landmarks', self.landmarks)
+        batch.landmark_names = self.landmark_names
+        batch.track_ids = arrays.get('track_ids', self.track_ids)
+        return batch
+    
+    def scaled(self, factor: float) -> "FaceBatch":
+        """Versão em lote de Face.scaled (boxes e landmarks × factor)."""
+        landmarks = None
+        if self.landmarks is not None:
+            landmarks = self.landmarks * np.float32(factor)
+        return self._replace(boxes=scale_boxes(self.boxes, factor), landmarks=landmarks)
+    
+    def translated(self, dx: int, dy: int) -> "FaceBatch":
+        """Desloca boxes e landmarks por (dx, dy), ex: de um tile para o frame."""
+        offset = np.array([dx, dy], dtype=np.int32)
+        boxes = self.boxes.copy()
+        boxes[:, :2] += offset
+        landmarks = None
+        if self.landmarks is not None:
+            landmarks = self.landmarks + offset.astype(np.float32)
+        return self._replace(boxes=boxes, landmarks=landmarks)
+    
+    def select(self, indices: Union[np.ndarray, Sequence[int]]) -> "FaceBatch":
+        """Subconjunto das faces nos índices dados (ex: saída de nms())."""
+        indices = np.asarray(indices, dtype=np.int64)
+        return self._replace(
+            boxes=self.boxes[indices],
+            scores=self.scores[indices],
+            landmarks=None if self.landmarks is None else self.landmarks[indices],
+            track_ids=self.track_ids[indices]
+        )
+    
+    def with_track_ids(self, track_ids: Union[np.ndarray, Sequence[int]]) -> "FaceBatch":
+        """Cópia com os IDs de rastreamento dados."""
+        track_ids = np.asarray(track_ids, dtype=np.int64).reshape(-1)
+        if len(track_ids) != len(self):
+            raise ValueError(f"Got {len(self)} faces and {len(track_ids)} track IDs")
+        return self._replace(track_ids=track_ids)
+    
+    @property
+    def areas(self) -> np.ndarray:
+        """Áreas N das boxes."""
+        return self.boxes[:, 2].astype(np.int64) * self.boxes[:, 3]
+    
+    def track_id_list(self) -> list[Optional[int]]:
+        """IDs de rastreamento como lista (None onde não há ID)."""
+        return [None if track_id < 0 else track_id for track_id in self.track_ids.tolist()]
+    
+    def __len__(self) -> int:
+        """Número de faces."""
+        return len(self.boxes)
+    
+    def __getitem__(self, index: int) -> Face:
+        """View Face da face `index` (sem revalidar os valores)."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("FaceBatch index out of range")
+        
+        landmarks = None
+        if self.landmarks is not None:
+            points = self.landmarks[index]
+            landmarks = {
+                name: (int(round(float(x))), int(round(float(y))))
+                for name, (x, y) in zip(self.landmark_names, points.tolist())
+                if not (np.isnan(x) or np.isnan(y))
+            } or None
+        
+        track_id = int(self.track_ids[index])
+        face = Face.__new__(Face)
+        face.box = tuple(self.boxes[index].tolist())
+        face.score = float(self.scores[index])
+        face.landmarks = landmarks
+        face.track_id = None if track_id < 0 else track_id
+        return face
+    
+    def __iter__(self) -> Iterator[Face]:
+        """Itera sobre views Face."""
+        return (self[i] for i in range(len(self)))
+    
+    def to_faces(self) -> list[Face]:
+        """Lista de Face equivalente."""
+        return list(self)
+    
+    def __repr__(self) -> str:
+        """Representação em string da FaceBatch."""
+        return f"FaceBatch(faces={len(self)}, landmarks={list(self.landmark_names)})"
 
 
 class FaceDetector:
@@ -64,17 +386,124 @@ class FaceDetector:
         ...     print(f"Face at ({x}, {y}) with confidence {face.score:.2f}")
     """
     
-    def __init__(self, backend: str = "auto", model: str = "hog"):
+    # Margem da janela de busca em torno de cada face (fração do lado)
+    ROI_MARGIN = 0.5
+    
+    # Faixa de tamanhos buscada em cada janela, relativa à face anterior
+    ROI_MIN_SIZE = 0.7
+    ROI_MAX_SIZE = 1.4
+    
+    # IoU acima do qual detecções de tiles vizinhos são a mesma face
+    TILE_NMS_IOU = 0.3
+    
+    # Menor face (pixels) buscada pela cascata Haar, inclusive na passada
+    # reduzida dos tiles
+    MIN_FACE_SIZE = 30
+    
+    # Landmarks do backend face_recognition: (nome, feature de origem,
+    # redução), com 'mean' = centroide dos pontos e 'middle' = ponto do meio
+    FACE_RECOGNITION_FEATURES = (
+        ('left_eye', 'left_eye', 'mean'),
+        ('right_eye', 'right_eye', 'mean'),
+        ('nose', 'nose_tip', 'middle'),
+        ('mouth_top', 'top_lip', 'middle'),
+        ('mouth_bottom', 'bottom_lip', 'middle'),
+    )
+    LANDMARK_NAMES = tuple(name for name, _, _ in FACE_RECOGNITION_FEATURES)
+    
+    def __init__(
+        self,
+        backend: str = "auto",
+        model: str = "hog",
+        full_scan_interval: int = 1,
+        tile_size: Optional[int] = None,
+        tile_overlap: float = 0.25,
+        tile_workers: Optional[int] = None,
+        frame_workers: Optional[int] = None,
+        batch_size: int = 1,
+        batch_wait_ms: float = 20.0
+    ):
         """
         Inicializa o detector de faces.
         
         Args:
             backend: Backend a usar ('auto', 'face_recognition', 'deepface', 'opencv')
             model: Modelo a usar ('hog', 'cnn' para face_recognition)
+            full_scan_interval: Backend opencv: varrer o frame inteiro apenas
+                                a cada N chamadas; nas demais, buscar só em
+                                janelas ao redor das faces anteriores, no
+                                tamanho delas (1 = sempre o frame inteiro)
+            tile_size: Se definido, frames maiores que isso são varridos em
+                       tiles sobrepostos de tile_size pixels, em paralelo e
+                       na resolução original (faces pequenas em 4K), mais
+                       uma passada reduzida para faces grandes. Aumentado
+                       por frame quando pequeno demais para a sobreposição
+                       alcançar a menor face da passada reduzida
+            tile_overlap: Sobreposição entre tiles vizinhos (fração do tile,
+                          maior que 0)
+            tile_workers: Threads da varredura em tiles (padrão: CPUs)
+            frame_workers: Threads de submit()/detect_many(), que detectam
+                           vários frames ao mesmo tempo (padrão: CPUs)
+            batch_size: Backend deepface: frames agrupados por chamada em
+                        submit()/detect_many() (1 = frame a frame)
+            batch_wait_ms: Espera máxima (ms) para completar um lote
+        
+        Raises:
+            ValueError: Se full_scan_interval, as opções de tile, de lote
+                        ou frame_workers forem inválidos
         """
+        if full_scan_interval < 1:
+            raise ValueError(f"full_scan_interval must be >= 1, got {full_scan_interval}")
+        
+        if tile_size is not None and tile_size < 64:
+            raise ValueError(f"tile_size must be >= 64, got {tile_size}")
+        
+        if not 0.0 < tile_overlap < 1.0:
+            raise ValueError(f"tile_overlap must be in (0, 1), got {tile_overlap}")
+        
+        if tile_workers is not None and tile_workers < 1:
+            raise ValueError(f"tile_workers must be >= 1, got {tile_workers}")
+        
+        if frame_workers is not None and frame_workers < 1:
+            raise ValueError(f"frame_workers must be >= 1, got {frame_workers}")
+        
+        if batch_size < 1 or batch_wait_ms < 0:
+            raise ValueError(
+                f"batch_size must be >= 1 and batch_wait_ms >= 0, got {batch_size}, {batch_wait_ms}"
+            )
+        
         self.backend = backend
         self.model = model
+        self.full_scan_interval = full_scan_interval
+        self.tile_size = tile_size
+        self.tile_overlap = tile_overlap
+        self.tile_workers = tile_workers or os.cpu_count() or 1
+        self.frame_workers = frame_workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_wait_ms = batch_wait_ms
         self._detector = None
+        self._cascade_path: Optional[str] = None
+        
+        # Pool da varredura em tiles (criado no primeiro uso); cada thread
+        # do pool tem a própria instância da cascata
+        self._tile_executor: Optional[ThreadPoolExecutor] = None
+        self._local = threading.local()
+        
+        # Pool de detecção de vários frames (criado no primeiro submit);
+        # cada thread do pool tem o próprio FaceDetector
+        self._frame_executor: Optional[ThreadPoolExecutor] = None
+        self._frame_detectors: list["FaceDetector"] = []
+        self._frame_lock = threading.Lock()
+        
+        # Lotes do deepface (criados no primeiro submit com batch_size > 1)
+        self._batcher: Optional[MicroBatcher] = None
+        self._deepface_accepts_lists: Optional[bool] = None
+        
+        # Busca incremental (opencv): boxes da última chamada e varreduras
+        self._previous_boxes = np.zeros((0, 4), dtype=np.int32)
+        self._previous_shape: Optional[tuple] = None
+        self._since_full_scan = 0
+        self.full_scans = 0
         
         # Tentar inicializar o backend
         self._initialize_backend()
@@ -125,184 +554,677 @@ class FaceDetector:
         """Inicializa o detector OpenCV Haar Cascade."""
         # Usar o classificador Haar Cascade pré-treinado do OpenCV
         cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+        self._cascade_path = cascade_path
         self._detector = cv2.CascadeClassifier(cascade_path)
         
         if self._detector.empty():
             raise RuntimeError("Failed to load OpenCV Haar Cascade classifier")
     
-    def detect(self, frame: np.ndarray) -> list[Face]:
+    def detect(
+        self,
+        frame: np.ndarray,
+        scale: float = 1.0,
+        context: Optional[FrameContext] = None
+    ) -> list[Face]:
         """
         Detecta faces em um frame.
         
         Args:
             frame: Frame de imagem (numpy array BGR)
+            scale: Fator com que `frame` foi reduzido em relação ao vídeo
+                   original (ex: VideoReader.scale_factor()). As boxes
+                   retornadas são projetadas de volta para o original.
+            context: Cache de conversões do frame, compartilhado com outros
+                     estágios (opcional)
             
         Returns:
             Lista de faces detectadas
             
         Raises:
-            ValueError: Se o frame for inválido
+            ValueError: Se o frame, a escala ou o contexto forem inválidos
         """
+        return self.detect_batch(frame, scale, context).to_faces()
+    
+    @staticmethod
+    def _check_frame(
+        frame: np.ndarray,
+        scale: float,
+        context: Optional[FrameContext] = None
+    ) -> None:
+        """Valida o frame, a escala e o contexto recebidos na detecção."""
         if frame is None or frame.size == 0:
             raise ValueError("Invalid frame: empty or None")
         
         if frame.ndim not in (2, 3):
             raise ValueError(f"Invalid frame dimensions: {frame.ndim}")
         
-        # Delegar para o backend apropriado
+        if scale <= 0:
+            raise ValueError(f"Scale must be > 0, got {scale}")
+        
+        if context is not None and context.frame is not frame:
+            raise ValueError("FrameContext does not hold the frame being detected")
+    
+    def detect_batch(
+        self,
+        frame: np.ndarray,
+        scale: float = 1.0,
+        context: Optional[FrameContext] = None
+    ) -> FaceBatch:
+        """
+        Detecta faces em um frame, no formato colunar.
+        
+        Mesmo resultado de detect(), sem criar um objeto Face por face:
+        usado no caminho quente do pipeline.
+        
+        Args:
+            frame: Frame de imagem (numpy array BGR)
+            scale: Fator com que `frame` foi reduzido em relação ao vídeo
+                   original; as boxes são projetadas de volta
+            context: Cache de conversões do frame (cinza, RGB, reduzido);
+                     conversões já feitas por outros estágios são
+                     reaproveitadas (opcional)
+            
+        Returns:
+            FaceBatch com as faces detectadas
+            
+        Raises:
+            ValueError: Se o frame, a escala ou o contexto forem inválidos
+        """
+        self._check_frame(frame, scale, context)
+        if context is None:
+            context = FrameContext(frame)
+        
+        # Delegar para o backend apropriado (o opencv aplica os tiles apenas
+        # nas varreduras completas; o face_recognition recebe o frame já em
+        # RGB, convertido uma vez para todos os tiles)
         if self.backend == "face_recognition":
-            return self._detect_face_recognition(frame)
+            faces = self._detect_maybe_tiled(
+                context.rgb(), self._detect_face_recognition, context=context, source='rgb'
+            )
         elif self.backend == "deepface":
-            return self._detect_deepface(frame)
+            faces = self._detect_maybe_tiled(frame, self._detect_deepface, context=context)
         elif self.backend == "opencv":
-            return self._detect_opencv(frame)
+            faces = self._detect_opencv(frame, context=context)
         else:
             raise RuntimeError(f"Backend not initialized: {self.backend}")
-    
-    def _detect_face_recognition(self, frame: np.ndarray) -> list[Face]:
-        """Detecta faces usando face_recognition."""
-        # Converter BGR para RGB (face_recognition usa RGB)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         
+        faces = FaceBatch.from_faces(faces)
+        
+        # Projetar de volta para as coordenadas do frame original
+        if scale != 1.0:
+            faces = faces.scaled(1.0 / scale)
+        
+        return faces
+    
+    def _detect_face_recognition(self, rgb_frame: np.ndarray) -> FaceBatch:
+        """Detecta faces usando face_recognition (frame já em RGB)."""
         # Detectar localizações de faces
         face_locations = self._face_recognition.face_locations(
             rgb_frame,
             model=self.model
         )
+        if not face_locations:
+            return FaceBatch.empty()
         
         # Detectar landmarks (opcional)
-        face_landmarks_list = []
-        if face_locations:
-            try:
-                face_landmarks_list = self._face_recognition.face_landmarks(
-                    rgb_frame,
-                    face_locations=face_locations
-                )
-            except Exception:
-                # Se falhar, continuar sem landmarks
-                face_landmarks_list = [None] * len(face_locations)
+        try:
+            face_landmarks_list = self._face_recognition.face_landmarks(
+                rgb_frame,
+                face_locations=face_locations
+            )
+        except Exception:
+            # Se falhar, continuar sem landmarks
+            face_landmarks_list = [None] * len(face_locations)
         
-        # Converter para objetos Face
-        faces = []
-        for i, location in enumerate(face_locations):
-            # face_locations retorna (top, right, bottom, left)
-            top, right, bottom, left = location
-            
-            # Converter para (x, y, width, height)
-            x, y = left, top
-            w, h = right - left, bottom - top
-            
-            # face_recognition não retorna score diretamente, usar 0.99 como padrão
-            score = 0.99
-            
-            # Processar landmarks se disponíveis
-            landmarks = None
-            if i < len(face_landmarks_list) and face_landmarks_list[i]:
-                landmarks = self._convert_face_recognition_landmarks(
-                    face_landmarks_list[i]
-                )
-            
-            faces.append(Face(box=(x, y, w, h), score=score, landmarks=landmarks))
+        # face_locations retorna (top, right, bottom, left); converter para
+        # (x, y, width, height) de todas as faces de uma vez
+        top, right, bottom, left = np.asarray(face_locations, dtype=np.int32).reshape(-1, 4).T
+        boxes = np.stack([left, top, right - left, bottom - top], axis=1)
         
-        return faces
+        # face_recognition não retorna score diretamente, usar 0.99 como padrão
+        return FaceBatch(
+            boxes,
+            np.full(len(boxes), 0.99, dtype=np.float32),
+            landmarks=self._face_recognition_landmarks(face_landmarks_list, len(boxes)),
+            landmark_names=self.LANDMARK_NAMES
+        )
     
-    def _convert_face_recognition_landmarks(
+    def _face_recognition_landmarks(
         self,
-        face_landmarks: dict
-    ) -> dict[str, tuple[int, int]]:
+        face_landmarks_list: list,
+        count: int
+    ) -> np.ndarray:
         """
-        Converte landmarks do face_recognition para formato simplificado.
+        Converte landmarks do face_recognition para pontos representativos.
         
-        face_recognition retorna múltiplos pontos por feature. Aqui pegamos
-        pontos representativos.
-        """
-        landmarks = {}
-        
-        # Pegar pontos médios de cada feature
-        if 'left_eye' in face_landmarks and face_landmarks['left_eye']:
-            points = face_landmarks['left_eye']
-            avg_x = sum(p[0] for p in points) // len(points)
-            avg_y = sum(p[1] for p in points) // len(points)
-            landmarks['left_eye'] = (avg_x, avg_y)
+        face_recognition retorna múltiplos pontos por feature, sempre na
+        mesma quantidade para um mesmo modelo. Os pontos de cada feature
+        de todas as faces são lidos de uma vez (np.fromiter) para um único
+        array, e os pontos representativos (LANDMARK_NAMES) saem de
+        operações vetorizadas: centroide dos olhos e ponto do meio do nariz
+        e dos lábios. Os dicts por face só são criados quando alguém lê
+        Face.landmarks.
         
-        if 'right_eye' in face_landmarks and face_landmarks['right_eye']:
-            points = face_landmarks['right_eye']
-            avg_x = sum(p[0] for p in points) // len(points)
-            avg_y = sum(p[1] for p in points) // len(points)
-            landmarks['right_eye'] = (avg_x, avg_y)
+        Args:
+            face_landmarks_list: Dicts de landmarks por face (None onde
+                                 não houver)
+            count: Número de faces
         
-        if 'nose_tip' in face_landmarks and face_landmarks['nose_tip']:
-            points = face_landmarks['nose_tip']
-            # Pegar o ponto do meio
-            landmarks['nose'] = points[len(points) // 2]
+        Returns:
+            Array N×K×2 float32 na ordem de LANDMARK_NAMES (NaN onde a
+            face não tem a feature)
+        """
+        landmarks = np.full((count, len(self.LANDMARK_NAMES), 2), np.nan, dtype=np.float32)
+        faces = face_landmarks_list[:count]
         
-        if 'top_lip' in face_landmarks and face_landmarks['top_lip']:
-            points = face_landmarks['top_lip']
-            landmarks['mouth_top'] = points[len(points) // 2]
+        for k, (_, feature, reduce) in enumerate(self.FACE_RECOGNITION_FEATURES):
+            # Faces que têm a feature (dicts ausentes ou listas vazias ficam NaN)
+            rows = [
+                i for i, face_landmarks in enumerate(faces)
+                if face_landmarks and face_landmarks.get(feature)
+            ]
+            if not rows:
+                continue
+            
+            points = [faces[i][feature] for i in rows]
+            target = slice(None) if len(rows) == count else rows
+            
+            if reduce == 'middle':
+                middle = chain.from_iterable(p[len(p) // 2] for p in points)
+                landmarks[target, k] = np.fromiter(
+                    middle, dtype=np.float32, count=2 * len(rows)
+                ).reshape(-1, 2)
+                continue
+            
+            # Centroide truncado em pixels inteiros. Um modelo sempre gera a
+            # mesma quantidade de pontos por feature; faces com quantidades
+            # diferentes (não esperado) são agrupadas por quantidade
+            size = len(points[0])
+            groups = [(target, points, size)]
+            if any(len(p) != size for p in points):
+                sizes = [len(p) for p in points]
+                groups = [
+                    ([rows[j] for j in range(len(rows)) if sizes[j] == n],
+                     [p for p in points if len(p) == n], n)
+                    for n in set(sizes)
+                ]
+            
+            for group_rows, group_points, n in groups:
+                coords = np.fromiter(
+                    chain.from_iterable(chain.from_iterable(group_points)),
+                    dtype=np.int64,
+                    count=2 * n * len(group_points)
+                )
+                landmarks[group_rows, k] = coords.reshape(-1, n, 2).sum(axis=1) // n
         
-        if 'bottom_lip' in face_landmarks and face_landmarks['bottom_lip']:
-            points = face_landmarks['bottom_lip']
-            landmarks['mouth_bottom'] = points[len(points) // 2]
+        return landmarks
+    
+    def _extract_deepface(self, images: Union[np.ndarray, list[np.ndarray]]) -> list:
+        """Chama DeepFace.extract_faces com as opções do detector."""
+        return self._deepface.extract_faces(
+            img_path=images,
+            detector_backend='opencv',  # Usar opencv como backend do deepface
+            enforce_detection=False,
+            align=False
+        )
+    
+    @staticmethod
+    def _deepface_results_to_faces(results: list) -> list[Face]:
+        """Converte os dicts de DeepFace.extract_faces de uma imagem em Faces."""
+        faces = []
+        for result in results:
+            # Extrair região facial
+            facial_area = result.get('facial_area', {})
+            x = facial_area.get('x', 0)
+            y = facial_area.get('y', 0)
+            w = facial_area.get('w', 0)
+            h = facial_area.get('h', 0)
+            
+            # Confiança
+            confidence = result.get('confidence', 0.0)
+            
+            # DeepFace não retorna landmarks facilmente neste método
+            faces.append(Face(box=(x, y, w, h), score=confidence, landmarks=None))
         
-        return landmarks if landmarks else None
+        return faces
     
     def _detect_deepface(self, frame: np.ndarray) -> list[Face]:
         """Detecta faces usando deepface."""
         try:
             # DeepFace.extract_faces retorna lista de dicts com info das faces
-            results = self._deepface.extract_faces(
-                img_path=frame,
-                detector_backend='opencv',  # Usar opencv como backend do deepface
-                enforce_detection=False,
-                align=False
-            )
-            
-            faces = []
-            for result in results:
-                # Extrair região facial
-                facial_area = result.get('facial_area', {})
-                x = facial_area.get('x', 0)
-                y = facial_area.get('y', 0)
-                w = facial_area.get('w', 0)
-                h = facial_area.get('h', 0)
-                
-                # Confiança
-                confidence = result.get('confidence', 0.0)
-                
-                # DeepFace não retorna landmarks facilmente neste método
-                faces.append(Face(box=(x, y, w, h), score=confidence, landmarks=None))
-            
-            return faces
+            return self._deepface_results_to_faces(self._extract_deepface(frame))
         
         except Exception as e:
             # Se falhar, retornar lista vazia
             return []
     
-    def _detect_opencv(self, frame: np.ndarray) -> list[Face]:
+    def _detect_deepface_many(self, frames: list[np.ndarray]) -> list[list[Face]]:
+        """
+        Detecta faces em vários frames com uma única chamada ao deepface.
+        
+        Versões do deepface que aceitam uma lista de imagens devolvem uma
+        lista de resultados por imagem, pagando o overhead de chamada uma
+        vez por lote. Se a versão instalada não aceitar listas, isso é
+        lembrado e os frames seguem um a um.
+        
+        Args:
+            frames: Frames do lote
+        
+        Returns:
+            Faces de cada frame, na ordem dos frames
+        """
+        if len(frames) > 1 and self._deepface_accepts_lists is not False:
+            try:
+                results = self._extract_deepface(list(frames))
+                if len(results) == len(frames) and all(isinstance(r, list) for r in results):
+                    self._deepface_accepts_lists = True
+                    return [self._deepface_results_to_faces(r) for r in results]
+            except Exception:
+                pass
+            
+            # Versão sem suporte a listas: lembrar (se já aceitou antes, a
+            # falha foi deste lote, que sai frame a frame)
+            if self._deepface_accepts_lists is None:
+                self._deepface_accepts_lists = False
+        
+        return [self._detect_deepface(frame) for frame in frames]
+    
+    def _detect_deepface_batch(self, items: list[tuple[np.ndarray, float]]) -> list[FaceBatch]:
+        """Processa um lote (frame, escala) do MicroBatcher."""
+        if self.tile_size is not None:
+            # Tiles já dividem cada frame em várias chamadas
+            return [self.detect_batch(frame, scale) for frame, scale in items]
+        
+        results = self._detect_deepface_many([frame for frame, _ in items])
+        batches = []
+        for faces, (_, scale) in zip(results, items):
+            faces = FaceBatch.from_faces(faces)
+            batches.append(faces if scale == 1.0 else faces.scaled(1.0 / scale))
+        return batches
+    
+    def _detect_opencv(
+        self,
+        frame: np.ndarray,
+        context: Optional[FrameContext] = None
+    ) -> FaceBatch:
         """Detecta faces usando OpenCV Haar Cascade."""
-        # Converter para grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        # Converter para grayscale (frames já em cinza, ex: ffmpeg com
+        # pix_fmt='gray', dispensam a conversão; com contexto, o cinza de
+        # outro estágio é reaproveitado)
+        if context is None:
+            context = FrameContext(frame)
+        gray = context.gray()
+        
+        detections = None
+        full_scan_due = (
+            self.full_scan_interval == 1
+            or gray.shape != self._previous_shape
+            or self._since_full_scan >= self.full_scan_interval
+        )
+        if not full_scan_due:
+            detections = self._detect_opencv_roi(gray)
         
-        # Detectar faces
-        detections = self._detector.detectMultiScale(
+        if detections is None:
+            # Varredura completa
+            detections = FaceBatch.from_faces(self._detect_maybe_tiled(
+                gray, self._scan_opencv, tile_fn=self._scan_opencv_tile,
+                context=context, source='gray'
+            )).boxes
+            self._since_full_scan = 0
+            self.full_scans += 1
+        
+        # OpenCV Haar Cascade não retorna score nem landmarks: usar 0.8
+        faces = FaceBatch(detections, np.full(len(detections), 0.8, dtype=np.float32))
+        
+        self._since_full_scan += 1
+        self._previous_boxes = faces.boxes
+        self._previous_shape = gray.shape
+        return faces
+    
+    def _scan_opencv(self, gray: np.ndarray, max_side: Optional[int] = None) -> FaceBatch:
+        """Varre uma imagem inteira com a cascata Haar da thread atual."""
+        cascade = getattr(self._local, 'cascade', self._detector)
+        options = {}
+        if max_side is not None:
+            options['maxSize'] = (max_side, max_side)
+        
+        detections = cascade.detectMultiScale(
             gray,
             scaleFactor=1.1,
             minNeighbors=5,
-            minSize=(30, 30),
-            flags=cv2.CASCADE_SCALE_IMAGE
+            minSize=(self.MIN_FACE_SIZE, self.MIN_FACE_SIZE),
+            flags=cv2.CASCADE_SCALE_IMAGE,
+            **options
         )
         
-        # Converter para objetos Face
-        faces = []
-        for (x, y, w, h) in detections:
-            # OpenCV Haar Cascade não retorna score/confidence
-            # Usar 0.8 como padrão
-            score = 0.8
+        # OpenCV Haar Cascade não retorna score nem landmarks
+        return FaceBatch(detections, np.full(len(detections), 0.8, dtype=np.float32))
+    
+    def _scan_opencv_tile(self, gray: np.ndarray) -> FaceBatch:
+        """
+        Varre um tile só com as escalas que cabem na sobreposição.
+        
+        Faces maiores que a sobreposição podem ser cortadas pelos tiles e
+        ficam para a passada reduzida; limitar maxSize corta as escalas
+        grandes, as mais caras de repetir em cada tile. _tile_size_for()
+        garante que a sobreposição alcança a menor face da passada
+        reduzida, sem faixa de tamanhos perdida entre as duas.
+        """
+        # O lado maior de um tile é sempre o tamanho de tile do frame
+        tile = max(gray.shape[:2])
+        overlap = tile - self._tile_step(tile)
+        return self._scan_opencv(gray, max_side=max(self.MIN_FACE_SIZE, overlap))
+    
+    def _detect_maybe_tiled(
+        self,
+        frame: np.ndarray,
+        detect_fn: Callable[[np.ndarray], FaceResult],
+        tile_fn: Optional[Callable[[np.ndarray], FaceResult]] = None,
+        context: Optional[FrameContext] = None,
+        source: str = 'bgr'
+    ) -> FaceResult:
+        """Aplica detect_fn ao frame inteiro ou em tiles, conforme tile_size."""
+        height, width = frame.shape[:2]
+        if self.tile_size is None or self._tile_size_for(height, width) >= max(height, width):
+            return detect_fn(frame)
+        return self._detect_tiled(frame, detect_fn, tile_fn, context, source)
+    
+    def _tile_size_for(self, height: int, width: int) -> int:
+        """
+        Tamanho de tile usado em um frame height × width.
+        
+        A passada reduzida (frame reduzido para o tile) só encontra faces
+        de MIN_FACE_SIZE / escala pixels em diante, e os tiles só as que
+        cabem na sobreposição. Para não sobrar uma faixa de tamanhos que
+        nenhuma das duas encontra, o tile precisa de
+        tile² × tile_overlap >= MIN_FACE_SIZE × lado maior; tile_size é
+        aumentado até isso quando preciso (ex: tiles de 256 em 1080p).
+        """
+        side = max(height, width)
+        needed = math.ceil(math.sqrt(self.MIN_FACE_SIZE * side / self.tile_overlap))
+        return min(side, max(self.tile_size, needed))
+    
+    def _tile_step(self, tile: int) -> int:
+        """Distância entre o início de tiles vizinhos."""
+        return max(1, int(tile * (1.0 - self.tile_overlap)))
+    
+    def _tile_windows(self, height: int, width: int) -> list[tuple[int, int, int, int]]:
+        """Janelas (x0, y0, x1, y1) sobrepostas que cobrem o frame."""
+        tile = self._tile_size_for(height, width)
+        step = self._tile_step(tile)
+        
+        def starts(length: int) -> list[int]:
+            if length <= tile:
+                return [0]
+            positions = list(range(0, length - tile + 1, step))
+            if positions[-1] + tile < length:
+                positions.append(length - tile)
+            return positions
+        
+        return [
+            (x, y, min(x + tile, width), min(y + tile, height))
+            for y in starts(height)
+            for x in starts(width)
+        ]
+    
+    def _init_tile_thread(self) -> None:
+        """Cria a cascata Haar própria de uma thread do pool."""
+        if self._cascade_path is not None:
+            self._local.cascade = cv2.CascadeClassifier(self._cascade_path)
+    
+    def _detect_tiled(
+        self,
+        frame: np.ndarray,
+        detect_fn: Callable[[np.ndarray], FaceResult],
+        tile_fn: Optional[Callable[[np.ndarray], FaceResult]] = None,
+        context: Optional[FrameContext] = None,
+        source: str = 'bgr'
+    ) -> FaceBatch:
+        """
+        Detecta faces em tiles sobrepostos, em paralelo.
+        
+        Cada tile é processado na resolução original por uma thread do
+        pool (a detecção do OpenCV e do dlib libera o GIL). Faces maiores
+        que a sobreposição podem ser cortadas nas bordas dos tiles, então
+        uma passada extra roda no frame reduzido para tile_size. As
+        duplicatas nas emendas são unidas por NMS, com preferência para as
+        detecções dos tiles (mais precisas).
+        
+        Args:
+            frame: Frame BGR ou grayscale
+            detect_fn: Detecção de uma imagem (coordenadas da imagem)
+            tile_fn: Detecção usada nos tiles (padrão: detect_fn)
+            context: Cache de onde vem a versão reduzida (opcional)
+            source: Representação de `frame` no contexto ('bgr', 'gray'
+                    ou 'rgb')
+        
+        Returns:
+            Faces em coordenadas do frame
+        """
+        if self._tile_executor is None:
+            self._tile_executor = ThreadPoolExecutor(
+                max_workers=self.tile_workers,
+                thread_name_prefix="FaceDetectorTile",
+                initializer=self._init_tile_thread
+            )
+        
+        height, width = frame.shape[:2]
+        windows = self._tile_windows(height, width)
+        futures = [
+            self._tile_executor.submit(tile_fn or detect_fn, frame[y0:y1, x0:x1])
+            for x0, y0, x1, y1 in windows
+        ]
+        
+        # Passada reduzida para faces grandes, enquanto os tiles rodam
+        coarse_scale = self._tile_size_for(height, width) / max(height, width)
+        coarse_size = (max(1, int(width * coarse_scale)), max(1, int(height * coarse_scale)))
+        if context is not None:
+            coarse = context.resized(coarse_size, source=source)
+        else:
+            coarse = cv2.resize(frame, coarse_size, interpolation=cv2.INTER_AREA)
+        coarse_faces = FaceBatch.from_faces(detect_fn(coarse)).scaled(1.0 / coarse_scale)
+        
+        # Faces dos tiles (deslocadas para o frame) antes das da passada
+        # reduzida: no empate de score, o NMS mantém as dos tiles
+        parts = [
+            FaceBatch.from_faces(future.result()).translated(x0, y0)
+            for (x0, y0, _, _), future in zip(windows, futures)
+        ]
+        faces = FaceBatch.concatenate(parts + [coarse_faces])
+        if not len(faces):
+            return faces
+        
+        return faces.select(nms(faces.boxes, faces.scores, self.TILE_NMS_IOU))
+    
+    def _init_frame_thread(self) -> None:
+        """Cria o FaceDetector próprio de uma thread do pool de frames."""
+        detector = FaceDetector(
+            backend=self.backend,
+            model=self.model,
+            tile_size=self.tile_size,
+            tile_overlap=self.tile_overlap,
+            tile_workers=1
+        )
+        self._local.detector = detector
+        with self._frame_lock:
+            self._frame_detectors.append(detector)
+    
+    def _detect_in_worker(
+        self,
+        frame: np.ndarray,
+        scale: float,
+        context: Optional[FrameContext]
+    ) -> FaceBatch:
+        """Detecta um frame com o detector da thread atual do pool."""
+        return self._local.detector.detect_batch(frame, scale, context)
+    
+    def submit(
+        self,
+        frame: np.ndarray,
+        scale: float = 1.0,
+        context: Optional[FrameContext] = None
+    ) -> "Future[FaceBatch]":
+        """
+        Agenda a detecção de um frame no pool de frames.
+        
+        Cada thread do pool tem o próprio FaceDetector, sem busca
+        incremental (varredura completa sempre), de modo que frames
+        diferentes são detectados ao mesmo tempo: a cascata do OpenCV e o
+        dlib do face_recognition liberam o GIL. O backend deepface (modelos
+        não compartilháveis entre threads) agrupa até batch_size frames,
+        ou o que chegar em batch_wait_ms, em uma única chamada; com
+        batch_size=1, roda de forma síncrona na thread que chama.
+        
+        O frame (e o contexto, se dado) não pode ser modificado, devolvido
+        a um FramePool ou usado por outra thread antes de o resultado ficar
+        pronto.
+        
+        Args:
+            frame: Frame de imagem (numpy array BGR ou grayscale)
+            scale: Fator com que `frame` foi reduzido em relação ao vídeo
+                   original
+            context: Cache de conversões do frame (opcional)
+        
+        Returns:
+            Future com a FaceBatch do frame
+        
+        Raises:
+            ValueError: Se o frame, a escala ou o contexto forem inválidos
+        """
+        self._check_frame(frame, scale, context)
+        
+        if self.backend == "deepface" and self.batch_size > 1:
+            if self._batcher is None:
+                self._batcher = MicroBatcher(
+                    self._detect_deepface_batch,
+                    max_batch=self.batch_size,
+                    max_wait_ms=self.batch_wait_ms,
+                    name="FaceDetectorBatch"
+                )
+            return self._batcher.submit((frame, scale))
+        
+        if self.backend == "deepface":
+            future: Future = Future()
+            future.set_result(self.detect_batch(frame, scale, context))
+            return future
+        
+        if self._frame_executor is None:
+            self._frame_executor = ThreadPoolExecutor(
+                max_workers=self.frame_workers,
+                thread_name_prefix="FaceDetectorFrame",
+                initializer=self._init_frame_thread
+            )
+        return self._frame_executor.submit(self._detect_in_worker, frame, scale, context)
+    
+    def mean_batch_size(self) -> float:
+        """Tamanho médio dos lotes do deepface até aqui (0 sem lotes)."""
+        return self._batcher.mean_batch_size() if self._batcher is not None else 0.0
+    
+    def detect_many(
+        self,
+        frames: Iterable[np.ndarray],
+        scale: float = 1.0,
+        in_flight: Optional[int] = None
+    ) -> Iterator[FaceBatch]:
+        """
+        Detecta faces em uma sequência de frames, vários ao mesmo tempo.
+        
+        Mantém até `in_flight` frames em processamento no pool (ver
+        submit()) e entrega os resultados na ordem dos frames. Os frames
+        são consumidos sob demanda: no máximo `in_flight` à frente do
+        último resultado entregue.
+        
+        Args:
+            frames: Frames de imagem (iterável, pode ser um gerador)
+            scale: Fator com que os frames foram reduzidos em relação ao
+                   vídeo original
+            in_flight: Máximo de frames em processamento (padrão: o dobro
+                       de frame_workers ou de batch_size, o maior)
+        
+        Yields:
+            FaceBatch de cada frame, na ordem de entrada
+        
+        Raises:
+            ValueError: Se in_flight, algum frame ou a escala forem inválidos
+        
+        Example:
+            >>> for faces in detector.detect_many(frames, in_flight=8):
+            ...     print(len(faces))
+        """
+        in_flight = in_flight or 2 * max(self.frame_workers, self.batch_size)
+        if in_flight < 1:
+            raise ValueError(f"in_flight must be >= 1, got {in_flight}")
+        
+        pending: deque = deque()
+        try:
+            for frame in frames:
+                pending.append(self.submit(frame, scale))
+                if len(pending) >= in_flight:
+                    yield pending.popleft().result()
             
-            # OpenCV Haar Cascade não retorna landmarks
-            faces.append(Face(box=(x, y, w, h), score=score, landmarks=None))
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # Gerador abandonado: não deixar frames em processamento
+            for future in pending:
+                future.cancel()
+    
+    def close(self) -> None:
+        """Encerra os pools de tiles, de frames e de lotes (se criados)."""
+        if self._batcher is not None:
+            self._batcher.close()
+            self._batcher = None
         
-        return faces
+        if self._tile_executor is not None:
+            self._tile_executor.shutdown(wait=True)
+            self._tile_executor = None
+        
+        if self._frame_executor is not None:
+            self._frame_executor.shutdown(wait=True)
+            self._frame_executor = None
+            for detector in self._frame_detectors:
+                detector.close()
+            self._frame_detectors = []
+    
+    def _detect_opencv_roi(self, gray: np.ndarray) -> Optional[list[tuple[int, int, int, int]]]:
+        """
+        Busca faces apenas em janelas ao redor das faces da chamada anterior.
+        
+        Cada janela é a box anterior expandida por ROI_MARGIN, e a cascata
+        só testa tamanhos entre ROI_MIN_SIZE e ROI_MAX_SIZE da face
+        anterior, em vez de todas as escalas do frame inteiro.
+        
+        Returns:
+            Boxes encontradas (coordenadas do frame), ou None se alguma face
+            anterior não foi reencontrada (varredura completa necessária)
+        """
+        height, width = gray.shape[:2]
+        boxes: list[tuple[int, int, int, int]] = []
+        
+        for (x, y, w, h) in self._previous_boxes.tolist():
+            size = max(w, h)
+            margin = int(size * self.ROI_MARGIN)
+            x0, y0 = max(0, x - margin), max(0, y - margin)
+            x1, y1 = min(width, x + w + margin), min(height, y + h + margin)
+            
+            min_side = max(self.MIN_FACE_SIZE, int(size * self.ROI_MIN_SIZE))
+            max_side = int(size * self.ROI_MAX_SIZE)
+            detections = self._detector.detectMultiScale(
+                gray[y0:y1, x0:x1],
+                scaleFactor=1.1,
+                minNeighbors=5,
+                minSize=(min_side, min_side),
+                maxSize=(max_side, max_side),
+                flags=cv2.CASCADE_SCALE_IMAGE
+            )
+            if len(detections) == 0:
+                return None
+            
+            boxes.extend((int(dx) + x0, int(dy) + y0, int(dw), int(dh)) for dx, dy, dw, dh in detections)
+        
+        # Janelas vizinhas podem encontrar a mesma face
+        keep = nms(boxes, np.ones(len(boxes)), self.TILE_NMS_IOU)
+        return [boxes[i] for i in sorted(keep)]
     
     def __repr__(self) -> str:
         """Representação em string do detector."""
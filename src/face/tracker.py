@@ -0,0 +1,323 @@
+"""
+Face Tracker Module
+
+Implementa a classe FaceTracker, que executa a detecção completa apenas a
+cada N frames e propaga as faces nos frames intermediários com fluxo
+óptico (Lucas-Kanade), atribuindo IDs estáveis a cada face.
+"""
+
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from src.face.detector import Face, FaceBatch, FaceDetector
+from src.utils.boxes import iou_matrix
+from src.utils.frame_context import FrameContext
+
+
+class FaceTracker:
+    """
+    Detecção a cada N frames com rastreamento entre as detecções.
+    
+    As trilhas ficam em formato colunar: uma FaceBatch com scores,
+    landmarks e IDs, mais as boxes em ponto flutuante (N×4) no frame de
+    análise, sem objetos Python por face.
+    
+    Em frames de detecção, o FaceDetector roda no frame inteiro e as faces
+    são associadas às trilhas existentes por IoU (maior sobreposição
+    primeiro), mantendo o track_id; faces sem correspondência abrem
+    trilhas novas e trilhas sem correspondência são encerradas.
+    
+    Nos frames intermediários, uma grade de pontos dentro de cada box é
+    seguida com fluxo óptico piramidal (uma única chamada para todas as
+    faces) e validada com o fluxo de volta (forward-backward). A box é
+    deslocada pela mediana dos deslocamentos e reescalada pela mediana da
+    razão entre distâncias dos pontos. Se a fração de pontos válidos de
+    alguma face cair abaixo de `min_confidence`, a detecção completa roda
+    no próprio frame.
+    
+    Tem a mesma interface de FaceDetector.detect() e detect_batch(),
+    podendo substituí-lo no pipeline.
+    
+    Attributes:
+        detector (FaceDetector): Detector usado nos frames de detecção
+        detect_interval (int): Frames entre detecções completas
+        detections (int): Detecções completas executadas
+        frames (int): Frames processados
+    
+    Example:
+        >>> tracker = FaceTracker(FaceDetector(), detect_interval=5)
+        >>> for frame in frames:
+        ...     for face in tracker.detect(frame):
+        ...         print(face.track_id, face.box)
+    """
+    
+    # Grade de pontos seguidos dentro de cada box (GRID_SIZE × GRID_SIZE)
+    GRID_SIZE = 6
+    
+    # Erro máximo (pixels) do fluxo ida e volta para um ponto ser válido
+    MAX_FB_ERROR = 1.0
+    
+    def __init__(
+        self,
+        detector: FaceDetector,
+        detect_interval: int = 5,
+        iou_threshold: float = 0.3,
+        min_confidence: float = 0.5
+    ) -> None:
+        """
+        Inicializa o tracker.
+        
+        Args:
+            detector: Detector de faces
+            detect_interval: Executar a detecção completa a cada N frames
+                             (1 = todo frame, sem rastreamento)
+            iou_threshold: IoU mínimo para associar uma detecção a uma
+                           trilha existente
+            min_confidence: Fração mínima de pontos seguidos com sucesso;
+                            abaixo dela a detecção é antecipada
+        
+        Raises:
+            ValueError: Se algum parâmetro for inválido
+        """
+        if detect_interval < 1:
+            raise ValueError(f"detect_interval must be >= 1, got {detect_interval}")
+        
+        if not 0.0 <= iou_threshold <= 1.0:
+            raise ValueError(f"iou_threshold must be in [0, 1], got {iou_threshold}")
+        
+        if not 0.0 <= min_confidence <= 1.0:
+            raise ValueError(f"min_confidence must be in [0, 1], got {min_confidence}")
+        
+        self.detector = detector
+        self.detect_interval = detect_interval
+        self.iou_threshold = iou_threshold
+        self.min_confidence = min_confidence
+        self.detections = 0
+        self.frames = 0
+        
+        # Trilhas: scores, landmarks e IDs em uma FaceBatch; boxes em float
+        # para acumular deslocamentos sub-pixel entre as detecções
+        self._tracks = FaceBatch.empty()
+        self._boxes = np.zeros((0, 4), dtype=np.float64)
+        self._next_id = 0
+        self._prev_gray: Optional[np.ndarray] = None
+        self._spare_gray: Optional[np.ndarray] = None
+        self._since_detection = 0
+        
+        # Grade relativa (0-1) dos pontos, com margem para não pegar o fundo
+        steps = np.linspace(0.2, 0.8, self.GRID_SIZE, dtype=np.float32)
+        grid_x, grid_y = np.meshgrid(steps, steps)
+        self._grid = np.stack([grid_x.ravel(), grid_y.ravel()], axis=1)
+    
+    def detect(
+        self,
+        frame: np.ndarray,
+        scale: float = 1.0,
+        context: Optional[FrameContext] = None
+    ) -> List[Face]:
+        """
+        Retorna as faces do frame (detectadas ou rastreadas).
+        
+        Mesmo que detect_batch(), como lista de Face.
+        
+        Args:
+            frame: Frame de imagem (numpy array BGR ou grayscale). Frames
+                   consecutivos devem vir da mesma sequência.
+            scale: Fator com que `frame` foi reduzido em relação ao vídeo
+                   original; as boxes retornadas são projetadas de volta
+            context: Cache de conversões do frame; o cinza é compartilhado
+                     com o detector (opcional)
+        
+        Returns:
+            Lista de faces, com track_id preenchido
+        
+        Raises:
+            ValueError: Se o frame, a escala ou o contexto forem inválidos
+        """
+        return self.detect_batch(frame, scale, context).to_faces()
+    
+    def detect_batch(
+        self,
+        frame: np.ndarray,
+        scale: float = 1.0,
+        context: Optional[FrameContext] = None
+    ) -> FaceBatch:
+        """
+        Retorna as faces do frame no formato colunar de FaceDetector.detect_batch().
+        
+        Args:
+            frame: Frame de imagem (numpy array BGR ou grayscale). Frames
+                   consecutivos devem vir da mesma sequência.
+            scale: Fator com que `frame` foi reduzido em relação ao vídeo
+                   original; as boxes retornadas são projetadas de volta
+            context: Cache de conversões do frame (opcional)
+        
+        Returns:
+            FaceBatch com track_ids preenchidos
+        
+        Raises:
+            ValueError: Se o frame, a escala ou o contexto forem inválidos
+        """
+        if frame is None or frame.size == 0:
+            raise ValueError("Invalid frame: empty or None")
+        
+        if frame.ndim not in (2, 3):
+            raise ValueError(f"Invalid frame dimensions: {frame.ndim}")
+        
+        if scale <= 0:
+            raise ValueError(f"Scale must be > 0, got {scale}")
+        
+        if context is not None and context.frame is not frame:
+            raise ValueError("FrameContext does not hold the frame being detected")
+        
+        # O frame cinza é retido até a próxima chamada, mas os arrays do
+        # contexto (e frames cinza vindos de um FramePool) são reaproveitados:
+        # copiar para um dos dois buffers próprios, alternados a cada frame
+        source = (context or FrameContext(frame)).gray()
+        gray = self._spare_gray
+        if gray is None or gray.shape != source.shape:
+            gray = np.empty_like(source)
+        np.copyto(gray, source)
+        
+        due = (
+            self._prev_gray is None
+            or self._prev_gray.shape != gray.shape
+            or self._since_detection >= self.detect_interval
+        )
+        if due or not self._propagate(self._prev_gray, gray):
+            if context is None:
+                self._associate(self.detector.detect_batch(frame))
+            else:
+                self._associate(self.detector.detect_batch(frame, context=context))
+            self.detections += 1
+            self._since_detection = 0
+        
+        self._since_detection += 1
+        self._spare_gray = self._prev_gray
+        self._prev_gray = gray
+        self.frames += 1
+        
+        # Boxes em pixels inteiros, como nas detecções
+        faces = self._tracks._replace(boxes=np.round(self._boxes).astype(np.int32))
+        if scale != 1.0:
+            faces = faces.scaled(1.0 / scale)
+        return faces
+    
+    def _associate(self, faces: FaceBatch) -> None:
+        """Associa detecções às trilhas por IoU e atualiza as trilhas."""
+        faces = FaceBatch.from_faces(faces)
+        track_ids = np.full(len(faces), -1, dtype=np.int64)
+        used_tracks = set()
+        
+        # Pares (trilha, face) acima do limiar, do maior IoU para o menor
+        iou = iou_matrix(self._boxes, faces.boxes)
+        candidates = np.argwhere(iou >= self.iou_threshold)
+        order = np.argsort(-iou[candidates[:, 0], candidates[:, 1]], kind='stable')
+        for t, f in candidates[order].tolist():
+            if t in used_tracks or track_ids[f] >= 0:
+                continue
+            used_tracks.add(t)
+            track_ids[f] = self._tracks.track_ids[t]
+        
+        # Faces sem correspondência abrem trilhas novas, na ordem da detecção
+        new = track_ids < 0
+        count = int(new.sum())
+        track_ids[new] = np.arange(self._next_id, self._next_id + count)
+        self._next_id += count
+        
+        self._tracks = faces.with_track_ids(track_ids)
+        self._boxes = faces.boxes.astype(np.float64)
+    
+    def _propagate(self, prev_gray: np.ndarray, gray: np.ndarray) -> bool:
+        """
+        Move as trilhas de prev_gray para gray com fluxo óptico.
+        
+        Returns:
+            False se alguma trilha perdeu confiança (detecção necessária)
+        """
+        count = len(self._boxes)
+        if not count:
+            return True
+        
+        # Pontos de todas as trilhas em um único array
+        boxes = self._boxes.astype(np.float32)
+        points = boxes[:, None, :2] + self._grid[None] * boxes[:, None, 2:]
+        points = points.reshape(-1, 1, 2)
+        
+        lk_params = dict(
+            winSize=(15, 15),
+            maxLevel=2,
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03)
+        )
+        forward, status, _ = cv2.calcOpticalFlowPyrLK(prev_gray, gray, points, None, **lk_params)
+        backward, status_back, _ = cv2.calcOpticalFlowPyrLK(gray, prev_gray, forward, None, **lk_params)
+        
+        fb_error = np.linalg.norm(points - backward, axis=2).ravel()
+        valid = (status.ravel() == 1) & (status_back.ravel() == 1) & (fb_error < self.MAX_FB_ERROR)
+        
+        per_track = len(self._grid)
+        points = points.reshape(count, per_track, 2)
+        forward = forward.reshape(count, per_track, 2)
+        valid = valid.reshape(count, per_track)
+        
+        # Deslocamento e escala de cada trilha (mediana dos pontos válidos)
+        shifts = np.zeros((count, 2), dtype=np.float64)
+        ratios = np.ones(count, dtype=np.float64)
+        for i, (start, end, ok) in enumerate(zip(points, forward, valid)):
+            if ok.mean() < self.min_confidence or ok.sum() < 2:
+                return False
+            
+            start, end = start[ok], end[ok]
+            shifts[i] = np.median(end - start, axis=0)
+            
+            # Escala: mediana da razão entre distâncias de pares de pontos
+            a, b = np.triu_indices(len(start), k=1)
+            dist_start = np.linalg.norm(start[a] - start[b], axis=1)
+            dist_end = np.linalg.norm(end[a] - end[b], axis=1)
+            nonzero = dist_start > 1e-3
+            if nonzero.any():
+                ratios[i] = float(np.median(dist_end[nonzero] / dist_start[nonzero]))
+        
+        prev_centers = self._boxes[:, :2] + self._boxes[:, 2:] / 2
+        centers = prev_centers + shifts
+        sizes = self._boxes[:, 2:] * ratios[:, None]
+        new_boxes = np.concatenate([centers - sizes / 2, sizes], axis=1)
+        
+        # Face saindo do frame: deixar a detecção decidir
+        height, width = gray.shape[:2]
+        x, y = new_boxes[:, 0], new_boxes[:, 1]
+        right, bottom = x + new_boxes[:, 2], y + new_boxes[:, 3]
+        if ((right <= 0) | (bottom <= 0) | (x >= width) | (y >= height)).any():
+            return False
+        
+        self._boxes = new_boxes
+        landmarks = self._tracks.landmarks
+        if landmarks is not None:
+            # Mesma transformação da box: centro deslocado e escala
+            landmarks = (
+                (landmarks - prev_centers[:, None, :]) * ratios[:, None, None]
+                + centers[:, None, :]
+            ).astype(np.float32)
+            self._tracks = self._tracks._replace(landmarks=landmarks)
+        
+        return True
+    
+    def close(self) -> None:
+        """Libera os recursos do detector."""
+        self.detector.close()
+    
+    def reset(self) -> None:
+        """Descarta as trilhas; o próximo frame executa a detecção."""
+        self._tracks = FaceBatch.empty()
+        self._boxes = np.zeros((0, 4), dtype=np.float64)
+        self._prev_gray = None
+        self._since_detection = 0
+    
+    def __repr__(self) -> str:
+        """Representação em string do tracker."""
+        return (
+            f"FaceTracker(detector={self.detector!r}, "
+            f"detect_interval={self.detect_interval}, tracks={len(self._tracks)})"
+        )
@@ -0,0 +1,318 @@
+"""
+Annotation Track Module
+
+Implementa a classe AnnotationTrack, uma trilha com as anotações de cada
+frame analisado (faces, emoções, atividade e anomalias), persistida em um
+arquivo compacto separado do vídeo. A partir dela o vídeo anotado pode ser
+renderizado depois, sem executar os modelos novamente.
+"""
+
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class AnnotationTrackError(Exception):
+    """Exceção lançada quando a trilha de anotações é inválida."""
+    pass
+
+
+class AnnotationTrack:
+    """
+    Anotações por frame em formato colunar (structure of arrays).
+    
+    Formato do arquivo (.npz comprimido do NumPy):
+        - frames: idx (int64), timestamp (float64), primeira face
+          (int64), número de faces (int32), atividade (int16, código do
+          label ou -1) e anomalias no frame (int16)
+        - faces: box x/y/w/h (int32 × 4), emoção (int16, código do label
+          ou -1), score normalizado da emoção (float32) e ID de
+          rastreamento (int32, -1 = sem ID)
+        - labels: tabela de strings referenciada pelos códigos
+        - meta: versão, fps, dimensões e stride do vídeo analisado
+    
+    Durante a inferência, append() acumula as colunas em listas; save()
+    grava tudo de uma vez.
+    
+    Attributes:
+        video_path (str): Vídeo de origem das anotações
+        fps (float): FPS do vídeo de origem
+        frame_size (Tuple[int, int]): Dimensões (width, height) do vídeo
+        stride (int): Stride usado na análise
+    
+    Example:
+        >>> track = AnnotationTrack("video.mp4", fps=30.0, frame_size=(1280, 720))
+        >>> track.append(0, 0.0, boxes=[(10, 20, 50, 50)], emotions=[("happy", 0.9)])
+        >>> track.save("outputs/annotations.npz")
+        >>> track = AnnotationTrack.load("outputs/annotations.npz")
+        >>> track.frame(0)['boxes']
+        [(10, 20, 50, 50)]
+    """
+    
+    VERSION = 1
+    
+    def __init__(
+        self,
+        video_path: str,
+        fps: float,
+        frame_size: Tuple[int, int],
+        stride: int = 1
+    ) -> None:
+        """
+        Inicializa uma trilha vazia.
+        
+        Args:
+            video_path: Vídeo de origem
+            fps: FPS do vídeo de origem
+            frame_size: Dimensões (width, height) do vídeo (referência das
+                        coordenadas das boxes)
+            stride: Stride usado na análise
+        """
+        self.video_path = video_path
+        self.fps = fps
+        self.frame_size = (int(frame_size[0]), int(frame_size[1]))
+        self.stride = stride
+        
+        self._labels: List[str] = []
+        self._label_codes: Dict[str, int] = {}
+        
+        # Colunas de frames
+        self._frame_idx: List[int] = []
+        self._timestamps: List[float] = []
+        self._face_start: List[int] = []
+        self._face_count: List[int] = []
+        self._activity: List[int] = []
+        self._anomalies: List[int] = []
+        
+        # Colunas de faces
+        self._boxes: List[Tuple[int, int, int, int]] = []
+        self._emotion: List[int] = []
+        self._emotion_score: List[float] = []
+        self._track_id: List[int] = []
+        
+        # Colunas consolidadas (após load()) e cache das listas
+        self._arrays: Optional[Dict[str, np.ndarray]] = None
+        self._cache: Optional[Dict[str, np.ndarray]] = None
+    
+    def _code(self, label: Optional[str]) -> int:
+        """Código do label na tabela de strings (-1 para None)."""
+        if label is None:
+            return -1
+        
+        code = self._label_codes.get(label)
+        if code is None:
+            code = len(self._labels)
+            self._labels.append(label)
+            self._label_codes[label] = code
+        return code
+    
+    def append(
+        self,
+        idx: int,
+        timestamp: float,
+        boxes: Sequence[Tuple[int, int, int, int]],
+        emotions: Sequence[Tuple[str, float]] = (),
+        activity: Optional[str] = None,
+        anomalies_count: int = 0,
+        track_ids: Sequence[Optional[int]] = ()
+    ) -> None:
+        """
+        Adiciona as anotações de um frame analisado.
+        
+        Args:
+            idx: Índice do frame no vídeo
+            timestamp: Timestamp em segundos
+            boxes: Boxes das faces (x, y, width, height)
+            emotions: Pares (label, score normalizado), alinhados com boxes
+            activity: Atividade atual (opcional)
+            anomalies_count: Anomalias detectadas no frame
+            track_ids: IDs de rastreamento, alinhados com boxes (None ou
+                       -1 = sem ID; pode ser mais curta)
+        
+        Raises:
+            AnnotationTrackError: Se a trilha foi carregada de arquivo
+        """
+        if self._arrays is not None:
+            raise AnnotationTrackError("Cannot append to a loaded annotation track")
+        
+        self._cache = None
+        self._frame_idx.append(idx)
+        self._timestamps.append(timestamp)
+        self._face_start.append(len(self._boxes))
+        self._face_count.append(len(boxes))
+        self._activity.append(self._code(activity))
+        self._anomalies.append(anomalies_count)
+        
+        for i, box in enumerate(boxes):
+            self._boxes.append(tuple(int(v) for v in box))
+            track_id = track_ids[i] if i < len(track_ids) else None
+            self._track_id.append(-1 if track_id is None else int(track_id))
+            if i < len(emotions):
+                label, score = emotions[i]
+                self._emotion.append(self._code(label))
+                self._emotion_score.append(score)
+            else:
+                self._emotion.append(-1)
+                self._emotion_score.append(0.0)
+    
+    def _columns(self) -> Dict[str, np.ndarray]:
+        """Colunas como arrays NumPy (consolidadas das listas se preciso)."""
+        if self._arrays is not None:
+            return self._arrays
+        
+        if self._cache is not None:
+            return self._cache
+        
+        self._cache = {
+            'frame_idx': np.asarray(self._frame_idx, dtype=np.int64),
+            'timestamp': np.asarray(self._timestamps, dtype=np.float64),
+            'face_start': np.asarray(self._face_start, dtype=np.int64),
+            'face_count': np.asarray(self._face_count, dtype=np.int32),
+            'activity': np.asarray(self._activity, dtype=np.int16),
+            'anomalies': np.asarray(self._anomalies, dtype=np.int16),
+            'boxes': np.asarray(self._boxes, dtype=np.int32).reshape(-1, 4),
+            'emotion': np.asarray(self._emotion, dtype=np.int16),
+            'emotion_score': np.asarray(self._emotion_score, dtype=np.float32),
+            'track_id': np.asarray(self._track_id, dtype=np.int32),
+            'labels': np.asarray(self._labels, dtype=str)
+        }
+        return self._cache
+    
+    @property
+    def frame_indices(self) -> np.ndarray:
+        """Índices dos frames anotados, em ordem."""
+        return self._columns()['frame_idx']
+    
+    def frame(self, position: int) -> Dict:
+        """
+        Retorna as anotações do `position`-ésimo frame da trilha.
+        
+        Args:
+            position: Posição na trilha (não o índice do frame no vídeo)
+        
+        Returns:
+            Dicionário com idx, timestamp, boxes, emotions, track_ids
+            (None para faces sem ID), activity e anomalies_count
+        """
+        columns = self._columns()
+        labels = columns['labels']
+        start = int(columns['face_start'][position])
+        end = start + int(columns['face_count'][position])
+        
+        emotions = []
+        for code, score in zip(columns['emotion'][start:end], columns['emotion_score'][start:end]):
+            if code < 0:
+                break
+            emotions.append((str(labels[code]), float(score)))
+        
+        activity_code = columns['activity'][position]
+        return {
+            'idx': int(columns['frame_idx'][position]),
+            'timestamp': float(columns['timestamp'][position]),
+            'boxes': [tuple(int(v) for v in box) for box in columns['boxes'][start:end]],
+            'emotions': emotions,
+            'track_ids': [
+                int(track_id) if track_id >= 0 else None
+                for track_id in columns['track_id'][start:end]
+            ],
+            'activity': str(labels[activity_code]) if activity_code >= 0 else None,
+            'anomalies_count': int(columns['anomalies'][position])
+        }
+    
+    def find(self, idx: int) -> Optional[int]:
+        """
+        Posição na trilha do frame `idx` do vídeo.
+        
+        Returns:
+            Posição, ou None se o frame não foi anotado
+        """
+        indices = self.frame_indices
+        position = int(np.searchsorted(indices, idx))
+        if position < len(indices) and indices[position] == idx:
+            return position
+        return None
+    
+    def save(self, path: str) -> None:
+        """
+        Salva a trilha em um .npz comprimido.
+        
+        Args:
+            path: Caminho do arquivo (a extensão .npz é recomendada)
+        """
+        dir_path = os.path.dirname(os.path.abspath(path))
+        os.makedirs(dir_path, exist_ok=True)
+        
+        meta = np.array(
+            [self.VERSION, self.fps, self.frame_size[0], self.frame_size[1], self.stride],
+            dtype=np.float64
+        )
+        
+        # Escrita atômica para não deixar trilhas truncadas
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                meta=meta,
+                video_path=np.asarray(self.video_path),
+                **self._columns()
+            )
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path: str) -> "AnnotationTrack":
+        """
+        Carrega uma trilha salva com save().
+        
+        Args:
+            path: Caminho do arquivo
+        
+        Returns:
+            AnnotationTrack somente leitura
+        
+        Raises:
+            AnnotationTrackError: Se o arquivo for inválido
+        """
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+        except (OSError, ValueError) as e:
+            raise AnnotationTrackError(f"Invalid annotation track file: {path}") from e
+        
+        required = (
+            'meta', 'video_path', 'frame_idx', 'timestamp', 'face_start',
+            'face_count', 'activity', 'anomalies', 'boxes', 'emotion',
+            'emotion_score', 'labels'
+        )
+        if any(name not in arrays for name in required):
+            raise AnnotationTrackError(f"Invalid annotation track file: {path}")
+        
+        version, fps, width, height, stride = arrays.pop('meta').tolist()
+        if int(version) != cls.VERSION:
+            raise AnnotationTrackError(f"Unsupported annotation track version: {int(version)}")
+        
+        # Trilhas gravadas antes da coluna de IDs: faces sem ID
+        if 'track_id' not in arrays:
+            arrays['track_id'] = np.full(len(arrays['boxes']), -1, dtype=np.int32)
+        
+        track = cls(
+            str(arrays.pop('video_path')),
+            fps=fps,
+            frame_size=(int(width), int(height)),
+            stride=int(stride)
+        )
+        track._arrays = arrays
+        return track
+    
+    def __len__(self) -> int:
+        """Número de frames anotados."""
+        if self._arrays is not None:
+            return len(self._arrays['frame_idx'])
+        return len(self._frame_idx)
+    
+    def __repr__(self) -> str:
+        """Representação em string da AnnotationTrack."""
+        return (
+            f"AnnotationTrack(video='{self.video_path}', frames={len(self)}, "
+            f"frame_size={self.frame_size}, stride={self.stride})"
+        )
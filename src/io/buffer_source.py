@@ -0,0 +1,211 @@
+"""
+Buffer Source Module
+
+Implementa a classe BufferSource, que expõe um vídeo em memória (bytes ou
+objeto tipo arquivo, como um upload) através de um caminho que o OpenCV e o
+ffmpeg conseguem abrir, sem montar cópias intermediárias em Python.
+"""
+
+import os
+import tempfile
+from typing import Optional
+
+
+class BufferSource:
+    """
+    Materializa um vídeo em memória como um caminho legível por OpenCV/ffmpeg.
+    
+    Métodos:
+        - 'memfd': arquivo anônimo em memória (Linux, os.memfd_create),
+          acessado via /proc/<pid>/fd/<fd>. Não toca o disco.
+        - 'file': cópia em blocos para um arquivo temporário, removido em
+          close(). Não mantém uma segunda cópia do vídeo em RAM.
+        - 'auto': 'memfd' se disponível, o chamador entregar os dados
+          (`owns_data=True`) e o tamanho conhecido couber em
+          `memfd_max_bytes`; caso contrário 'file'.
+    
+    Um memfd ocupa RAM que não pode ser despejada como o page cache de um
+    arquivo. Se o chamador continua com os dados em memória (ex.: upload
+    do Streamlit), o memfd dobraria o pico de memória; por isso o modo
+    'auto' só usa memfd quando a posse dos dados é transferida, caso em que
+    bytearray, memoryview e objetos tipo arquivo são liberados logo após a
+    cópia.
+    
+    Os dados são copiados em blocos a partir de uma memoryview (bytes-like
+    ou BytesIO.getbuffer()) ou de readinto() em um buffer reutilizado, sem
+    criar objetos bytes intermediários.
+    
+    Attributes:
+        path (str): Caminho a ser passado ao VideoReader
+        name (str): Nome original do vídeo (para relatórios)
+        method (str): Método efetivamente usado ('memfd' ou 'file')
+        size (int): Bytes escritos
+    
+    Example:
+        >>> with BufferSource(uploaded_file, name="upload.mp4") as source:
+        ...     reader = VideoReader(source.path)
+    """
+    
+    CHUNK_SIZE = 4 * 1024 * 1024
+    
+    def __init__(
+        self,
+        data,
+        name: str = "video",
+        method: str = "auto",
+        memfd_max_bytes: int = 256 * 1024 * 1024,
+        temp_dir: Optional[str] = None,
+        owns_data: bool = False
+    ) -> None:
+        """
+        Inicializa a fonte copiando os dados para memfd ou arquivo temporário.
+        
+        Args:
+            data: bytes, bytearray, memoryview ou objeto tipo arquivo
+                  (com getbuffer(), readinto() ou read())
+            name: Nome original do vídeo; a extensão é preservada
+            method: 'auto', 'memfd' ou 'file'
+            memfd_max_bytes: Tamanho máximo para usar memfd no modo 'auto'
+            temp_dir: Diretório do arquivo temporário (método 'file')
+            owns_data: Se True, o chamador não usa mais `data`: o modo
+                       'auto' pode escolher memfd e os dados são liberados
+                       após a cópia
+        
+        Raises:
+            ValueError: Se o método for inválido ou memfd não estiver
+                        disponível quando pedido explicitamente
+        """
+        if method not in ("auto", "memfd", "file"):
+            raise ValueError(f"Unknown method: {method}")
+        
+        if method == "memfd" and not hasattr(os, "memfd_create"):
+            raise ValueError("memfd is not available on this platform")
+        
+        self.name = name
+        self.size = 0
+        self._fd: Optional[int] = None
+        self._temp_path: Optional[str] = None
+        
+        if method == "auto":
+            known_size = self._known_size(data)
+            use_memfd = owns_data and hasattr(os, "memfd_create") and (
+                known_size is not None and known_size <= memfd_max_bytes
+            )
+            method = "memfd" if use_memfd else "file"
+        
+        self.method = method
+        
+        if method == "memfd":
+            self._fd = os.memfd_create(os.path.basename(name) or "video")
+            # Caminho via PID: também é válido para subprocessos (ffmpeg)
+            self.path = f"/proc/{os.getpid()}/fd/{self._fd}"
+        else:
+            suffix = os.path.splitext(name)[1]
+            self._fd, self._temp_path = tempfile.mkstemp(suffix=suffix, dir=temp_dir)
+            self.path = self._temp_path
+        
+        try:
+            self._write_all(data)
+        except BaseException:
+            self.close()
+            raise
+        
+        if owns_data:
+            self._release_data(data)
+    
+    @staticmethod
+    def _known_size(data) -> Optional[int]:
+        """Tamanho dos dados sem lê-los, se for possível determinar."""
+        if hasattr(data, "getbuffer"):
+            with data.getbuffer() as view:
+                return view.nbytes
+        
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return memoryview(data).nbytes
+        
+        if hasattr(data, "seek") and hasattr(data, "tell"):
+            try:
+                position = data.tell()
+                end = data.seek(0, os.SEEK_END)
+                data.seek(position)
+                return end - position
+            except (OSError, ValueError):
+                return None
+        
+        return None
+    
+    def _write_all(self, data) -> None:
+        """Copia `data` para o descritor em blocos de CHUNK_SIZE."""
+        if hasattr(data, "getbuffer"):
+            with data.getbuffer() as view:
+                self._write_view(view.cast("B"))
+        elif isinstance(data, (bytes, bytearray, memoryview)):
+            self._write_view(memoryview(data).cast("B"))
+        elif hasattr(data, "readinto"):
+            chunk = bytearray(self.CHUNK_SIZE)
+            view = memoryview(chunk)
+            while True:
+                n = data.readinto(chunk)
+                if not n:
+                    break
+                self._write_view(view[:n])
+        elif hasattr(data, "read"):
+            while True:
+                block = data.read(self.CHUNK_SIZE)
+                if not block:
+                    break
+                self._write_view(memoryview(block))
+        else:
+            raise TypeError(
+                f"Expected bytes-like or file-like object, got {type(data).__name__}"
+            )
+        
+        os.lseek(self._fd, 0, os.SEEK_SET)
+    
+    @staticmethod
+    def _release_data(data) -> None:
+        """Libera os dados entregues pelo chamador (owns_data=True)."""
+        if isinstance(data, bytearray):
+            del data[:]
+        elif isinstance(data, memoryview):
+            data.release()
+        elif hasattr(data, "close"):
+            data.close()
+    
+    def _write_view(self, view: memoryview) -> None:
+        """Escreve uma memoryview inteira no descritor."""
+        offset = 0
+        while offset < len(view):
+            offset += os.write(self._fd, view[offset:offset + self.CHUNK_SIZE])
+        self.size += len(view)
+    
+    def close(self) -> None:
+        """Libera o memfd ou remove o arquivo temporário."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        
+        if self._temp_path is not None:
+            if os.path.exists(self._temp_path):
+                os.remove(self._temp_path)
+            self._temp_path = None
+    
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit - libera a fonte."""
+        self.close()
+    
+    def __del__(self):
+        """Destrutor - garante que a fonte seja liberada."""
+        if hasattr(self, "_fd"):
+            self.close()
+    
+    def __repr__(self) -> str:
+        """Representação em string do BufferSource."""
+        return (
+            f"BufferSource(name='{self.name}', method='{self.method}', "
+            f"size={self.size})"
+        )
@@ -0,0 +1,238 @@
+"""
+Clip Writer Module
+
+Implementa a classe ClipWriter, que grava apenas trechos curtos do vídeo
+em torno de eventos (anomalias, início de atividades) em vez do vídeo
+anotado inteiro.
+"""
+
+import os
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.io.writer import VideoWriter
+
+
+class ClipWriter:
+    """
+    Grava clipes com pré e pós-roll em torno de eventos.
+    
+    Os frames recebidos por write() ficam em um buffer circular com os
+    últimos `pre_seconds` de vídeo. Quando trigger() é chamado, um clipe
+    novo é aberto com o conteúdo do buffer (pré-roll) e segue gravando
+    até `post_seconds` depois do último evento; eventos dentro desse
+    intervalo estendem o mesmo clipe. Fora dos clipes nada é codificado.
+    
+    Os frames passam a pertencer ao ClipWriter em write(): `on_written` é
+    chamado quando cada frame é descartado do buffer ou codificado.
+    
+    Attributes:
+        output_dir (str): Diretório dos clipes
+        fps (float): Taxa de frames dos clipes
+        pre_frames (int): Frames de pré-roll mantidos no buffer
+        post_frames (int): Frames gravados depois do último evento
+        clips (List[Dict]): Índice dos clipes finalizados
+    
+    Example:
+        >>> clips = ClipWriter("outputs/clips", fps=30.0, frame_size=(1280, 720))
+        >>> for idx, frame, timestamp in frames:
+        ...     if event:
+        ...         clips.trigger(idx, timestamp, "anomaly:faces_count")
+        ...     clips.write(frame, idx, timestamp)
+        >>> clips.release()
+        >>> clips.clips[0]['path']
+        'outputs/clips/clip_000_f000120.mp4'
+    """
+    
+    def __init__(
+        self,
+        output_dir: str,
+        fps: float,
+        frame_size: Tuple[int, int],
+        pre_seconds: float = 2.0,
+        post_seconds: float = 3.0,
+        prefix: str = "clip",
+        extension: str = ".mp4",
+        on_written: Optional[Callable[[np.ndarray], None]] = None,
+        **writer_kwargs: Any
+    ) -> None:
+        """
+        Inicializa o ClipWriter.
+        
+        Args:
+            output_dir: Diretório onde os clipes são salvos (criado se
+                        necessário)
+            fps: Taxa de frames dos frames recebidos
+            frame_size: Dimensões (width, height) dos clipes
+            pre_seconds: Segundos gravados antes de cada evento
+            post_seconds: Segundos gravados depois do último evento
+            prefix: Prefixo do nome dos arquivos de clipe
+            extension: Extensão dos arquivos de clipe
+            on_written: Chamado com cada frame recebido por write() quando
+                        ele deixa de ser usado (ex: FramePool.release)
+            **writer_kwargs: Opções repassadas ao VideoWriter de cada clipe
+                             (codec, backend, crf, queue_size, ...)
+        
+        Raises:
+            ValueError: Se fps, pre_seconds ou post_seconds forem inválidos
+        """
+        if fps <= 0:
+            raise ValueError(f"fps must be > 0, got {fps}")
+        
+        if pre_seconds < 0 or post_seconds < 0:
+            raise ValueError(
+                f"pre_seconds and post_seconds must be >= 0, got {pre_seconds}, {post_seconds}"
+            )
+        
+        self.output_dir = output_dir
+        self.fps = fps
+        self.frame_size = frame_size
+        self.pre_frames = int(round(pre_seconds * fps))
+        self.post_frames = int(round(post_seconds * fps))
+        self.prefix = prefix
+        self.extension = extension
+        self.on_written = on_written
+        self.writer_kwargs = writer_kwargs
+        self.clips: List[Dict] = []
+        
+        # Pré-roll: (frame, idx, timestamp) dos últimos pre_frames frames
+        self._ring: deque = deque()
+        self._writer: Optional[VideoWriter] = None
+        self._clip: Optional[Dict] = None
+        self._post_left = 0
+        
+        os.makedirs(output_dir, exist_ok=True)
+    
+    def trigger(self, idx: int, timestamp: float, reason: str) -> None:
+        """
+        Registra um evento no frame atual.
+        
+        Deve ser chamado antes de write() do frame do evento. Abre um clipe
+        novo (com o pré-roll) ou estende o clipe em andamento.
+        
+        Args:
+            idx: Índice do frame do evento
+            timestamp: Timestamp do evento em segundos
+            reason: Descrição do evento (ex: 'anomaly:faces_count')
+        """
+        if self._writer is None:
+            self._open_clip(idx, timestamp)
+        
+        self._clip['events'].append({
+            'frame_idx': idx,
+            'timestamp': timestamp,
+            'reason': reason
+        })
+        # Inclui o próprio frame do evento
+        self._post_left = self.post_frames + 1
+    
+    def write(self, frame: np.ndarray, idx: int, timestamp: float) -> None:
+        """
+        Recebe o próximo frame.
+        
+        Dentro de um clipe o frame é codificado; fora, fica no buffer de
+        pré-roll. O frame não deve ser alterado depois desta chamada.
+        
+        Args:
+            frame: Frame BGR
+            idx: Índice do frame
+            timestamp: Timestamp em segundos
+        """
+        if self._writer is not None:
+            self._writer.write(frame)
+            self._clip['end_frame'] = idx
+            self._clip['end_sec'] = timestamp
+            self._clip['frames'] += 1
+            self._post_left -= 1
+            if self._post_left <= 0:
+                self._close_clip()
+            return
+        
+        if self.pre_frames == 0:
+            self._frame_done(frame)
+            return
+        
+        if len(self._ring) == self.pre_frames:
+            evicted, _, _ = self._ring.popleft()
+            self._frame_done(evicted)
+        self._ring.append((frame, idx, timestamp))
+    
+    def _open_clip(self, idx: int, timestamp: float) -> None:
+        """Abre um clipe novo e grava o pré-roll do buffer."""
+        start_idx, start_sec = idx, timestamp
+        if self._ring:
+            _, start_idx, start_sec = self._ring[0]
+        
+        filename = f"{self.prefix}_{len(self.clips):03d}_f{idx:06d}{self.extension}"
+        path = os.path.join(self.output_dir, filename)
+        
+        self._writer = VideoWriter(
+            path,
+            fps=self.fps,
+            frame_size=self.frame_size,
+            on_written=self.on_written,
+            **self.writer_kwargs
+        )
+        self._clip = {
+            'path': path,
+            'start_frame': start_idx,
+            'end_frame': start_idx,
+            'start_sec': start_sec,
+            'end_sec': start_sec,
+            'frames': 0,
+            'events': []
+        }
+        
+        while self._ring:
+            frame, ring_idx, ring_timestamp = self._ring.popleft()
+            self._writer.write(frame)
+            self._clip['end_frame'] = ring_idx
+            self._clip['end_sec'] = ring_timestamp
+            self._clip['frames'] += 1
+    
+    def _close_clip(self) -> None:
+        """Finaliza o clipe em andamento e o adiciona ao índice."""
+        writer, clip = self._writer, self._clip
+        self._writer = None
+        self._clip = None
+        self._post_left = 0
+        
+        writer.release()
+        self.clips.append(clip)
+    
+    def _frame_done(self, frame: np.ndarray) -> None:
+        """Notifica on_written de que o frame não é mais usado."""
+        if self.on_written is not None:
+            self.on_written(frame)
+    
+    def release(self) -> None:
+        """
+        Finaliza o clipe em andamento e descarta o buffer de pré-roll.
+        
+        Raises:
+            VideoWriterError: Se o encode do clipe em andamento falhar
+        """
+        while self._ring:
+            frame, _, _ = self._ring.popleft()
+            self._frame_done(frame)
+        
+        if self._writer is not None:
+            self._close_clip()
+    
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit - finaliza o clipe em andamento."""
+        self.release()
+    
+    def __repr__(self) -> str:
+        """Representação em string do ClipWriter."""
+        return (
+            f"ClipWriter(output_dir='{self.output_dir}', fps={self.fps}, "
+            f"pre_frames={self.pre_frames}, post_frames={self.post_frames}, "
+            f"clips={len(self.clips)})"
+        )
@@ -0,0 +1,340 @@
+"""
+FFmpeg Capture Module
+
+Implementa a classe FFmpegCapture, um backend de leitura que executa um
+processo `ffmpeg` local e lê frames brutos do stdout. Expõe a mesma interface
+usada pelo VideoReader em cv2.VideoCapture (read, grab, get, set, release).
+"""
+
+import shutil
+import subprocess
+import threading
+from collections import deque
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+# Formatos de pixel suportados -> número de canais
+PIX_FMT_CHANNELS = {
+    'bgr24': 3,
+    'gray': 1,
+}
+
+
+class FFmpegCapture:
+    """
+    Captura de vídeo via subprocesso ffmpeg com saída rawvideo.
+    
+    O ffmpeg pode reduzir a resolução, converter o FPS e o formato de pixel
+    antes de entregar os frames, evitando trabalho em Python/OpenCV. O
+    stream resultante é tratado como o vídeo: get() retorna FPS, contagem e
+    dimensões já convertidos.
+    
+    Com stride > 1, o próprio ffmpeg descarta os frames intermediários
+    (filtro select) antes de convertê-los: só 1 a cada `stride` frames
+    atravessa o pipe. As posições continuam em frames do stream; cada
+    read()/grab() avança `stride` frames.
+    
+    Os metadados do vídeo de origem são lidos com cv2.VideoCapture; o
+    processo ffmpeg só é iniciado na primeira leitura e reiniciado com
+    `-ss` quando set(CAP_PROP_POS_FRAMES) pede outra posição.
+    
+    Attributes:
+        path (str): Caminho do vídeo
+        pix_fmt (str): Formato de saída ('bgr24' ou 'gray')
+        ffmpeg_bin (str): Executável do ffmpeg
+    
+    Example:
+        >>> cap = FFmpegCapture("video.mp4", pix_fmt="gray", max_side=640)
+        >>> ret, frame = cap.read()   # frame.shape == (H, W)
+        >>> cap.release()
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        pix_fmt: str = "bgr24",
+        max_side: Optional[int] = None,
+        fps: Optional[float] = None,
+        stride: int = 1,
+        ffmpeg_bin: str = "ffmpeg"
+    ) -> None:
+        """
+        Inicializa a captura lendo os metadados do vídeo.
+        
+        Args:
+            path: Caminho do vídeo
+            pix_fmt: Formato de pixel de saída ('bgr24' ou 'gray')
+            max_side: Lado maior máximo da saída em pixels (ffmpeg scale)
+            fps: FPS fixo de saída (ffmpeg fps filter)
+            stride: Entregar apenas 1 a cada N frames, a partir da posição
+                    inicial (ffmpeg select filter)
+            ffmpeg_bin: Nome ou caminho do executável ffmpeg
+        
+        Raises:
+            ValueError: Se pix_fmt, max_side, fps ou stride forem inválidos
+        """
+        if pix_fmt not in PIX_FMT_CHANNELS:
+            raise ValueError(
+                f"Unsupported pix_fmt: {pix_fmt}. "
+                f"Options: {', '.join(PIX_FMT_CHANNELS)}"
+            )
+        
+        if max_side is not None and max_side <= 0:
+            raise ValueError(f"max_side must be > 0, got {max_side}")
+        
+        if fps is not None and fps <= 0:
+            raise ValueError(f"fps must be > 0, got {fps}")
+        
+        if stride < 1:
+            raise ValueError(f"stride must be >= 1, got {stride}")
+        
+        self.path = path
+        self.pix_fmt = pix_fmt
+        self.max_side = max_side
+        self.output_fps = fps
+        self.stride = stride
+        self.ffmpeg_bin = ffmpeg_bin
+        
+        self._proc: Optional[subprocess.Popen] = None
+        self._stderr_tail: deque = deque(maxlen=20)
+        self._stderr_thread: Optional[threading.Thread] = None
+        self._pos = 0
+        self._seek_sec: Optional[float] = None
+        self._scratch: Optional[np.ndarray] = None
+        
+        self._opened = self._probe()
+    
+    def _probe(self) -> bool:
+        """Lê FPS, contagem e dimensões de origem e calcula os de saída."""
+        if shutil.which(self.ffmpeg_bin) is None:
+            return False
+        
+        cap = cv2.VideoCapture(self.path)
+        try:
+            if not cap.isOpened():
+                return False
+            src_fps = cap.get(cv2.CAP_PROP_FPS)
+            src_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+            src_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            src_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        finally:
+            cap.release()
+        
+        if src_fps <= 0 or src_width <= 0 or src_height <= 0:
+            return False
+        
+        # Dimensões de saída
+        width, height = src_width, src_height
+        if self.max_side is not None and max(width, height) > self.max_side:
+            factor = self.max_side / max(width, height)
+            width = max(1, int(round(width * factor)))
+            height = max(1, int(round(height * factor)))
+        
+        self._width = width
+        self._height = height
+        self._fps = self.output_fps if self.output_fps is not None else src_fps
+        
+        # Com FPS convertido, a contagem é estimada pela duração
+        if self.output_fps is not None and src_count > 0:
+            self._frame_count = float(int(round(src_count / src_fps * self.output_fps)))
+        else:
+            self._frame_count = src_count
+        
+        return True
+    
+    @property
+    def frame_shape(self) -> Tuple[int, ...]:
+        """Formato (H, W) ou (H, W, C) dos frames entregues."""
+        channels = PIX_FMT_CHANNELS[self.pix_fmt]
+        if channels == 1:
+            return (self._height, self._width)
+        return (self._height, self._width, channels)
+    
+    def _build_command(self, start_sec: float) -> List[str]:
+        """Monta a linha de comando do ffmpeg."""
+        cmd = [self.ffmpeg_bin, '-nostdin', '-hide_banner', '-loglevel', 'error']
+        
+        if start_sec > 0:
+            cmd += ['-ss', f"{start_sec:.6f}"]
+        
+        cmd += ['-i', self.path, '-map', '0:v:0', '-an', '-sn']
+        
+        filters = []
+        if self.output_fps is not None:
+            filters.append(f"fps={self.output_fps}")
+        if self.stride > 1:
+            # Frames descartados antes da escala e da conversão de formato;
+            # n conta a partir do primeiro frame depois do -ss
+            filters.append(f"select=not(mod(n\\,{self.stride}))")
+        if self.max_side is not None:
+            filters.append(f"scale={self._width}:{self._height}:flags=area")
+        if filters:
+            cmd += ['-vf', ','.join(filters)]
+        if self.stride > 1:
+            # Sem passthrough o muxer duplicaria frames para manter o FPS
+            cmd += ['-fps_mode', 'passthrough']
+        
+        cmd += ['-f', 'rawvideo', '-pix_fmt', self.pix_fmt, 'pipe:1']
+        return cmd
+    
+    def _start(self) -> None:
+        """Inicia o processo ffmpeg na posição atual."""
+        self._stop()
+        self._stderr_tail.clear()
+        
+        start_sec = self._seek_sec if self._seek_sec is not None else self._pos / self._fps
+        self._proc = subprocess.Popen(
+            self._build_command(start_sec),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0
+        )
+        
+        # Drenar stderr em paralelo para não bloquear o ffmpeg
+        def drain(stream) -> None:
+            for line in iter(stream.readline, b''):
+                self._stderr_tail.append(line.decode(errors='replace').rstrip())
+        
+        self._stderr_thread = threading.Thread(
+            target=drain, args=(self._proc.stderr,), daemon=True
+        )
+        self._stderr_thread.start()
+    
+    def _stop(self) -> None:
+        """Encerra o processo ffmpeg, se houver."""
+        if self._proc is None:
+            return
+        
+        if self._proc.poll() is None:
+            self._proc.kill()
+        self._proc.stdout.close()
+        self._proc.wait()
+        if self._stderr_thread is not None:
+            self._stderr_thread.join()
+        self._proc.stderr.close()
+        
+        self._proc = None
+        self._stderr_thread = None
+    
+    def _read_into(self, buffer: np.ndarray) -> bool:
+        """Preenche `buffer` com os bytes do próximo frame."""
+        if self._proc is None:
+            self._start()
+        
+        view = memoryview(buffer).cast('B')
+        filled = 0
+        while filled < len(view):
+            n = self._proc.stdout.readinto(view[filled:])
+            if not n:
+                return False
+            filled += n
+        
+        self._pos += self.stride
+        return True
+    
+    def last_error(self) -> str:
+        """Retorna as últimas linhas de erro emitidas pelo ffmpeg."""
+        return '\n'.join(self._stderr_tail)
+    
+    def isOpened(self) -> bool:
+        """Indica se o vídeo foi aberto (metadados válidos e ffmpeg presente)."""
+        return self._opened
+    
+    def get(self, prop_id: int) -> float:
+        """Retorna uma propriedade, como cv2.VideoCapture.get()."""
+        if not self._opened:
+            return 0.0
+        if prop_id == cv2.CAP_PROP_FPS:
+            return float(self._fps)
+        if prop_id == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self._frame_count)
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self._width)
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self._height)
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return float(self._pos)
+        return 0.0
+    
+    def set(self, prop_id: int, value: float) -> bool:
+        """
+        Altera uma propriedade. Suporta CAP_PROP_POS_FRAMES e
+        CAP_PROP_POS_MSEC.
+        
+        Reposicionar reinicia o ffmpeg com `-ss` (seek exato por tempo);
+        pedir a posição atual em frames não tem custo.
+        """
+        if not self._opened:
+            return False
+        
+        if prop_id == cv2.CAP_PROP_POS_MSEC:
+            self._stop()
+            self._seek_sec = max(0.0, value / 1000.0)
+            self._pos = int(round(self._seek_sec * self._fps))
+            return True
+        
+        if prop_id != cv2.CAP_PROP_POS_FRAMES:
+            return False
+        
+        position = max(0, int(value))
+        if position == self._pos:
+            return True
+        
+        self._stop()
+        self._pos = position
+        self._seek_sec = None
+        return True
+    
+    def grab(self) -> bool:
+        """Avança um frame entregue (stride frames do stream) descartando os bytes."""
+        if not self._opened:
+            return False
+        if self._scratch is None:
+            self._scratch = np.empty(self.frame_shape, dtype=np.uint8)
+        return self._read_into(self._scratch)
+    
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Lê o próximo frame.
+        
+        Args:
+            image: Buffer de destino reutilizável. Usado se tiver o formato
+                   e dtype corretos; caso contrário um novo array é alocado.
+        
+        Returns:
+            Tupla (ret, frame) como em cv2.VideoCapture.read()
+        """
+        if not self._opened:
+            return False, None
+        
+        shape = self.frame_shape
+        if (
+            image is None
+            or image.shape != shape
+            or image.dtype != np.uint8
+            or not image.flags.c_contiguous
+        ):
+            image = np.empty(shape, dtype=np.uint8)
+        
+        if not self._read_into(image):
+            return False, None
+        return True, image
+    
+    def release(self) -> None:
+        """Encerra o processo ffmpeg."""
+        self._stop()
+    
+    def __del__(self):
+        """Destrutor - garante que o processo seja encerrado."""
+        if hasattr(self, '_proc'):
+            self._stop()
+    
+    def __repr__(self) -> str:
+        """Representação em string do FFmpegCapture."""
+        return (
+            f"FFmpegCapture(path='{self.path}', pix_fmt='{self.pix_fmt}', "
+            f"max_side={self.max_side}, fps={self.output_fps})"
+        )
@@ -0,0 +1,226 @@
+"""
+FFmpeg Encoder Module
+
+Implementa a classe FFmpegEncoder, um backend de escrita que envia frames
+brutos (BGR) pelo stdin de um processo `ffmpeg` local. Expõe a mesma
+interface usada pelo VideoWriter em cv2.VideoWriter (isOpened, write,
+release), com codec, CRF, preset, threads e formato de pixel configuráveis.
+"""
+
+import os
+import shutil
+import subprocess
+import threading
+from collections import deque
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+# Codecs que aceitam -crf e -preset
+_CRF_CODECS = ('libx264', 'libx265', 'libvpx-vp9')
+_PRESET_CODECS = ('libx264', 'libx265')
+
+# Formatos de pixel com subamostragem de croma 2x2 (exigem dimensões pares)
+_SUBSAMPLED_PIX_FMTS = ('yuv420p', 'nv12')
+
+
+class FFmpegEncoder:
+    """
+    Encoder de vídeo via subprocesso ffmpeg lendo rawvideo do stdin.
+    
+    O padrão (libx264, yuv420p, faststart em .mp4/.mov) gera arquivos
+    pequenos que tocam em navegadores, ao contrário do fourcc mp4v do
+    OpenCV. CRF e preset controlam a troca entre CPU de encode e tamanho
+    do arquivo.
+    
+    Attributes:
+        path (str): Caminho do vídeo de saída
+        codec (str): Encoder do ffmpeg (ex: 'libx264', 'libx265', 'mpeg4')
+        crf (int): Fator de qualidade constante (menor = melhor e maior)
+        preset (str): Preset de velocidade do x264/x265
+        threads (int): Threads do encoder (0 = automático)
+        pix_fmt (str): Formato de pixel do arquivo de saída
+    
+    Example:
+        >>> encoder = FFmpegEncoder("out.mp4", 30.0, (1280, 720), crf=28, preset="veryfast")
+        >>> encoder.write(frame)
+        >>> encoder.release()
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        fps: float,
+        frame_size: Tuple[int, int],
+        codec: str = "libx264",
+        crf: Optional[int] = 23,
+        preset: Optional[str] = "veryfast",
+        threads: int = 0,
+        pix_fmt: str = "yuv420p",
+        ffmpeg_bin: str = "ffmpeg"
+    ) -> None:
+        """
+        Inicializa o encoder e inicia o processo ffmpeg.
+        
+        Args:
+            path: Caminho do vídeo de saída
+            fps: Taxa de frames por segundo
+            frame_size: Dimensões (width, height) dos frames recebidos
+            codec: Encoder do ffmpeg
+            crf: Fator de qualidade constante (ignorado por codecs sem CRF)
+            preset: Preset de velocidade (apenas libx264/libx265)
+            threads: Threads do encoder (0 = automático)
+            pix_fmt: Formato de pixel do arquivo de saída
+            ffmpeg_bin: Nome ou caminho do executável ffmpeg
+        
+        Raises:
+            ValueError: Se fps, frame_size, crf ou threads forem inválidos
+        """
+        if fps <= 0:
+            raise ValueError(f"fps must be > 0, got {fps}")
+        
+        if frame_size[0] <= 0 or frame_size[1] <= 0:
+            raise ValueError(f"Invalid frame_size: {frame_size}")
+        
+        if crf is not None and crf < 0:
+            raise ValueError(f"crf must be >= 0, got {crf}")
+        
+        if threads < 0:
+            raise ValueError(f"threads must be >= 0, got {threads}")
+        
+        self.path = path
+        self.fps = fps
+        self.frame_size = frame_size
+        self.codec = codec
+        self.crf = crf
+        self.preset = preset
+        self.threads = threads
+        self.pix_fmt = pix_fmt
+        self.ffmpeg_bin = ffmpeg_bin
+        
+        self._proc: Optional[subprocess.Popen] = None
+        self._stderr_tail: deque = deque(maxlen=20)
+        self._stderr_thread: Optional[threading.Thread] = None
+        self._failed = False
+        
+        if shutil.which(ffmpeg_bin) is not None:
+            self._start()
+    
+    def _build_command(self) -> List[str]:
+        """Monta a linha de comando do ffmpeg."""
+        width, height = self.frame_size
+        
+        cmd = [
+            self.ffmpeg_bin, '-nostdin', '-hide_banner', '-loglevel', 'error', '-y',
+            '-f', 'rawvideo', '-pix_fmt', 'bgr24',
+            '-s', f"{width}x{height}", '-r', f"{self.fps}",
+            '-i', 'pipe:0', '-an',
+            '-c:v', self.codec
+        ]
+        
+        if self.crf is not None and self.codec in _CRF_CODECS:
+            cmd += ['-crf', str(self.crf)]
+            if self.codec == 'libvpx-vp9':
+                cmd += ['-b:v', '0']
+        
+        if self.preset is not None and self.codec in _PRESET_CODECS:
+            cmd += ['-preset', self.preset]
+        
+        cmd += ['-threads', str(self.threads), '-pix_fmt', self.pix_fmt]
+        
+        # Croma 2x2 exige dimensões pares: completar com uma borda de 1 pixel
+        if self.pix_fmt in _SUBSAMPLED_PIX_FMTS and (width % 2 or height % 2):
+            cmd += ['-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2']
+        
+        # moov no início: reprodução progressiva no navegador
+        if os.path.splitext(self.path)[1].lower() in ('.mp4', '.mov'):
+            cmd += ['-movflags', '+faststart']
+        
+        cmd.append(self.path)
+        return cmd
+    
+    def _start(self) -> None:
+        """Inicia o processo ffmpeg."""
+        self._proc = subprocess.Popen(
+            self._build_command(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+        
+        # Drenar stderr em paralelo para não bloquear o ffmpeg
+        def drain(stream) -> None:
+            for line in iter(stream.readline, b''):
+                self._stderr_tail.append(line.decode(errors='replace').rstrip())
+        
+        self._stderr_thread = threading.Thread(
+            target=drain, args=(self._proc.stderr,), daemon=True
+        )
+        self._stderr_thread.start()
+    
+    def last_error(self) -> str:
+        """Retorna as últimas linhas de erro emitidas pelo ffmpeg."""
+        return '\n'.join(self._stderr_tail)
+    
+    def isOpened(self) -> bool:
+        """Indica se o processo ffmpeg está ativo e aceitando frames."""
+        return self._proc is not None and not self._failed and self._proc.poll() is None
+    
+    def write(self, frame: np.ndarray) -> bool:
+        """
+        Envia um frame BGR ao ffmpeg.
+        
+        Args:
+            frame: Frame (H, W, 3) uint8 com as dimensões de frame_size
+        
+        Returns:
+            False se o ffmpeg tiver encerrado (ver last_error())
+        """
+        if self._proc is None or self._failed:
+            return False
+        
+        try:
+            self._proc.stdin.write(memoryview(np.ascontiguousarray(frame)).cast('B'))
+        except (BrokenPipeError, OSError):
+            self._failed = True
+            return False
+        return True
+    
+    def release(self) -> bool:
+        """
+        Fecha o stdin e espera o ffmpeg finalizar o arquivo.
+        
+        Returns:
+            True se o ffmpeg terminou com sucesso
+        """
+        if self._proc is None:
+            return not self._failed
+        
+        try:
+            self._proc.stdin.close()
+        except (BrokenPipeError, OSError):
+            self._failed = True
+        
+        returncode = self._proc.wait()
+        if self._stderr_thread is not None:
+            self._stderr_thread.join()
+        self._proc.stderr.close()
+        
+        self._proc = None
+        self._stderr_thread = None
+        self._failed = self._failed or returncode != 0
+        return not self._failed
+    
+    def __del__(self):
+        """Destrutor - garante que o processo seja finalizado."""
+        if hasattr(self, '_proc'):
+            self.release()
+    
+    def __repr__(self) -> str:
+        """Representação em string do FFmpegEncoder."""
+        return (
+            f"FFmpegEncoder(path='{self.path}', codec='{self.codec}', "
+            f"crf={self.crf}, preset={self.preset!r}, threads={self.threads}, "
+            f"pix_fmt='{self.pix_fmt}')"
+        )
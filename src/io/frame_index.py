@@ -0,0 +1,343 @@
+"""
+Frame Index Module
+
+Implementa a classe FrameIndex, um índice de frames persistido em um arquivo
+binário compacto ao lado do vídeo (sidecar). O índice guarda o PTS de cada
+frame e quais frames são keyframes, permitindo timestamps e contagem exatos
+em vídeos com frame rate variável e seek direto para qualquer frame.
+"""
+
+import os
+import shutil
+import struct
+import subprocess
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+class FrameIndexError(Exception):
+    """Exceção lançada quando o índice não pode ser construído ou lido."""
+    pass
+
+
+class FrameIndex:
+    """
+    Índice de frames de um vídeo: PTS por frame e posições de keyframes.
+    
+    Formato do sidecar (little-endian):
+        - cabeçalho: magic b"FIDX", versão (u16), flags (u16),
+          número de frames (u32), tamanho do vídeo (u64), mtime_ns (i64)
+        - PTS em segundos a partir do início do stream (float64 × N)
+        - bitmap de keyframes (ceil(N / 8) bytes)
+    
+    O tamanho e o mtime do vídeo são usados para descartar sidecars de
+    versões antigas do arquivo.
+    
+    Attributes:
+        pts (np.ndarray): Timestamps em segundos, um por frame (float64)
+        keyframes (np.ndarray): Máscara booleana de keyframes
+        has_keyframes (bool): Se a máscara de keyframes é conhecida
+    
+    Example:
+        >>> index = FrameIndex.load_or_build("video.mp4")
+        >>> index.frame_count
+        1800
+        >>> index.timestamp(900)
+        30.0166
+        >>> index.frame_at(30.0)
+        899
+    """
+    
+    MAGIC = b"FIDX"
+    VERSION = 1
+    SUFFIX = ".fidx"
+    
+    _HEADER = struct.Struct("<4sHHIQq")
+    _FLAG_KEYFRAMES = 0x1
+    
+    def __init__(
+        self,
+        pts: np.ndarray,
+        keyframes: Optional[np.ndarray] = None,
+        video_size: int = 0,
+        video_mtime_ns: int = 0
+    ) -> None:
+        """
+        Inicializa o índice.
+        
+        Args:
+            pts: Timestamps dos frames em segundos, em ordem de apresentação
+            keyframes: Máscara booleana de keyframes (None se desconhecida)
+            video_size: Tamanho do vídeo indexado em bytes
+            video_mtime_ns: mtime do vídeo indexado em nanossegundos
+        
+        Raises:
+            FrameIndexError: Se os arrays forem inconsistentes
+        """
+        self.pts = np.ascontiguousarray(pts, dtype=np.float64)
+        
+        if self.pts.ndim != 1 or len(self.pts) == 0:
+            raise FrameIndexError("Frame index must contain at least one frame")
+        
+        self.has_keyframes = keyframes is not None
+        if keyframes is None:
+            keyframes = np.zeros(len(self.pts), dtype=bool)
+            keyframes[0] = True
+        self.keyframes = np.asarray(keyframes, dtype=bool)
+        
+        if self.keyframes.shape != self.pts.shape:
+            raise FrameIndexError("pts and keyframes must have the same length")
+        
+        self.video_size = video_size
+        self.video_mtime_ns = video_mtime_ns
+        self._keyframe_positions = np.flatnonzero(self.keyframes)
+    
+    @property
+    def frame_count(self) -> int:
+        """Número exato de frames do vídeo."""
+        return len(self.pts)
+    
+    @property
+    def duration(self) -> float:
+        """Duração do vídeo em segundos (até o fim do último frame)."""
+        return float(self.pts[-1] + self.frame_interval)
+    
+    @property
+    def frame_interval(self) -> float:
+        """Intervalo mediano entre frames em segundos."""
+        if len(self.pts) < 2:
+            return 0.0
+        return float(np.median(np.diff(self.pts)))
+    
+    def timestamp(self, idx: int) -> float:
+        """Retorna o PTS (segundos) do frame `idx`."""
+        return float(self.pts[idx])
+    
+    def frame_at(self, seconds: float) -> int:
+        """
+        Retorna o índice do primeiro frame com PTS >= `seconds`.
+        
+        Args:
+            seconds: Tempo em segundos
+        
+        Returns:
+            Índice do frame (frame_count se após o fim)
+        """
+        return int(np.searchsorted(self.pts, seconds - 1e-6, side='left'))
+    
+    def keyframe_before(self, idx: int) -> int:
+        """Retorna o índice do último keyframe em ou antes de `idx`."""
+        pos = np.searchsorted(self._keyframe_positions, idx, side='right') - 1
+        return int(self._keyframe_positions[max(pos, 0)])
+    
+    @classmethod
+    def sidecar_path(cls, video_path: str) -> str:
+        """Retorna o caminho do sidecar para um vídeo."""
+        return video_path + cls.SUFFIX
+    
+    def matches(self, video_path: str) -> bool:
+        """Verifica se o índice corresponde à versão atual do vídeo."""
+        stat = os.stat(video_path)
+        return (
+            stat.st_size == self.video_size
+            and stat.st_mtime_ns == self.video_mtime_ns
+        )
+    
+    def save(self, path: str) -> None:
+        """
+        Salva o índice em formato binário.
+        
+        Args:
+            path: Caminho do arquivo sidecar
+        """
+        flags = self._FLAG_KEYFRAMES if self.has_keyframes else 0
+        header = self._HEADER.pack(
+            self.MAGIC, self.VERSION, flags, self.frame_count,
+            self.video_size, self.video_mtime_ns
+        )
+        
+        # Escrita atômica para não deixar sidecars truncados
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+            f.write(self.pts.astype('<f8').tobytes())
+            f.write(np.packbits(self.keyframes).tobytes())
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path: str) -> "FrameIndex":
+        """
+        Carrega um índice salvo com save().
+        
+        Args:
+            path: Caminho do arquivo sidecar
+        
+        Returns:
+            FrameIndex carregado
+        
+        Raises:
+            FrameIndexError: Se o arquivo for inválido ou estiver truncado
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        
+        if len(data) < cls._HEADER.size:
+            raise FrameIndexError(f"Truncated frame index: {path}")
+        
+        magic, version, flags, count, size, mtime_ns = cls._HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise FrameIndexError(f"Invalid frame index file: {path}")
+        
+        offset = cls._HEADER.size
+        pts_bytes = count * 8
+        key_bytes = (count + 7) // 8
+        if len(data) != offset + pts_bytes + key_bytes:
+            raise FrameIndexError(f"Truncated frame index: {path}")
+        
+        pts = np.frombuffer(data, dtype='<f8', count=count, offset=offset)
+        keyframes = np.unpackbits(
+            np.frombuffer(data, dtype=np.uint8, count=key_bytes, offset=offset + pts_bytes),
+            count=count
+        ).astype(bool)
+        
+        return cls(
+            pts=pts.astype(np.float64),
+            keyframes=keyframes if flags & cls._FLAG_KEYFRAMES else None,
+            video_size=size,
+            video_mtime_ns=mtime_ns
+        )
+    
+    @classmethod
+    def build(cls, video_path: str) -> "FrameIndex":
+        """
+        Constrói o índice com uma passada completa pelo vídeo.
+        
+        Usa `ffprobe` (leitura de pacotes, sem decodificar, com keyframes)
+        quando disponível; caso contrário percorre o vídeo com grab() do
+        OpenCV registrando CAP_PROP_POS_MSEC (sem informação de keyframes).
+        
+        Args:
+            video_path: Caminho do vídeo
+        
+        Returns:
+            FrameIndex construído
+        
+        Raises:
+            FrameIndexError: Se nenhum frame puder ser indexado
+        """
+        stat = os.stat(video_path)
+        
+        if shutil.which("ffprobe") is not None:
+            pts, keyframes = cls._scan_ffprobe(video_path)
+        else:
+            pts, keyframes = cls._scan_opencv(video_path), None
+        
+        if len(pts) == 0:
+            raise FrameIndexError(f"No frames could be indexed in: {video_path}")
+        
+        return cls(
+            pts=pts,
+            keyframes=keyframes,
+            video_size=stat.st_size,
+            video_mtime_ns=stat.st_mtime_ns
+        )
+    
+    @classmethod
+    def load_or_build(cls, video_path: str, save: bool = True) -> "FrameIndex":
+        """
+        Carrega o sidecar do vídeo ou o (re)constrói se ausente ou obsoleto.
+        
+        Args:
+            video_path: Caminho do vídeo
+            save: Se deve gravar o sidecar após construir o índice
+        
+        Returns:
+            FrameIndex do vídeo
+        """
+        sidecar = cls.sidecar_path(video_path)
+        
+        if os.path.isfile(sidecar):
+            try:
+                index = cls.load(sidecar)
+                if index.matches(video_path):
+                    return index
+            except (FrameIndexError, OSError):
+                pass
+        
+        index = cls.build(video_path)
+        
+        if save:
+            try:
+                index.save(sidecar)
+            except OSError:
+                # Diretório somente leitura: seguir com o índice em memória
+                pass
+        
+        return index
+    
+    @staticmethod
+    def _scan_opencv(video_path: str) -> np.ndarray:
+        """Percorre o vídeo com grab() registrando o PTS de cada frame."""
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise FrameIndexError(f"Failed to open video for indexing: {video_path}")
+        
+        pts = []
+        try:
+            while cap.grab():
+                pts.append(cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0)
+        finally:
+            cap.release()
+        
+        return np.asarray(pts, dtype=np.float64)
+    
+    @staticmethod
+    def _scan_ffprobe(video_path: str) -> tuple:
+        """Lê PTS e flags de keyframe dos pacotes com ffprobe."""
+        result = subprocess.run(
+            [
+                "ffprobe", "-v", "error", "-select_streams", "v:0",
+                "-show_entries", "packet=pts_time,flags",
+                "-of", "csv=p=0", video_path
+            ],
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            raise FrameIndexError(
+                f"ffprobe failed for {video_path}: {result.stderr.strip()}"
+            )
+        
+        entries = []
+        for line in result.stdout.splitlines():
+            fields = line.strip().split(',')
+            if len(fields) < 2 or fields[0] in ('', 'N/A'):
+                continue
+            entries.append((float(fields[0]), 'K' in fields[1]))
+        
+        if not entries:
+            return np.empty(0, dtype=np.float64), None
+        
+        # Pacotes vêm em ordem de decodificação: ordenar por PTS
+        entries.sort(key=lambda entry: entry[0])
+        pts = np.array([entry[0] for entry in entries], dtype=np.float64)
+        keyframes = np.array([entry[1] for entry in entries], dtype=bool)
+        
+        # Mesma origem usada pelo OpenCV em CAP_PROP_POS_MSEC
+        pts -= pts[0]
+        
+        return pts, keyframes
+    
+    def __len__(self) -> int:
+        """Número de frames indexados."""
+        return self.frame_count
+    
+    def __repr__(self) -> str:
+        """Representação em string do FrameIndex."""
+        return (
+            f"FrameIndex(frames={self.frame_count}, "
+            f"duration={self.duration:.2f}s, "
+            f"keyframes={int(self.keyframes.sum()) if self.has_keyframes else 'unknown'})"
+        )
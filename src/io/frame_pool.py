@@ -0,0 +1,116 @@
+"""
+Frame Pool Module
+
+Implementa a classe FramePool, um pool de buffers pré-alocados para frames,
+evitando uma alocação H×W×3 nova a cada frame decodificado.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+class FramePool:
+    """
+    Pool thread-safe de buffers NumPy reutilizáveis, agrupados por formato.
+    
+    `acquire()` devolve um buffer livre do formato pedido (ou aloca um novo
+    se não houver); `release()` devolve o buffer ao pool. Até `max_buffers`
+    buffers livres são mantidos por formato; os excedentes são descartados.
+    
+    O conteúdo de um buffer adquirido é indefinido: quem adquire deve
+    sobrescrevê-lo por completo (ex: VideoCapture.read(image=buffer)).
+    
+    Attributes:
+        max_buffers (int): Máximo de buffers livres retidos por formato
+        allocations (int): Total de buffers alocados pelo pool
+    
+    Example:
+        >>> pool = FramePool(max_buffers=4)
+        >>> buffer = pool.acquire((480, 640, 3))
+        >>> ret, frame = cap.read(image=buffer)
+        >>> # ... processar e escrever o frame ...
+        >>> pool.release(frame)
+    """
+    
+    def __init__(self, max_buffers: int = 8) -> None:
+        """
+        Inicializa o pool.
+        
+        Args:
+            max_buffers: Máximo de buffers livres mantidos por formato
+        
+        Raises:
+            ValueError: Se max_buffers for menor que 1
+        """
+        if max_buffers < 1:
+            raise ValueError(f"max_buffers must be >= 1, got {max_buffers}")
+        
+        self.max_buffers = max_buffers
+        self.allocations = 0
+        self._free: Dict[Tuple[Tuple[int, ...], np.dtype], List[np.ndarray]] = defaultdict(list)
+        self._lock = threading.Lock()
+    
+    def acquire(
+        self,
+        shape: Tuple[int, ...],
+        dtype: np.dtype = np.uint8
+    ) -> np.ndarray:
+        """
+        Obtém um buffer do formato pedido.
+        
+        Args:
+            shape: Formato do buffer (ex: (H, W, 3))
+            dtype: Tipo dos elementos
+        
+        Returns:
+            Buffer com conteúdo indefinido
+        """
+        key = (tuple(shape), np.dtype(dtype))
+        
+        with self._lock:
+            free = self._free[key]
+            if free:
+                return free.pop()
+            self.allocations += 1
+        
+        return np.empty(shape, dtype=dtype)
+    
+    def release(self, buffer: np.ndarray) -> None:
+        """
+        Devolve um buffer ao pool.
+        
+        Views e arrays que não possuem a própria memória são ignorados,
+        pois reutilizá-los sobrescreveria dados de outro array.
+        
+        Args:
+            buffer: Buffer obtido de acquire() (ou alocado externamente)
+        """
+        if buffer is None or buffer.base is not None or not buffer.flags.c_contiguous:
+            return
+        
+        key = (buffer.shape, buffer.dtype)
+        
+        with self._lock:
+            free = self._free[key]
+            if len(free) < self.max_buffers and not any(b is buffer for b in free):
+                free.append(buffer)
+    
+    def clear(self) -> None:
+        """Descarta todos os buffers livres."""
+        with self._lock:
+            self._free.clear()
+    
+    def __len__(self) -> int:
+        """Número de buffers livres no pool."""
+        with self._lock:
+            return sum(len(free) for free in self._free.values())
+    
+    def __repr__(self) -> str:
+        """Representação em string do FramePool."""
+        return (
+            f"FramePool(max_buffers={self.max_buffers}, "
+            f"free={len(self)}, allocations={self.allocations})"
+        )
@@ -0,0 +1,278 @@
+"""
+Thumbnail Exporter Module
+
+Implementa a classe ThumbnailExporter, que salva miniaturas (JPEG/WebP) de
+frames relevantes (anomalias, inícios de atividade e a cada N segundos) e
+folhas de contato com as miniaturas em grade, para triagem rápida de
+vídeos longos. A codificação das imagens roda em um pool de threads.
+"""
+
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from src.utils.viz import format_timestamp
+
+
+class ThumbnailExportError(Exception):
+    """Exceção lançada quando uma miniatura ou folha de contato não é salva."""
+    pass
+
+
+class ThumbnailExporter:
+    """
+    Exporta miniaturas de frames e folhas de contato.
+    
+    capture() reduz o frame no thread chamador (uma cópia pequena, então o
+    frame original pode ser reutilizado em seguida) e envia a codificação
+    para o pool; o loop principal nunca espera por cv2.imwrite. As
+    miniaturas são agrupadas em folhas de contato de `sheet_columns` ×
+    `sheet_rows`, montadas e salvas assim que cada folha fica completa, o
+    que mantém a memória limitada em vídeos longos.
+    
+    Ao final, release() grava `index.json` com o índice das miniaturas e
+    das folhas.
+    
+    Attributes:
+        output_dir (str): Diretório das imagens
+        interval_sec (float): Intervalo das miniaturas periódicas (0 = desativado)
+        thumbnails (List[Dict]): Índice das miniaturas (path, frame_idx,
+                                 timestamp, reasons)
+        sheets (List[Dict]): Índice das folhas de contato (path, frames)
+    
+    Example:
+        >>> exporter = ThumbnailExporter("outputs/frames", interval_sec=10.0)
+        >>> for idx, frame, timestamp in frames:
+        ...     exporter.capture(frame, idx, timestamp, reasons=["anomaly"] if anomaly else [])
+        >>> exporter.release()
+    """
+    
+    def __init__(
+        self,
+        output_dir: str,
+        interval_sec: float = 10.0,
+        max_side: int = 320,
+        image_format: str = "jpg",
+        quality: int = 85,
+        sheet_columns: int = 8,
+        sheet_rows: int = 8,
+        tile_width: int = 160,
+        workers: int = 2
+    ) -> None:
+        """
+        Inicializa o exportador.
+        
+        Args:
+            output_dir: Diretório das imagens (criado se necessário)
+            interval_sec: Segundos entre miniaturas periódicas (0 desativa)
+            max_side: Lado maior máximo das miniaturas
+            image_format: 'jpg' ou 'webp'
+            quality: Qualidade de compressão (1-100)
+            sheet_columns: Colunas de cada folha de contato
+            sheet_rows: Linhas de cada folha de contato
+            tile_width: Largura de cada miniatura na folha de contato
+            workers: Threads de codificação
+        
+        Raises:
+            ValueError: Se algum parâmetro for inválido
+        """
+        if image_format not in ("jpg", "webp"):
+            raise ValueError(f"image_format must be 'jpg' or 'webp', got {image_format}")
+        
+        if interval_sec < 0:
+            raise ValueError(f"interval_sec must be >= 0, got {interval_sec}")
+        
+        if not 1 <= quality <= 100:
+            raise ValueError(f"quality must be in [1, 100], got {quality}")
+        
+        if min(max_side, sheet_columns, sheet_rows, tile_width, workers) < 1:
+            raise ValueError("max_side, sheet_columns, sheet_rows, tile_width and workers must be >= 1")
+        
+        self.output_dir = output_dir
+        self.interval_sec = interval_sec
+        self.max_side = max_side
+        self.image_format = image_format
+        self.quality = quality
+        self.sheet_columns = sheet_columns
+        self.sheet_rows = sheet_rows
+        self.tile_width = tile_width
+        self.thumbnails: List[Dict] = []
+        self.sheets: List[Dict] = []
+        
+        if image_format == "webp":
+            self._params = [cv2.IMWRITE_WEBP_QUALITY, quality]
+        else:
+            self._params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+        
+        self._next_interval = 0.0
+        self._tiles: List[np.ndarray] = []
+        self._tile_frames: List[int] = []
+        self._futures: List[Future] = []
+        self._executor: Optional[ThreadPoolExecutor] = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="ThumbnailExporter"
+        )
+        
+        os.makedirs(output_dir, exist_ok=True)
+    
+    def capture(
+        self,
+        frame: np.ndarray,
+        idx: int,
+        timestamp: float,
+        reasons: Sequence[str] = ()
+    ) -> bool:
+        """
+        Salva uma miniatura se houver motivo (evento ou intervalo periódico).
+        
+        Args:
+            frame: Frame BGR ou grayscale (não é retido: pode ser alterado
+                   em seguida)
+            idx: Índice do frame
+            timestamp: Timestamp em segundos
+            reasons: Eventos no frame (ex: 'anomaly:faces_count',
+                     'activity:walking')
+        
+        Returns:
+            True se uma miniatura foi agendada
+        """
+        reasons = list(reasons)
+        if self.interval_sec > 0 and timestamp >= self._next_interval:
+            reasons.append("interval")
+            # Próximo múltiplo do intervalo (sem rajadas após lacunas)
+            self._next_interval = (timestamp // self.interval_sec + 1) * self.interval_sec
+        
+        if not reasons:
+            return False
+        
+        thumbnail = self._resize(frame, self.max_side)
+        if thumbnail.ndim == 2:
+            thumbnail = cv2.cvtColor(thumbnail, cv2.COLOR_GRAY2BGR)
+        path = os.path.join(self.output_dir, f"thumb_f{idx:06d}.{self.image_format}")
+        self.thumbnails.append({
+            'path': path,
+            'frame_idx': idx,
+            'timestamp': timestamp,
+            'reasons': reasons
+        })
+        self._submit(self._write, path, thumbnail)
+        
+        self._add_tile(thumbnail, idx, timestamp)
+        return True
+    
+    @staticmethod
+    def _resize(frame: np.ndarray, max_side: int) -> np.ndarray:
+        """Reduz o frame para caber em max_side (sempre retorna uma cópia)."""
+        height, width = frame.shape[:2]
+        scale = max_side / max(width, height)
+        if scale >= 1.0:
+            return frame.copy()
+        size = (max(1, int(round(width * scale))), max(1, int(round(height * scale))))
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    
+    def _add_tile(self, thumbnail: np.ndarray, idx: int, timestamp: float) -> None:
+        """Adiciona a miniatura à folha de contato atual."""
+        height, width = thumbnail.shape[:2]
+        tile_height = max(1, int(round(height * self.tile_width / width)))
+        tile = cv2.resize(thumbnail, (self.tile_width, tile_height), interpolation=cv2.INTER_AREA)
+        
+        # Timestamp no canto inferior esquerdo
+        cv2.putText(
+            tile, format_timestamp(timestamp), (4, tile_height - 6),
+            cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 0, 0), 3, cv2.LINE_AA
+        )
+        cv2.putText(
+            tile, format_timestamp(timestamp), (4, tile_height - 6),
+            cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1, cv2.LINE_AA
+        )
+        
+        self._tiles.append(tile)
+        self._tile_frames.append(idx)
+        
+        if len(self._tiles) == self.sheet_columns * self.sheet_rows:
+            self._flush_sheet()
+    
+    def _flush_sheet(self) -> None:
+        """Agenda a montagem e gravação da folha de contato atual."""
+        if not self._tiles:
+            return
+        
+        path = os.path.join(
+            self.output_dir, f"contact_sheet_{len(self.sheets):03d}.{self.image_format}"
+        )
+        self.sheets.append({'path': path, 'frames': self._tile_frames})
+        self._submit(self._write_sheet, path, self._tiles)
+        
+        self._tiles = []
+        self._tile_frames = []
+    
+    def _write_sheet(self, path: str, tiles: List[np.ndarray]) -> None:
+        """Monta a grade de miniaturas e a salva (thread do pool)."""
+        tile_height = max(tile.shape[0] for tile in tiles)
+        columns = min(self.sheet_columns, len(tiles))
+        rows = -(-len(tiles) // columns)
+        
+        sheet = np.zeros((rows * tile_height, columns * self.tile_width, 3), dtype=np.uint8)
+        for i, tile in enumerate(tiles):
+            row, column = divmod(i, columns)
+            y, x = row * tile_height, column * self.tile_width
+            sheet[y:y + tile.shape[0], x:x + self.tile_width] = tile
+        
+        self._write(path, sheet)
+    
+    def _write(self, path: str, image: np.ndarray) -> None:
+        """Codifica e salva uma imagem (thread do pool)."""
+        if not cv2.imwrite(path, image, self._params):
+            raise ThumbnailExportError(f"Failed to write image: {path}")
+    
+    def _submit(self, fn, *args) -> None:
+        """Envia uma tarefa ao pool, descartando futures já concluídos."""
+        self._futures = [future for future in self._futures if not future.done() or future.exception()]
+        self._futures.append(self._executor.submit(fn, *args))
+    
+    def release(self) -> None:
+        """
+        Grava a última folha de contato, aguarda o pool e salva o índice.
+        
+        Raises:
+            ThumbnailExportError: Se alguma imagem não pôde ser salva
+        """
+        if self._executor is None:
+            return
+        
+        self._flush_sheet()
+        self._executor.shutdown(wait=True)
+        self._executor = None
+        
+        errors = [future.exception() for future in self._futures if future.exception()]
+        self._futures = []
+        
+        with open(os.path.join(self.output_dir, "index.json"), 'w', encoding='utf-8') as f:
+            json.dump(
+                {'thumbnails': self.thumbnails, 'contact_sheets': self.sheets},
+                f, indent=2, ensure_ascii=False
+            )
+        
+        if errors:
+            raise ThumbnailExportError(
+                f"{len(errors)} image(s) could not be written: {errors[0]}"
+            ) from errors[0]
+    
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit - aguarda as gravações pendentes."""
+        self.release()
+    
+    def __repr__(self) -> str:
+        """Representação em string do ThumbnailExporter."""
+        return (
+            f"ThumbnailExporter(output_dir='{self.output_dir}', "
+            f"format='{self.image_format}', thumbnails={len(self.thumbnails)}, "
+            f"sheets={len(self.sheets)})"
+        )
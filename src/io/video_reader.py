@@ -1,16 +1,25 @@
 """
 Video Reader Module
 
-Implementa a classe VideoReader para leitura eficiente de vídeos usando OpenCV.
+Implementa a classe VideoReader para leitura eficiente de vídeos usando OpenCV
+ou, opcionalmente, um subprocesso ffmpeg.
 """
 
 import os
+import queue
+import threading
+import time
 from pathlib import Path
-from typing import Iterator, Tuple
+from typing import Iterator, Optional, Tuple
 
 import cv2
 import numpy as np
 
+from src.io.buffer_source import BufferSource
+from src.io.ffmpeg_capture import FFmpegCapture, PIX_FMT_CHANNELS
+from src.io.frame_index import FrameIndex, FrameIndexError
+from src.io.frame_pool import FramePool
+
 
 class VideoReaderError(Exception):
     """Exceção base para erros do VideoReader."""
@@ -27,6 +36,10 @@ class VideoOpenError(VideoReaderError):
     pass
 
 
+# Marcador de fim de stream usado pela thread de prefetch
+_END_OF_STREAM = object()
+
+
 class VideoReader:
     """
     Classe para leitura de vídeos frame a frame.
@@ -39,44 +52,349 @@ class VideoReader:
         _cap (cv2.VideoCapture): Objeto de captura do OpenCV
         _fps (float): Frames por segundo do vídeo
         _frame_count (int): Número total de frames
-        
+        prefetch (int): Profundidade da fila de pré-leitura (0 = síncrono)
+        stride (int): Intervalo entre frames entregues (1 = todos)
+        scale (float): Fator de redução dos frames entregues (opcional)
+        max_side (int): Lado maior máximo dos frames entregues (opcional)
+        pool (FramePool): Pool de buffers para decodificação (opcional)
+        backend (str): Backend de decodificação ('opencv' ou 'ffmpeg')
+        index (FrameIndex): Índice de frames do sidecar (se use_index=True)
+        source_mode (str): 'file', 'live' (câmera, pipe, URL) ou 'tail'
+                           (arquivo ainda sendo gravado)
+    
     Example:
         >>> reader = VideoReader("video.mp4")
         >>> for idx, frame, timestamp in reader:
         ...     print(f"Frame {idx} at {timestamp:.2f}s")
         ...     # Processar frame
+        
+        # Decodificação em thread separada, sobrepondo leitura e inferência:
+        >>> with VideoReader("video.mp4", prefetch=8) as reader:
+        ...     for idx, frame, timestamp in reader:
+        ...         pass
+        
+        # Análise amostrada: 1 a cada 5 frames entre 60s e 120s
+        >>> reader = VideoReader("video.mp4", stride=5, start_sec=60, end_sec=120)
+        
+        # Frames reduzidos para análise junto com o frame original:
+        >>> reader = VideoReader("video_4k.mp4", max_side=960)
+        >>> for idx, full, small, ts in reader.iter_full_and_scaled():
+        ...     faces = detector.detect(small, scale=reader.scale_factor())
+        
+        # ffmpeg decodificando direto em escala de cinza e baixa resolução:
+        >>> reader = VideoReader("video.mp4", backend="ffmpeg",
+        ...                      pix_fmt="gray", decode_max_side=640)
+        
+        # Timestamps/contagem exatos e seek direto via sidecar (vídeos VFR):
+        >>> reader = VideoReader("phone.mp4", use_index=True)
+        >>> frame = reader.read_frame(1234)
+        
+        # Câmera/pipe sem duração conhecida, com timestamps de relógio:
+        >>> reader = VideoReader("0", source_mode="live")
+        
+        # Gravação em andamento: continua lendo enquanto o arquivo cresce
+        >>> reader = VideoReader("recording.mkv", source_mode="tail", tail_timeout=30)
+        
+        # Vídeo em memória (ex: upload), sem gravar uma cópia em disco:
+        >>> reader = VideoReader.from_buffer(uploaded_file, name="upload.mp4")
     """
     
-    def __init__(self, path: str) -> None:
+    # Lacunas (em frames) a partir das quais um seek é mais barato que grab()
+    SEEK_MIN_GAP = 120
+    
+    # Intervalo (s) entre verificações de crescimento do arquivo no modo tail
+    TAIL_POLL_INTERVAL = 0.2
+    
+    def __init__(
+        self,
+        path: str,
+        prefetch: int = 0,
+        stride: int = 1,
+        start_frame: Optional[int] = None,
+        end_frame: Optional[int] = None,
+        start_sec: Optional[float] = None,
+        end_sec: Optional[float] = None,
+        scale: Optional[float] = None,
+        max_side: Optional[int] = None,
+        pool: Optional[FramePool] = None,
+        backend: str = "opencv",
+        pix_fmt: str = "bgr24",
+        decode_max_side: Optional[int] = None,
+        decode_fps: Optional[float] = None,
+        use_index: bool = False,
+        source_mode: str = "file",
+        tail_timeout: float = 10.0
+    ) -> None:
         """
         Inicializa o VideoReader e valida o arquivo de vídeo.
         
         Args:
             path: Caminho para o arquivo de vídeo
+            prefetch: Número máximo de frames decodificados antecipadamente
+                      por uma thread de leitura. 0 desativa o prefetch e
+                      decodifica no mesmo thread que consome os frames.
+            stride: Entregar apenas 1 a cada `stride` frames. Frames
+                    pulados são descartados com grab() (sem retrieve()) ou,
+                    em lacunas longas, via seek.
+            start_frame: Primeiro frame a entregar (inclusive)
+            end_frame: Frame final da janela (exclusivo)
+            start_sec: Início da janela em segundos (alternativa a start_frame)
+            end_sec: Fim da janela em segundos (alternativa a end_frame)
+            scale: Fator (0, 1] aplicado aos frames entregues
+            max_side: Lado maior máximo, em pixels, dos frames entregues
+                      (alternativa a scale; nunca amplia o frame)
+            pool: FramePool onde os frames são decodificados e reduzidos.
+                  Quem consome os frames deve devolvê-los com
+                  pool.release(frame) quando não precisar mais deles.
+            backend: 'opencv' (cv2.VideoCapture) ou 'ffmpeg' (subprocesso
+                     ffmpeg lendo rawvideo pelo stdout)
+            pix_fmt: Formato de pixel do backend ffmpeg ('bgr24' ou 'gray')
+            decode_max_side: Lado maior máximo aplicado pelo ffmpeg na
+                             decodificação (apenas backend ffmpeg)
+            decode_fps: FPS fixo de saída do ffmpeg (apenas backend ffmpeg)
+            use_index: Usar o índice de frames salvo ao lado do vídeo
+                       (<video>.fidx), construindo-o na primeira vez. Dá
+                       contagem e timestamps exatos (PTS) e seek por tempo.
+            source_mode: 'file' (padrão), 'live' ou 'tail'. Em 'live' a
+                         fonte pode ser um índice de câmera ("0"), um
+                         dispositivo, um pipe nomeado ou uma URL; a duração
+                         é desconhecida e os timestamps são de relógio
+                         (segundos desde o primeiro frame). Em 'tail' o
+                         arquivo é relido conforme cresce, até ficar
+                         `tail_timeout` segundos sem crescer.
+            tail_timeout: Espera máxima (s) por novos dados no modo tail
+            
+            Com decode_max_side/decode_fps, o stream convertido pelo ffmpeg
+            passa a ser o vídeo: fps(), frame_count() e frame_size() refletem
+            a saída convertida.
             
+            Nos modos 'live' e 'tail', frame_count() e duration() refletem
+            apenas os frames lidos até o momento.
+        
         Raises:
             VideoNotFoundError: Se o arquivo não existir
-            VideoOpenError: Se o vídeo não puder ser aberto pelo OpenCV
+            VideoOpenError: Se o vídeo não puder ser aberto
+            ValueError: Se algum parâmetro for inválido
         """
+        if backend not in ("opencv", "ffmpeg"):
+            raise ValueError(f"Unknown backend: {backend}")
+        
+        if backend != "ffmpeg" and (
+            pix_fmt != "bgr24" or decode_max_side is not None or decode_fps is not None
+        ):
+            raise ValueError(
+                "pix_fmt, decode_max_side and decode_fps require backend='ffmpeg'"
+            )
+        
+        if pix_fmt not in PIX_FMT_CHANNELS:
+            raise ValueError(f"Unsupported pix_fmt: {pix_fmt}")
+        
+        if use_index and decode_fps is not None:
+            raise ValueError("use_index cannot be combined with decode_fps")
+        
+        if source_mode not in ("file", "live", "tail"):
+            raise ValueError(f"Unknown source_mode: {source_mode}")
+        
+        if source_mode == "live" and backend != "opencv":
+            raise ValueError("source_mode='live' requires backend='opencv'")
+        
+        if source_mode == "live" and (start_sec is not None or end_sec is not None):
+            raise ValueError("source_mode='live' does not support start_sec/end_sec")
+        
+        if source_mode != "file" and use_index:
+            raise ValueError("use_index requires source_mode='file'")
+        
+        if tail_timeout <= 0:
+            raise ValueError(f"tail_timeout must be > 0, got {tail_timeout}")
+        
+        if prefetch < 0:
+            raise ValueError(f"prefetch must be >= 0, got {prefetch}")
+        
+        if stride < 1:
+            raise ValueError(f"stride must be >= 1, got {stride}")
+        
+        if start_frame is not None and start_sec is not None:
+            raise ValueError("Use either start_frame or start_sec, not both")
+        
+        if end_frame is not None and end_sec is not None:
+            raise ValueError("Use either end_frame or end_sec, not both")
+        
+        if scale is not None and max_side is not None:
+            raise ValueError("Use either scale or max_side, not both")
+        
+        if scale is not None and not 0.0 < scale <= 1.0:
+            raise ValueError(f"scale must be in (0, 1], got {scale}")
+        
+        if max_side is not None and max_side <= 0:
+            raise ValueError(f"max_side must be > 0, got {max_side}")
+        
         self.path = path
+        self.prefetch = prefetch
+        self.stride = stride
+        self.scale = scale
+        self.max_side = max_side
+        self._scale_factor: Optional[float] = None
+        self.pool = pool
+        self.backend = backend
+        self.pix_fmt = pix_fmt
+        self.decode_max_side = decode_max_side
+        self.decode_fps = decode_fps
+        self.source_mode = source_mode
+        self.tail_timeout = tail_timeout
+        self._buffer_source: Optional[BufferSource] = None
+        self._frame_shape: Optional[Tuple[int, ...]] = None
+        self._prefetch_thread: Optional[threading.Thread] = None
+        self._prefetch_stop: Optional[threading.Event] = None
         self._validate_file()
         self._cap = self._open_video()
-        self._fps = self._cap.get(cv2.CAP_PROP_FPS)
+        self._fps = max(self._cap.get(cv2.CAP_PROP_FPS), 0.0)
         self._frame_count = int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self._last_timestamp = 0.0
+        self._stream_start = 0.0
+        self._tail_size = 0
+        if self.is_streaming():
+            # Duração desconhecida: contagem cresce conforme a leitura
+            self._frame_count = 0
+            if source_mode == "tail":
+                self._tail_size = os.path.getsize(self.path)
+        self._frame_size = self._probe_frame_size()
+        self.index: Optional[FrameIndex] = None
+        if use_index:
+            self.index = self._load_index()
+            self._frame_count = self.index.frame_count
+        self._start_frame, self._end_frame = self._resolve_window(
+            start_frame, end_frame, start_sec, end_sec
+        )
+    
+    @classmethod
+    def from_buffer(
+        cls,
+        data,
+        name: str = "video",
+        method: str = "auto",
+        temp_dir: Optional[str] = None,
+        **kwargs
+    ) -> "VideoReader":
+        """
+        Cria um VideoReader para um vídeo em memória.
+        
+        Os dados são expostos via BufferSource (memfd no Linux ou arquivo
+        temporário gravado em blocos), liberado junto com o reader.
+        
+        Args:
+            data: bytes-like ou objeto tipo arquivo com o vídeo
+            name: Nome original do vídeo
+            method: 'auto', 'memfd' ou 'file' (ver BufferSource)
+            temp_dir: Diretório do arquivo temporário (método 'file')
+            **kwargs: Demais argumentos de VideoReader
+        
+        Returns:
+            VideoReader dono da fonte em memória
+        """
+        source = BufferSource(data, name=name, method=method, temp_dir=temp_dir)
+        try:
+            reader = cls(source.path, **kwargs)
+        except BaseException:
+            source.close()
+            raise
+        
+        reader._buffer_source = source
+        return reader
+    
+    def _load_index(self) -> FrameIndex:
+        """
+        Carrega (ou constrói e salva) o índice de frames do vídeo.
+        
+        Raises:
+            VideoOpenError: Se o índice não puder ser construído
+        """
+        try:
+            return FrameIndex.load_or_build(self.path)
+        except FrameIndexError as e:
+            self._cap.release()
+            raise VideoOpenError(
+                f"Failed to index video {self.path}: {e}"
+            ) from e
+    
+    def _probe_frame_size(self) -> Optional[Tuple[int, int]]:
+        """
+        Lê as dimensões dos metadados do container.
         
+        Returns:
+            Tupla (width, height) ou None se o container não informar
+        """
+        width = int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        
+        if width <= 0 or height <= 0:
+            return None
+        return width, height
+    
+    def _resolve_window(
+        self,
+        start_frame: Optional[int],
+        end_frame: Optional[int],
+        start_sec: Optional[float],
+        end_sec: Optional[float]
+    ) -> Tuple[int, Optional[int]]:
+        """
+        Converte os limites da janela de leitura para índices de frame.
+        
+        Returns:
+            Tupla (start, end) com end exclusivo ou None (até o fim do vídeo)
+        
+        Raises:
+            ValueError: Se a janela for inválida
+        """
+        if start_sec is not None:
+            start_frame = self._frame_at_time(start_sec)
+        if end_sec is not None:
+            end_frame = self._frame_at_time(end_sec)
+        
+        start = start_frame if start_frame is not None else 0
+        if start < 0:
+            raise ValueError(f"Window start must be >= 0, got {start}")
+        
+        if end_frame is not None and end_frame <= start:
+            raise ValueError(
+                f"Window end ({end_frame}) must be greater than start ({start})"
+            )
+        
+        return start, end_frame
+    
+    def _frame_at_time(self, seconds: float) -> int:
+        """Converte um tempo em segundos para índice de frame."""
+        if self.index is not None:
+            return self.index.frame_at(seconds)
+        return int(round(seconds * self._fps))
+    
+    def _timestamp(self, idx: int) -> float:
+        """Retorna o timestamp do frame `idx` (PTS se houver índice)."""
+        if self.source_mode == "live":
+            return time.monotonic() - self._stream_start
+        if self.index is not None and idx < self.index.frame_count:
+            return self.index.timestamp(idx)
+        return idx / self._fps if self._fps > 0 else 0.0
+    
     def _validate_file(self) -> None:
         """
         Valida se o arquivo existe e é acessível.
         
+        No modo 'live', índices de câmera e URLs não são validados, e
+        dispositivos e pipes nomeados são aceitos além de arquivos.
+        
         Raises:
             VideoNotFoundError: Se o arquivo não existir ou não for acessível
         """
+        if self.source_mode == "live" and (self.path.isdigit() or "://" in self.path):
+            return
+        
         if not os.path.exists(self.path):
             raise VideoNotFoundError(
                 f"Video file not found: {self.path}"
             )
         
-        if not os.path.isfile(self.path):
+        if self.source_mode != "live" and not os.path.isfile(self.path):
             raise VideoNotFoundError(
                 f"Path is not a file: {self.path}"
             )
@@ -88,15 +406,31 @@ class VideoReader:
     
     def _open_video(self) -> cv2.VideoCapture:
         """
-        Abre o vídeo usando OpenCV.
+        Abre o vídeo usando o backend configurado.
         
         Returns:
-            Objeto VideoCapture configurado
-            
+            Objeto VideoCapture (ou FFmpegCapture) configurado
+        
         Raises:
             VideoOpenError: Se o vídeo não puder ser aberto
         """
-        cap = cv2.VideoCapture(self.path)
+        if self.backend == "ffmpeg":
+            cap = FFmpegCapture(
+                self.path,
+                pix_fmt=self.pix_fmt,
+                max_side=self.decode_max_side,
+                fps=self.decode_fps,
+                stride=self.stride
+            )
+            if not cap.isOpened():
+                raise VideoOpenError(
+                    f"Failed to open video with ffmpeg backend: {self.path}. "
+                    "Check that 'ffmpeg' is installed and on PATH."
+                )
+        elif self.source_mode == "live" and self.path.isdigit():
+            cap = cv2.VideoCapture(int(self.path))
+        else:
+            cap = cv2.VideoCapture(self.path)
         
         if not cap.isOpened():
             raise VideoOpenError(
@@ -108,13 +442,15 @@ class VideoReader:
         fps = cap.get(cv2.CAP_PROP_FPS)
         frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
         
-        if fps <= 0:
+        # Fontes ao vivo podem não informar FPS (timestamps são de relógio)
+        if fps <= 0 and self.source_mode != "live":
             cap.release()
             raise VideoOpenError(
                 f"Invalid FPS value ({fps}) for video: {self.path}"
             )
         
-        if frame_count <= 0:
+        # Streams e arquivos em gravação não têm contagem confiável
+        if frame_count <= 0 and self.source_mode == "file":
             cap.release()
             raise VideoOpenError(
                 f"Invalid frame count ({frame_count}) for video: {self.path}"
@@ -131,26 +467,444 @@ class VideoReader:
                 - idx (int): Índice do frame (começando em 0)
                 - frame (np.ndarray): Frame como array NumPy (BGR)
                 - ts_sec (float): Timestamp em segundos
-                
+        
         Example:
             >>> for idx, frame, ts in reader:
             ...     print(f"Frame {idx} at {ts:.2f}s, shape: {frame.shape}")
         """
-        # Reset para o início do vídeo
-        self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        return self._iterate(with_full=False)
+    
+    def iter_full_and_scaled(self) -> Iterator[Tuple[int, np.ndarray, np.ndarray, float]]:
+        """
+        Itera entregando o frame original junto com a versão reduzida.
         
-        idx = 0
-        while True:
-            ret, frame = self._cap.read()
+        Útil quando a análise roda no frame reduzido mas a anotação e o
+        recorte de faces precisam da resolução original. Sem scale/max_side
+        configurados, ambos os frames são o mesmo objeto.
+        
+        Yields:
+            Tuple contendo:
+                - idx (int): Índice do frame
+                - full (np.ndarray): Frame na resolução original (BGR)
+                - scaled (np.ndarray): Frame reduzido (BGR)
+                - ts_sec (float): Timestamp em segundos
+        """
+        return self._iterate(with_full=True)
+    
+    def _iterate(self, with_full: bool) -> Iterator[tuple]:
+        """Cria o iterador de frames, com prefetch se configurado."""
+        # Uma nova iteração interrompe qualquer prefetch anterior
+        self._stop_prefetch()
+        
+        frames = self._read_frames(with_full)
+        if self.prefetch > 0:
+            return self._prefetch_frames(frames)
+        return frames
+    
+    def _read_frames(self, with_full: bool = False) -> Iterator[tuple]:
+        """
+        Decodifica os frames da janela configurada respeitando o stride.
+        
+        Apenas os frames entregues são decodificados por completo; os
+        intermediários são avançados com grab() ou, se a lacuna for maior
+        que SEEK_MIN_GAP, com um seek direto. No backend ffmpeg o stride já
+        é aplicado pelo próprio ffmpeg e cada read() entrega o próximo frame.
+        
+        Args:
+            with_full: Se True, entrega (idx, full, scaled, ts_sec)
+        
+        Yields:
+            Tuplas (idx, frame, ts_sec) com índices do vídeo original
+        """
+        # Posicionar no início da janela
+        self._seek(self._start_frame)
+        self._stream_start = time.monotonic()
+        
+        idx = self._start_frame
+        gap = 0 if self.backend == "ffmpeg" else self.stride - 1
+        while self._end_frame is None or idx < self._end_frame:
+            ret, frame = self._read_into_pool()
+            
+            if not ret and self.source_mode == "tail" and self._wait_for_growth(idx):
+                continue
             
             if not ret:
                 break
             
-            # Calcular timestamp baseado no índice e FPS
-            ts_sec = idx / self._fps if self._fps > 0 else 0.0
+            # Timestamp pelo PTS indexado, pelo relógio (live) ou pelo índice e FPS
+            ts_sec = self._timestamp(idx)
+            
+            if self.is_streaming():
+                self._frame_count = max(self._frame_count, idx + 1)
+                self._last_timestamp = ts_sec
+            
+            if with_full:
+                yield idx, frame, self._downscale(frame), ts_sec
+            else:
+                scaled = self._downscale(frame)
+                if self.pool is not None and scaled is not frame:
+                    # Só a versão reduzida é entregue: o buffer em resolução
+                    # original volta ao pool logo após o resize
+                    self.pool.release(frame)
+                yield idx, scaled, ts_sec
+            idx += self.stride
+            
+            if gap == 0 or (self._end_frame is not None and idx >= self._end_frame):
+                continue
             
-            yield idx, frame, ts_sec
-            idx += 1
+            if self._should_seek(idx - gap, idx):
+                self._seek(idx)
+            else:
+                for _ in range(gap):
+                    if self._cap.grab():
+                        continue
+                    # Modo tail: reabrir já posicionado no próximo frame
+                    if self.source_mode == "tail" and self._wait_for_growth(idx):
+                        break
+                    return
+    
+    def _wait_for_growth(self, position: int) -> bool:
+        """
+        Modo tail: aguarda o arquivo crescer e reabre a captura em `position`.
+        
+        Verifica o tamanho do arquivo a cada TAIL_POLL_INTERVAL segundos e
+        respeita o sinal de parada do prefetch, para que release() não
+        fique bloqueado durante a espera.
+        
+        Args:
+            position: Índice do próximo frame a ler após reabrir
+        
+        Returns:
+            True se a captura foi reaberta; False após tail_timeout segundos
+            sem crescimento ou se a iteração foi interrompida
+        """
+        deadline = time.monotonic() + self.tail_timeout
+        
+        while time.monotonic() < deadline:
+            size = os.path.getsize(self.path)
+            
+            if size > self._tail_size:
+                self._tail_size = size
+                try:
+                    cap = self._open_video()
+                except VideoOpenError:
+                    # Trecho novo ainda incompleto: aguardar mais dados
+                    deadline = time.monotonic() + self.tail_timeout
+                    continue
+                
+                self._cap.release()
+                self._cap = cap
+                self._seek(position)
+                return True
+            
+            stop = self._prefetch_stop
+            if stop is not None:
+                if stop.wait(self.TAIL_POLL_INTERVAL):
+                    return False
+            else:
+                time.sleep(self.TAIL_POLL_INTERVAL)
+        
+        return False
+    
+    def _should_seek(self, position: int, target: int) -> bool:
+        """
+        Decide entre seek e grab() para ir de `position` até `target`.
+        
+        Com keyframes indexados, o seek só compensa se houver um keyframe
+        depois da posição atual (senão o decoder parte do mesmo keyframe).
+        Fontes ao vivo não suportam seek.
+        """
+        if self.source_mode == "live":
+            return False
+        if self.index is not None and self.index.has_keyframes:
+            return self.index.keyframe_before(target) > position
+        return target - position >= self.SEEK_MIN_GAP
+    
+    def _seek(self, idx: int) -> None:
+        """
+        Posiciona a captura para que a próxima leitura retorne o frame `idx`.
+        
+        Sem índice, usa CAP_PROP_POS_FRAMES. Com índice, faz seek por tempo
+        (PTS) e, no backend OpenCV, confere CAP_PROP_POS_MSEC avançando com
+        grab() até o frame anterior ao alvo. Se o seek passar do ponto (ou
+        a posição vier 0), tenta de novo a partir do keyframe indexado
+        anterior, recuando keyframe a keyframe; sem keyframes no índice,
+        recua com distância dobrada a cada tentativa. Só volta ao início
+        quando o recuo chega ao frame 0.
+        """
+        if self.source_mode == "live":
+            # Sem seek em streams: descartar frames até o início da janela
+            for _ in range(idx):
+                if not self._cap.grab():
+                    return
+            return
+        
+        if self.index is None or idx >= self.index.frame_count:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+            return
+        
+        pts = self.index.pts
+        tolerance = max(self.index.frame_interval / 4, 1e-4)
+        
+        if self.backend == "ffmpeg":
+            # -ss do ffmpeg é exato: mirar um pouco antes do PTS do alvo
+            self._cap.set(cv2.CAP_PROP_POS_MSEC, max(0.0, pts[idx] - tolerance) * 1000.0)
+            return
+        
+        if idx >= 2:
+            # POS_MSEC retorna o PTS do último frame lido (grab)
+            target = pts[idx - 1]
+            anchor, gap = idx, self.SEEK_MIN_GAP
+            while anchor > 0:
+                self._cap.set(cv2.CAP_PROP_POS_MSEC, pts[anchor] * 1000.0)
+                last = self._cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                
+                if 0.0 < last <= target + tolerance:
+                    while last < target - tolerance:
+                        if not self._cap.grab():
+                            return
+                        last = self._cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                    return
+                
+                # Seek além do alvo: recuar para um ponto anterior
+                if self.index.has_keyframes:
+                    anchor = self.index.keyframe_before(anchor - 1)
+                else:
+                    anchor, gap = max(0, idx - gap), gap * 2
+        
+        # Recuo chegou ao início (ou idx < 2): avançar a partir do frame 0
+        self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        for _ in range(idx):
+            if not self._cap.grab():
+                return
+    
+    def read_frame(self, idx: int) -> np.ndarray:
+        """
+        Lê um único frame por índice (acesso aleatório).
+        
+        Com use_index=True o seek é feito pelo PTS indexado, correto também
+        em vídeos com frame rate variável.
+        
+        Args:
+            idx: Índice do frame
+        
+        Returns:
+            Frame (reduzido se scale/max_side estiverem configurados)
+        
+        Raises:
+            IndexError: Se idx estiver fora do vídeo
+            VideoReaderError: Se o frame não puder ser decodificado ou a
+                              fonte for ao vivo
+        """
+        if self.source_mode == "live":
+            raise VideoReaderError("Random access is not supported for live sources")
+        
+        if not 0 <= idx < self._frame_count:
+            raise IndexError(f"Frame index {idx} out of range [0, {self._frame_count})")
+        
+        self._stop_prefetch()
+        self._seek(idx)
+        
+        ret, frame = self._cap.read()
+        if not ret:
+            raise VideoReaderError(f"Failed to read frame {idx} from {self.path}")
+        
+        return self._downscale(frame)
+    
+    def _downscale(self, frame: np.ndarray) -> np.ndarray:
+        """Reduz o frame conforme scale/max_side (sem cópia se fator == 1)."""
+        if self._scale_factor is None:
+            height, width = frame.shape[:2]
+            self._scale_factor = self._compute_scale_factor(width, height)
+        
+        if self._scale_factor >= 1.0:
+            return frame
+        
+        height, width = frame.shape[:2]
+        target_size = (
+            max(1, int(round(width * self._scale_factor))),
+            max(1, int(round(height * self._scale_factor)))
+        )
+        dst = None
+        if self.pool is not None:
+            dst_shape = (target_size[1], target_size[0]) + frame.shape[2:]
+            dst = self.pool.acquire(dst_shape, frame.dtype)
+        return cv2.resize(frame, target_size, dst=dst, interpolation=cv2.INTER_AREA)
+    
+    def _read_into_pool(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Lê o próximo frame, decodificando em um buffer do pool se houver.
+        
+        O primeiro frame é lido sem buffer para descobrir o formato; os
+        seguintes reutilizam buffers desse formato.
+        
+        Returns:
+            Tupla (ret, frame) como em cv2.VideoCapture.read()
+        """
+        if self.pool is None or self._frame_shape is None:
+            ret, frame = self._cap.read()
+            if ret:
+                self._frame_shape = frame.shape
+                if self._frame_size is None:
+                    self._frame_size = (frame.shape[1], frame.shape[0])
+            return ret, frame
+        
+        buffer = self.pool.acquire(self._frame_shape)
+        ret, frame = self._cap.read(image=buffer)
+        
+        if not ret:
+            self.pool.release(buffer)
+        elif frame is not buffer:
+            # OpenCV realocou (formato mudou): devolver o buffer não usado
+            self.pool.release(buffer)
+            self._frame_shape = frame.shape
+        
+        return ret, frame
+    
+    def _compute_scale_factor(self, width: int, height: int) -> float:
+        """Calcula o fator de redução para as dimensões dadas."""
+        if self.scale is not None:
+            return self.scale
+        
+        if self.max_side is not None and max(width, height) > 0:
+            return min(1.0, self.max_side / max(width, height))
+        
+        return 1.0
+    
+    def scale_factor(self) -> float:
+        """
+        Retorna o fator aplicado aos frames entregues (1.0 = original).
+        
+        Divida coordenadas obtidas no frame reduzido por este fator para
+        voltar aos pixels do vídeo original.
+        
+        Returns:
+            Fator de escala em (0, 1]
+        """
+        if self._scale_factor is None:
+            width, height = self.frame_size()
+            self._scale_factor = self._compute_scale_factor(width, height)
+        
+        return self._scale_factor
+    
+    def frame_size(self) -> Tuple[int, int]:
+        """
+        Retorna as dimensões dos frames na resolução original.
+        
+        Usa CAP_PROP_FRAME_WIDTH/HEIGHT do container. Se não estiverem
+        disponíveis, decodifica o primeiro frame uma única vez e guarda o
+        resultado (a próxima iteração volta ao início da janela).
+        
+        Returns:
+            Tupla (width, height) em pixels
+        
+        Raises:
+            VideoReaderError: Se não for possível determinar as dimensões
+        """
+        if self._frame_size is None:
+            if self._prefetch_thread is not None:
+                raise VideoReaderError(
+                    "Frame size unknown while a prefetch iteration is running"
+                )
+            
+            ret, frame = self._cap.read()
+            if not ret:
+                raise VideoReaderError(
+                    f"Could not determine frame size for video: {self.path}"
+                )
+            self._frame_size = (frame.shape[1], frame.shape[0])
+        
+        return self._frame_size
+    
+    def _prefetch_frames(
+        self,
+        frames: Iterator[tuple]
+    ) -> Iterator[tuple]:
+        """
+        Consome `frames` em uma thread de leitura e entrega via fila limitada.
+        
+        A thread decodifica até `prefetch` frames à frente do consumidor.
+        Erros de decodificação são relançados no thread consumidor. Ao sair
+        do loop (fim, break ou exceção) a thread é encerrada.
+        
+        Args:
+            frames: Iterador síncrono de frames
+        
+        Yields:
+            Itens de `frames` na ordem original
+        
+        Raises:
+            VideoReaderError: Se a decodificação falhar na thread de leitura
+        """
+        buffer: queue.Queue = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        
+        def put(item) -> bool:
+            # Bloqueia enquanto a fila estiver cheia, mas respeita o stop
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def worker() -> None:
+            try:
+                for item in frames:
+                    if not put(item):
+                        return
+            except Exception as e:
+                put(e)
+                return
+            put(_END_OF_STREAM)
+        
+        thread = threading.Thread(
+            target=worker,
+            name=f"VideoReader-prefetch({os.path.basename(self.path)})",
+            daemon=True
+        )
+        self._prefetch_stop = stop
+        self._prefetch_thread = thread
+        thread.start()
+        
+        try:
+            while True:
+                try:
+                    item = buffer.get(timeout=0.1)
+                except queue.Empty:
+                    if not thread.is_alive() and buffer.empty():
+                        # Thread encerrada externamente (ex: release())
+                        break
+                    continue
+                
+                if item is _END_OF_STREAM:
+                    break
+                if isinstance(item, Exception):
+                    raise VideoReaderError(
+                        f"Failed to decode frame from {self.path}: {item}"
+                    ) from item
+                
+                yield item
+        finally:
+            stop.set()
+            thread.join()
+            if self._prefetch_thread is thread:
+                self._prefetch_thread = None
+                self._prefetch_stop = None
+    
+    def _stop_prefetch(self) -> None:
+        """Sinaliza e aguarda o término da thread de prefetch, se houver."""
+        thread = getattr(self, '_prefetch_thread', None)
+        stop = getattr(self, '_prefetch_stop', None)
+        
+        if stop is not None:
+            stop.set()
+        if thread is not None:
+            thread.join()
+        
+        self._prefetch_thread = None
+        self._prefetch_stop = None
     
     def fps(self) -> float:
         """
@@ -165,20 +919,49 @@ class VideoReader:
         """
         Retorna o número total de frames no vídeo.
         
+        Nos modos 'live' e 'tail', retorna os frames lidos até o momento.
+        
         Returns:
             Número total de frames
         """
         return self._frame_count
     
+    def sampled_frame_count(self) -> int:
+        """
+        Retorna quantos frames a iteração entregará com a janela e o stride.
+        
+        Returns:
+            Número de frames amostrados
+        """
+        end = self._frame_count
+        if self._end_frame is not None:
+            end = min(end, self._end_frame)
+        return len(range(self._start_frame, end, self.stride))
+    
     def duration(self) -> float:
         """
         Retorna a duração total do vídeo em segundos.
         
+        Nos modos 'live' e 'tail', retorna o timestamp do último frame lido.
+        
         Returns:
             Duração em segundos
         """
+        if self.is_streaming():
+            return self._last_timestamp
+        if self.index is not None:
+            return self.index.duration
         return self._frame_count / self._fps if self._fps > 0 else 0.0
     
+    def is_streaming(self) -> bool:
+        """
+        Indica se a fonte tem duração desconhecida (modos 'live' e 'tail').
+        
+        Returns:
+            True para fontes ao vivo ou arquivos em gravação
+        """
+        return self.source_mode != "file"
+    
     def __enter__(self):
         """Context manager entry."""
         return self
@@ -191,10 +974,17 @@ class VideoReader:
         """
         Libera os recursos do VideoCapture.
         
-        Deve ser chamado quando terminar de usar o VideoReader.
+        Deve ser chamado quando terminar de usar o VideoReader. Encerra a
+        thread de prefetch (se ativa) antes de liberar o VideoCapture.
         """
+        self._stop_prefetch()
+        
         if hasattr(self, '_cap') and self._cap is not None:
             self._cap.release()
+        
+        source = getattr(self, '_buffer_source', None)
+        if source is not None:
+            source.close()
     
     def __del__(self):
         """Destrutor - garante que os recursos sejam liberados."""
@@ -204,7 +994,10 @@ class VideoReader:
         """Representação em string do VideoReader."""
         return (
             f"VideoReader(path='{self.path}', "
+            f"backend='{self.backend}', "
+            f"mode='{self.source_mode}', "
             f"fps={self._fps:.2f}, "
             f"frames={self._frame_count}, "
+            f"size={self._frame_size}, "
             f"duration={self.duration():.2f}s)"
         )
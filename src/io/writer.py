@@ -1,22 +1,31 @@
 """
 Video Writer Module
 
-Implementa a classe VideoWriter para salvar vídeos anotados usando OpenCV.
+Implementa a classe VideoWriter para salvar vídeos anotados usando OpenCV
+ou, opcionalmente, um subprocesso ffmpeg.
 """
 
 import os
+import queue
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import cv2
 import numpy as np
 
+from src.io.ffmpeg_encoder import FFmpegEncoder
+
 
 class VideoWriterError(Exception):
     """Exceção base para erros do VideoWriter."""
     pass
 
 
+# Marcador de parada da thread de encode
+_STOP = object()
+
+
 class VideoWriter:
     """
     Classe para salvar vídeos frame a frame.
@@ -28,9 +37,14 @@ class VideoWriter:
         path (str): Caminho para o arquivo de vídeo de saída
         fps (float): Frames por segundo
         frame_size (tuple): Dimensões (width, height)
-        codec (str): Codec de vídeo (4 caracteres)
+        codec (str): Codec de vídeo (fourcc no backend OpenCV, encoder no ffmpeg)
+        backend (str): Backend de encode ('opencv' ou 'ffmpeg')
+        queue_size (int): Tamanho da fila de encode assíncrono (0 = síncrono)
+        on_full (str): Política com a fila cheia ('block' ou 'drop')
+        frames_written (int): Frames codificados
+        frames_dropped (int): Frames descartados com a fila cheia
         _writer (cv2.VideoWriter): Objeto VideoWriter do OpenCV
-        
+    
     Example:
         >>> writer = VideoWriter("output.mp4", fps=30.0, frame_size=(640, 480))
         >>> writer.write(frame)
@@ -39,6 +53,14 @@ class VideoWriter:
         # Ou com context manager:
         >>> with VideoWriter("output.mp4", fps=30.0, frame_size=(640, 480)) as writer:
         ...     writer.write(frame)
+        
+        # Encode em thread separada; a saída do with espera a fila esvaziar:
+        >>> with VideoWriter("output.mp4", 30.0, (640, 480), queue_size=16) as writer:
+        ...     writer.write(frame)   # não altere `frame` depois de escrevê-lo
+        
+        # H.264 via ffmpeg (arquivos menores, tocam no navegador):
+        >>> writer = VideoWriter("output.mp4", 30.0, (1280, 720), backend="ffmpeg",
+        ...                      crf=28, preset="veryfast")
     """
     
     def __init__(
@@ -46,7 +68,15 @@ class VideoWriter:
         path: str,
         fps: float,
         frame_size: tuple[int, int],
-        codec: str = "mp4v"
+        codec: Optional[str] = None,
+        queue_size: int = 0,
+        on_full: str = "block",
+        on_written: Optional[Callable[[np.ndarray], None]] = None,
+        backend: str = "opencv",
+        crf: Optional[int] = None,
+        preset: Optional[str] = None,
+        threads: Optional[int] = None,
+        pix_fmt: Optional[str] = None
     ) -> None:
         """
         Inicializa o VideoWriter.
@@ -55,25 +85,75 @@ class VideoWriter:
             path: Caminho para o arquivo de vídeo de saída
             fps: Taxa de frames por segundo
             frame_size: Dimensões do vídeo (width, height)
-            codec: Codec de vídeo (4 caracteres). Opções comuns:
+            codec: Codec de vídeo. No backend OpenCV, fourcc de 4
+                   caracteres (padrão "mp4v"). Opções comuns:
                    - "mp4v" (MPEG-4, padrão)
                    - "XVID" (XVID MPEG-4)
                    - "avc1" (H.264)
                    - "MJPG" (Motion JPEG)
-                   
+                   No backend ffmpeg, nome do encoder (padrão "libx264";
+                   ex: "libx265", "libvpx-vp9", "mpeg4").
+            queue_size: Se > 0, write() apenas enfileira o frame e uma
+                        thread dedicada faz o encode. O frame passa a
+                        pertencer ao writer e não deve ser alterado.
+            on_full: Com a fila cheia, 'block' espera espaço
+                     (backpressure) e 'drop' descarta o frame
+            on_written: Chamado com cada frame recebido por write() depois
+                        que ele foi codificado ou descartado (ex:
+                        FramePool.release), na thread que fez o encode
+            backend: 'opencv' (cv2.VideoWriter) ou 'ffmpeg' (frames brutos
+                     enviados pelo stdin de um processo ffmpeg)
+            crf: Fator de qualidade constante do ffmpeg (padrão 23;
+                 menor = melhor qualidade e arquivo maior)
+            preset: Preset de velocidade do x264/x265 (padrão "veryfast")
+            threads: Threads do encoder ffmpeg (padrão 0 = automático)
+            pix_fmt: Formato de pixel do arquivo (padrão "yuv420p")
+        
         Raises:
             VideoWriterError: Se não conseguir criar o writer
+            ValueError: Se queue_size, on_full ou as opções de backend forem
+                        inválidos
         """
+        if backend not in ("opencv", "ffmpeg"):
+            raise ValueError(f"Unknown backend: {backend}")
+        
+        if backend != "ffmpeg" and any(
+            option is not None for option in (crf, preset, threads, pix_fmt)
+        ):
+            raise ValueError("crf, preset, threads and pix_fmt require backend='ffmpeg'")
+        
+        if codec is None:
+            codec = "libx264" if backend == "ffmpeg" else "mp4v"
+        
+        if queue_size < 0:
+            raise ValueError(f"queue_size must be >= 0, got {queue_size}")
+        
+        if on_full not in ("block", "drop"):
+            raise ValueError(f"on_full must be 'block' or 'drop', got {on_full}")
+        
         self.path = path
         self.fps = fps
         self.frame_size = frame_size
         self.codec = codec
+        self.backend = backend
+        self.crf = crf if crf is not None else 23
+        self.preset = preset if preset is not None else "veryfast"
+        self.threads = threads if threads is not None else 0
+        self.pix_fmt = pix_fmt if pix_fmt is not None else "yuv420p"
+        self.queue_size = queue_size
+        self.on_full = on_full
+        self.on_written = on_written
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
         
         # Criar diretório se não existir
         dir_path = os.path.dirname(os.path.abspath(path))
         if dir_path:  # Só cria se não for diretório vazio
             os.makedirs(dir_path, exist_ok=True)
-            
+        
         # Verificar se diretório existe e tem permissões
         if dir_path and not os.path.exists(dir_path):
             raise VideoWriterError(
@@ -83,6 +163,13 @@ class VideoWriter:
         # Inicializar VideoWriter
         self._writer = self._create_writer()
         
+        if not self._writer.isOpened() and backend == "ffmpeg":
+            raise VideoWriterError(
+                f"Failed to start ffmpeg encoder for {path} (codec: {codec}). "
+                "Check that 'ffmpeg' is installed and on PATH."
+                + (f"\n{self._writer.last_error()}" if self._writer.last_error() else "")
+            )
+        
         if not self._writer.isOpened():
             import sys
             raise VideoWriterError(
@@ -97,14 +184,61 @@ class VideoWriter:
                 f"    3. Try a different codec (XVID, MJPG)\n"
                 f"  See: notebooks/FIX_VIDEOWRITER_ERROR.md"
             )
+        
+        if queue_size > 0:
+            self._start_encoder()
+    
+    def _start_encoder(self) -> None:
+        """Inicia a thread de encode assíncrono."""
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._thread = threading.Thread(
+            target=self._encoder_loop,
+            name=f"VideoWriter-encode({os.path.basename(self.path)})",
+            daemon=True
+        )
+        self._thread.start()
+    
+    def _encoder_loop(self) -> None:
+        """
+        Consome a fila codificando frames até receber _STOP.
+        
+        Após um erro, continua drenando a fila (sem codificar) para que
+        write() nunca fique bloqueado; o erro é relançado pelo próximo
+        write(), flush() ou release().
+        """
+        while True:
+            frame = self._queue.get()
+            try:
+                if frame is _STOP:
+                    return
+                if self._error is None:
+                    self._encode(frame)
+                else:
+                    self._frame_done(frame)
+            except Exception as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
     
     def _create_writer(self) -> cv2.VideoWriter:
         """
-        Cria o objeto VideoWriter do OpenCV.
+        Cria o writer do backend configurado.
         
         Returns:
-            Objeto VideoWriter configurado
+            Objeto VideoWriter do OpenCV (ou FFmpegEncoder) configurado
         """
+        if self.backend == "ffmpeg":
+            return FFmpegEncoder(
+                self.path,
+                self.fps,
+                self.frame_size,
+                codec=self.codec,
+                crf=self.crf,
+                preset=self.preset,
+                threads=self.threads,
+                pix_fmt=self.pix_fmt
+            )
+        
         fourcc = cv2.VideoWriter_fourcc(*self.codec)
         writer = cv2.VideoWriter(
             self.path,
@@ -120,7 +254,7 @@ class VideoWriter:
         
         Args:
             frame: Frame a ser escrito (numpy array BGR)
-            
+        
         Raises:
             ValueError: Se o frame for inválido
             VideoWriterError: Se falhar ao escrever
@@ -131,29 +265,103 @@ class VideoWriter:
         if frame.ndim != 3 or frame.shape[2] != 3:
             raise ValueError(f"Frame must be BGR (H, W, 3), got shape {frame.shape}")
         
-        # Verificar/redimensionar se necessário
-        frame_height, frame_width = frame.shape[:2]
-        expected_width, expected_height = self.frame_size
+        # Erro de encode assíncrono anterior
+        self._raise_pending_error()
         
-        if (frame_width, frame_height) != self.frame_size:
-            # Redimensionar para o tamanho correto
-            frame = cv2.resize(frame, self.frame_size)
-        
-        # Escrever frame
         # Nota: cv2.VideoWriter.write() não retorna valor útil, então verificamos se está aberto
-        if not self._writer.isOpened():
-            raise VideoWriterError(f"VideoWriter is not opened for {self.path}")
+        if self._writer is None or not self._writer.isOpened():
+            raise VideoWriterError(
+                f"VideoWriter is not opened for {self.path}" + self._backend_error()
+            )
         
-        self._writer.write(frame)
+        if self._queue is None:
+            self._encode(frame)
+        elif self.on_full == "drop":
+            try:
+                self._queue.put_nowait(frame)
+            except queue.Full:
+                self.frames_dropped += 1
+                self._frame_done(frame)
+        else:
+            self._queue.put(frame)
+    
+    def _encode(self, frame: np.ndarray) -> None:
+        """Redimensiona se necessário e codifica o frame."""
+        try:
+            output = frame
+            frame_height, frame_width = frame.shape[:2]
+            
+            if (frame_width, frame_height) != self.frame_size:
+                # Redimensionar para o tamanho correto
+                output = cv2.resize(frame, self.frame_size)
+            
+            # FFmpegEncoder.write() retorna False se o ffmpeg encerrou
+            if self._writer.write(output) is False:
+                raise VideoWriterError(
+                    f"ffmpeg encoder stopped for {self.path}" + self._backend_error()
+                )
+            self.frames_written += 1
+        finally:
+            self._frame_done(frame)
+    
+    def _frame_done(self, frame: np.ndarray) -> None:
+        """Notifica on_written de que o frame não é mais usado."""
+        if self.on_written is not None:
+            self.on_written(frame)
+    
+    def _backend_error(self) -> str:
+        """Mensagem de erro do ffmpeg, se houver, para anexar a exceções."""
+        if self.backend == "ffmpeg" and self._writer is not None and self._writer.last_error():
+            return f":\n{self._writer.last_error()}"
+        return ""
+    
+    def _raise_pending_error(self) -> None:
+        """Relança (uma única vez) um erro ocorrido na thread de encode."""
+        error = self._error
+        if error is not None:
+            self._error = None
+            raise VideoWriterError(
+                f"Failed to encode frame for {self.path}: {error}"
+            ) from error
+    
+    def flush(self) -> None:
+        """
+        Aguarda a codificação de todos os frames enfileirados.
+        
+        Raises:
+            VideoWriterError: Se algum encode assíncrono falhou
+        """
+        if self._queue is not None:
+            self._queue.join()
+        self._raise_pending_error()
     
     def release(self) -> None:
         """
         Libera os recursos do VideoWriter.
         
-        Deve ser chamado quando terminar de escrever o vídeo.
+        Deve ser chamado quando terminar de escrever o vídeo. No modo
+        assíncrono, codifica os frames ainda na fila antes de fechar.
+        
+        Raises:
+            VideoWriterError: Se algum encode assíncrono falhou
         """
+        thread = getattr(self, '_thread', None)
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+            self._thread = None
+            self._queue = None
+        
         if hasattr(self, '_writer') and self._writer is not None:
-            self._writer.release()
+            # FFmpegEncoder.release() retorna False se o ffmpeg falhou
+            if self._writer.release() is False and self._error is None:
+                self._error = RuntimeError(
+                    f"ffmpeg exited with an error{self._backend_error()}"
+                )
+            self._writer = None
+        
+        if hasattr(self, '_error'):
+            self._raise_pending_error()
     
     def __enter__(self):
         """Context manager entry."""
@@ -165,7 +373,10 @@ class VideoWriter:
     
     def __del__(self):
         """Destrutor - garante que os recursos sejam liberados."""
-        self.release()
+        try:
+            self.release()
+        except VideoWriterError:
+            pass
     
     def is_opened(self) -> bool:
         """
@@ -180,5 +391,7 @@ class VideoWriter:
         """Representação em string do VideoWriter."""
         return (
             f"VideoWriter(path='{self.path}', fps={self.fps}, "
-            f"frame_size={self.frame_size}, codec='{self.codec}')"
+            f"frame_size={self.frame_size}, codec='{self.codec}', "
+            f"backend='{self.backend}', "
+            f"queue_size={self.queue_size})"
         )
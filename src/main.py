@@ -32,6 +32,27 @@ Exemplos de uso:
   
   # Usar backends específicos
   python -m src.main --video input.mp4 --face-backend opencv --emotion-backend deepface
+  
+  # Detectar faces a cada 5 frames e rastreá-las entre as detecções
+  python -m src.main --video input.mp4 --detect-every 5
+  
+  # Análise amostrada (1 a cada 5 frames) entre 1min e 2min
+  python -m src.main --video input.mp4 --stride 5 --start 60 --end 120
+  
+  # Preview leve para revisão: 10 fps, 720p, H.264
+  python -m src.main --video input.mp4 --save-preview --preview-fps 10 \
+      --preview-max-side 1280 --writer-backend ffmpeg --crf 30
+  
+  # Gravar apenas clipes de 2s antes / 5s depois de cada evento
+  python -m src.main --video input.mp4 --clips --clip-post 5
+  
+  # Salvar anotações e renderizar o vídeo depois, em paralelo
+  python -m src.main --video input.mp4 --annotations
+  python -m src.render --annotations outputs/annotations.npz --workers 4
+  
+  # Webcam (índice 0) ou gravação ainda em andamento
+  python -m src.main --video 0 --source live --stride 3
+  python -m src.main --video recording.mkv --source tail --tail-timeout 30
         """
     )
     
@@ -64,6 +85,72 @@ Exemplos de uso:
         help='Salvar vídeo anotado com detecções'
     )
     
+    parser.add_argument(
+        '--annotations',
+        action='store_true',
+        help='Salvar as anotações de cada frame em <output-dir>/annotations.npz '
+             'para renderizar depois com python -m src.render'
+    )
+    
+    parser.add_argument(
+        '--thumbnails',
+        action='store_true',
+        help='Salvar miniaturas de anomalias, inícios de atividade e a cada '
+             '--thumbnail-interval segundos, com folhas de contato, em <output-dir>/frames'
+    )
+    
+    parser.add_argument(
+        '--thumbnail-interval',
+        type=float,
+        default=10.0,
+        help='Segundos entre miniaturas periódicas; 0 = apenas eventos (default: 10)'
+    )
+    
+    parser.add_argument(
+        '--thumbnail-format',
+        type=str,
+        default='jpg',
+        choices=['jpg', 'webp'],
+        help='Formato das miniaturas (default: jpg)'
+    )
+    
+    parser.add_argument(
+        '--preview-fps',
+        type=float,
+        default=None,
+        help='FPS máximo do vídeo anotado; frames fora do preview não são '
+             'anotados (default: FPS da análise)'
+    )
+    
+    parser.add_argument(
+        '--preview-max-side',
+        type=int,
+        default=None,
+        help='Lado maior máximo do vídeo anotado em pixels, ex: 1280 para 720p '
+             '(default: resolução original)'
+    )
+    
+    parser.add_argument(
+        '--clips',
+        action='store_true',
+        help='Salvar apenas clipes curtos em torno de anomalias e inícios de '
+             'atividade (em <output-dir>/clips) em vez do vídeo anotado inteiro'
+    )
+    
+    parser.add_argument(
+        '--clip-pre',
+        type=float,
+        default=2.0,
+        help='Segundos gravados antes de cada evento (default: 2)'
+    )
+    
+    parser.add_argument(
+        '--clip-post',
+        type=float,
+        default=3.0,
+        help='Segundos gravados depois do último evento (default: 3)'
+    )
+    
     parser.add_argument(
         '--face-backend',
         type=str,
@@ -72,6 +159,62 @@ Exemplos de uso:
         help='Backend para detecção de faces (default: auto)'
     )
     
+    parser.add_argument(
+        '--detect-every',
+        type=int,
+        default=1,
+        help='Detectar faces a cada N frames analisados e rastreá-las com fluxo óptico '
+             'nos intermediários (default: 1, detectar em todo frame)'
+    )
+    
+    parser.add_argument(
+        '--full-scan-every',
+        type=int,
+        default=1,
+        help='Backend opencv: varrer o frame inteiro a cada N detecções e, nas demais, '
+             'buscar faces só ao redor das anteriores (default: 1, sempre o frame inteiro)'
+    )
+    
+    parser.add_argument(
+        '--face-tile-size',
+        type=int,
+        default=None,
+        help='Detectar faces em tiles sobrepostos deste tamanho em pixels, em paralelo, '
+             'para faces pequenas em vídeos 4K; aumentado automaticamente se pequeno demais '
+             'para o frame (ex: 960; default: frame inteiro)'
+    )
+    
+    parser.add_argument(
+        '--face-workers',
+        type=int,
+        default=0,
+        help='Threads que detectam faces em vários frames ao mesmo tempo, cada uma '
+             'com o próprio detector (default: 0, frame a frame)'
+    )
+    
+    parser.add_argument(
+        '--face-in-flight',
+        type=int,
+        default=None,
+        help='Frames em detecção simultânea com --face-workers '
+             '(default: o dobro de --face-workers ou --face-batch-size)'
+    )
+    
+    parser.add_argument(
+        '--face-batch-size',
+        type=int,
+        default=1,
+        help='Backend deepface: frames consecutivos detectados em uma única chamada '
+             '(default: 1, frame a frame)'
+    )
+    
+    parser.add_argument(
+        '--face-batch-wait',
+        type=float,
+        default=20.0,
+        help='Espera máxima em ms para completar um lote de --face-batch-size (default: 20)'
+    )
+    
     parser.add_argument(
         '--emotion-backend',
         type=str,
@@ -80,6 +223,156 @@ Exemplos de uso:
         help='Backend para classificação de emoções (default: auto)'
     )
     
+    parser.add_argument(
+        '--motion-threshold',
+        type=float,
+        default=None,
+        help='Reaproveitar os resultados do frame anterior quando menos que esta fração '
+             'dos pixels mudar (ex: 0.01; default: desativado)'
+    )
+    
+    parser.add_argument(
+        '--prefetch',
+        type=int,
+        default=0,
+        help='Frames decodificados antecipadamente em thread separada (default: 0, desativado)'
+    )
+    
+    parser.add_argument(
+        '--stride',
+        type=int,
+        default=1,
+        help='Analisar apenas 1 a cada N frames (default: 1, todos)'
+    )
+    
+    parser.add_argument(
+        '--start',
+        type=float,
+        default=None,
+        help='Início da janela de análise em segundos (default: início do vídeo)'
+    )
+    
+    parser.add_argument(
+        '--end',
+        type=float,
+        default=None,
+        help='Fim da janela de análise em segundos (default: fim do vídeo)'
+    )
+    
+    parser.add_argument(
+        '--analysis-max-side',
+        type=int,
+        default=None,
+        help='Reduz os frames de análise para este lado maior em pixels (ex: 960)'
+    )
+    
+    parser.add_argument(
+        '--analysis-scale',
+        type=float,
+        default=None,
+        help='Fator de redução (0, 1] dos frames de análise (alternativa a --analysis-max-side)'
+    )
+    
+    parser.add_argument(
+        '--frame-pool',
+        action='store_true',
+        help='Reutilizar buffers pré-alocados para os frames decodificados'
+    )
+    
+    parser.add_argument(
+        '--reader-backend',
+        type=str,
+        default='opencv',
+        choices=['opencv', 'ffmpeg'],
+        help='Backend de decodificação do vídeo (default: opencv)'
+    )
+    
+    parser.add_argument(
+        '--decode-max-side',
+        type=int,
+        default=None,
+        help='Resolução máxima decodificada pelo ffmpeg (requer --reader-backend ffmpeg)'
+    )
+    
+    parser.add_argument(
+        '--decode-fps',
+        type=float,
+        default=None,
+        help='FPS fixo decodificado pelo ffmpeg (requer --reader-backend ffmpeg)'
+    )
+    
+    parser.add_argument(
+        '--reader-pix-fmt',
+        type=str,
+        default='bgr24',
+        choices=['bgr24', 'gray'],
+        help='Formato de pixel decodificado pelo ffmpeg; gray evita a conversão de cor '
+             'na detecção Haar (requer --reader-backend ffmpeg e --face-backend opencv '
+             'ou auto; default: bgr24)'
+    )
+    
+    parser.add_argument(
+        '--index',
+        action='store_true',
+        help='Usar índice de frames salvo ao lado do vídeo (.fidx) para '
+             'timestamps exatos e seek direto (criado na primeira execução)'
+    )
+    
+    parser.add_argument(
+        '--writer-queue',
+        type=int,
+        default=0,
+        help='Frames na fila de encode do vídeo anotado; > 0 codifica em '
+             'thread separada (default: 0)'
+    )
+    
+    parser.add_argument(
+        '--writer-backend',
+        type=str,
+        default='opencv',
+        choices=['opencv', 'ffmpeg'],
+        help='Backend de encode do vídeo anotado; ffmpeg gera H.264 '
+             'reproduzível no navegador (default: opencv)'
+    )
+    
+    parser.add_argument(
+        '--crf',
+        type=int,
+        default=None,
+        help='Qualidade do encode ffmpeg; menor = melhor e maior (default: 23)'
+    )
+    
+    parser.add_argument(
+        '--preset',
+        type=str,
+        default=None,
+        help='Preset de velocidade do encode ffmpeg, ex: ultrafast, veryfast, '
+             'medium (default: veryfast)'
+    )
+    
+    parser.add_argument(
+        '--encode-threads',
+        type=int,
+        default=None,
+        help='Threads do encoder ffmpeg (default: 0 = automático)'
+    )
+    
+    parser.add_argument(
+        '--source',
+        type=str,
+        default='file',
+        choices=['file', 'live', 'tail'],
+        help='Tipo de fonte: arquivo, ao vivo (câmera, pipe, URL) ou '
+             'arquivo em gravação (default: file)'
+    )
+    
+    parser.add_argument(
+        '--tail-timeout',
+        type=float,
+        default=10.0,
+        help='Segundos sem crescimento do arquivo até encerrar no modo tail (default: 10)'
+    )
+    
     parser.add_argument(
         '--no-report',
         action='store_true',
@@ -95,7 +388,7 @@ def validate_video_path(video_path: str) -> bool:
     
     Args:
         video_path: Caminho do vídeo
-        
+    
     Returns:
         True se válido, False caso contrário
     """
@@ -196,8 +489,8 @@ def main():
     # Print header
     print_header()
     
-    # Validar vídeo
-    if not validate_video_path(args.video):
+    # Validar vídeo (fontes ao vivo são validadas ao abrir)
+    if args.source != 'live' and not validate_video_path(args.video):
         sys.exit(1)
     
     # Setup diretório de saída
@@ -216,9 +509,48 @@ def main():
         pipeline = InferencePipeline(
             video_path=args.video,
             output_video_path=output_video_path,
-            save_preview=args.save_preview,
+            save_preview=args.save_preview or args.clips,
             face_backend=args.face_backend,
-            emotion_backend=args.emotion_backend
+            face_detect_interval=args.detect_every,
+            face_full_scan_interval=args.full_scan_every,
+            face_tile_size=args.face_tile_size,
+            face_workers=args.face_workers,
+            face_in_flight=args.face_in_flight,
+            face_batch_size=args.face_batch_size,
+            face_batch_wait_ms=args.face_batch_wait,
+            emotion_backend=args.emotion_backend,
+            prefetch=args.prefetch,
+            frame_stride=args.stride,
+            start_sec=args.start,
+            end_sec=args.end,
+            analysis_scale=args.analysis_scale,
+            analysis_max_side=args.analysis_max_side,
+            use_frame_pool=args.frame_pool,
+            reader_backend=args.reader_backend,
+            decode_max_side=args.decode_max_side,
+            decode_fps=args.decode_fps,
+            reader_pix_fmt=args.reader_pix_fmt,
+            use_frame_index=args.index,
+            source_mode=args.source,
+            tail_timeout=args.tail_timeout,
+            writer_queue=args.writer_queue,
+            writer_backend=args.writer_backend,
+            writer_crf=args.crf,
+            writer_preset=args.preset,
+            writer_threads=args.encode_threads,
+            preview_mode='clips' if args.clips else 'full',
+            clip_pre_sec=args.clip_pre,
+            clip_post_sec=args.clip_post,
+            clips_dir=os.path.join(args.output_dir, 'clips'),
+            preview_fps=args.preview_fps,
+            preview_max_side=args.preview_max_side,
+            annotations_path=(
+                os.path.join(args.output_dir, 'annotations.npz') if args.annotations else None
+            ),
+            thumbnails_dir=os.path.join(args.output_dir, 'frames') if args.thumbnails else None,
+            thumbnail_interval=args.thumbnail_interval,
+            thumbnail_format=args.thumbnail_format,
+            motion_threshold=args.motion_threshold
         )
         
         # Executar processamento
@@ -244,12 +576,12 @@ def main():
         print("=" * 70)
         print("✨ Processamento concluído com sucesso!")
         print("=" * 70)
-        
+    
     except KeyboardInterrupt:
         print()
         print("⚠️  Processamento interrompido pelo usuário")
         sys.exit(1)
-        
+    
     except Exception as e:
         print()
         print(f"❌ Erro durante processamento: {str(e)}")
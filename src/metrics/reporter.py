@@ -80,7 +80,7 @@ class Reporter:
         
         Args:
             summary: Dicionário com dados do resumo
-            
+        
         Returns:
             String com conteúdo Markdown formatado
         """
@@ -99,6 +99,11 @@ class Reporter:
         lines.append(f"- **Total de Frames:** {summary.get('frames_total', 0):,}")
         lines.append(f"- **Duração:** {summary.get('duration_seconds', 0):.2f} segundos")
         lines.append(f"- **FPS:** {summary.get('fps', 0):.2f}")
+        if summary.get('frames_gated'):
+            lines.append(
+                f"- **Frames sem Mudança (resultados reaproveitados):** "
+                f"{summary['frames_gated']:,}"
+            )
         lines.append("")
         
         # Métricas Obrigatórias
@@ -193,6 +198,27 @@ class Reporter:
             lines.append(f"- 🟢 **Baixa:** {anomalies_by_severity.get('low', 0)}")
             lines.append("")
         
+        # Clipes de eventos
+        clips = summary.get('clips', [])
+        if clips:
+            lines.append("## 🎞️ Clipes de Eventos")
+            lines.append("")
+            lines.append(f"**Total de Clipes:** {len(clips)}")
+            lines.append("")
+            
+            for i, clip in enumerate(clips[:10]):
+                reasons = sorted({event.get('reason', '') for event in clip.get('events', [])})
+                lines.append(
+                    f"{i+1}. `{clip.get('path', '')}` "
+                    f"({clip.get('start_sec', 0):.2f}s-{clip.get('end_sec', 0):.2f}s): "
+                    f"{', '.join(reasons)}"
+                )
+            
+            if len(clips) > 10:
+                lines.append(f"\n_... e mais {len(clips) - 10} clipes_")
+            
+            lines.append("")
+        
         # Rodapé
         lines.append("---")
         lines.append("")
@@ -212,7 +238,7 @@ class Reporter:
         Args:
             summary: Dicionário com resumo do vídeo
             output_dir: Diretório de saída
-            
+        
         Returns:
             Dicionário com caminhos dos arquivos gerados
         """
@@ -237,7 +263,7 @@ class Reporter:
         
         Args:
             input_path: Caminho do arquivo JSON
-            
+        
         Returns:
             Dicionário com métricas carregadas
         """
@@ -61,7 +61,8 @@ class AnomalyDetector:
         window_size: Tamanho da janela para cálculo de estatísticas
         z_threshold: Threshold do z-score para considerar anomalia
         min_samples: Mínimo de amostras antes de começar detecção
-        
+        max_history: Máximo de anomalias guardadas (None = todas)
+    
     Example:
         >>> detector = AnomalyDetector(window_size=50, z_threshold=2.5)
         >>> anomalies = detector.update(frame_idx=10, metrics={'faces': 5})
@@ -73,7 +74,8 @@ class AnomalyDetector:
         self,
         window_size: int = 50,
         z_threshold: float = 2.5,
-        min_samples: int = 10
+        min_samples: int = 10,
+        max_history: Optional[int] = None
     ):
         """
         Inicializa o detector de anomalias.
@@ -82,16 +84,19 @@ class AnomalyDetector:
             window_size: Tamanho da janela deslizante para estatísticas
             z_threshold: Threshold z-score para detectar anomalias
             min_samples: Mínimo de amostras antes de começar a detectar
+            max_history: Máximo de anomalias guardadas; as mais antigas são
+                         descartadas (útil em streams sem fim definido)
         """
         self.window_size = window_size
         self.z_threshold = z_threshold
         self.min_samples = min_samples
+        self.max_history = max_history
         
         # Buffers para cada métrica
         self.metrics_buffers: Dict[str, deque] = {}
         
-        # Lista de todas as anomalias detectadas
-        self.anomalies: List[Anomaly] = []
+        # Anomalias detectadas (as últimas max_history, se definido)
+        self.anomalies: deque = deque(maxlen=max_history)
     
     def update(
         self,
@@ -105,7 +110,7 @@ class AnomalyDetector:
             frame_idx: Índice do frame atual
             metrics: Dicionário com métricas do frame
                     Ex: {'faces_count': 3, 'avg_emotion_score': 0.85}
-                    
+        
         Returns:
             Lista de anomalias detectadas neste frame
         """
@@ -147,7 +152,7 @@ class AnomalyDetector:
             metric_name: Nome da métrica
             value: Valor atual
             buffer: Buffer de valores históricos
-            
+        
         Returns:
             Objeto Anomaly se detectada, None caso contrário
         """
@@ -192,7 +197,7 @@ class AnomalyDetector:
                 )
             
             return None
-            
+        
         except (statistics.StatisticsError, ZeroDivisionError):
             # Não há dados suficientes ou erro no cálculo
             return None
@@ -204,7 +209,7 @@ class AnomalyDetector:
         Returns:
             Lista de todas as anomalias
         """
-        return self.anomalies.copy()
+        return list(self.anomalies)
     
     def get_anomalies_by_severity(self, severity: str) -> List[Anomaly]:
         """
@@ -212,7 +217,7 @@ class AnomalyDetector:
         
         Args:
             severity: 'low', 'medium' ou 'high'
-            
+        
         Returns:
             Lista de anomalias com a severidade especificada
         """
@@ -224,7 +229,7 @@ class AnomalyDetector:
         
         Args:
             metric_name: Nome da métrica
-            
+        
         Returns:
             Lista de anomalias para a métrica especificada
         """
@@ -5,21 +5,30 @@ Orquestra todos os componentes para processar vídeos end-to-end.
 """
 
 import os
-from typing import Optional, Dict, Any
+from collections import deque
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 from pathlib import Path
 
 import cv2
 import numpy as np
 from tqdm import tqdm
 
+from src.io.annotation_track import AnnotationTrack
+from src.io.clip_writer import ClipWriter
+from src.io.frame_pool import FramePool
+from src.io.thumbnail_exporter import ThumbnailExporter
 from src.io.video_reader import VideoReader
 from src.io.writer import VideoWriter
-from src.face.detector import FaceDetector
+from src.face.detector import FaceBatch, FaceDetector
+from src.face.tracker import FaceTracker
 from src.emotion.classifier import EmotionClassifier
 from src.activity.recognizer import ActivityRecognizer
 from src.pipeline.anomaly_detector import AnomalyDetector
+from src.pipeline.motion_gate import MotionGate
+from src.pipeline.renderer import fit_max_side
 from src.pipeline.summarizer import Summarizer
-from src.utils.viz import draw_box_and_label, put_hud, COLORS
+from src.utils.frame_context import FrameContext
+from src.utils.viz import draw_annotations
 
 
 class InferencePipeline:
@@ -43,13 +52,56 @@ class InferencePipeline:
         >>> print(f"Processed {summary['frames_total']} frames")
     """
     
+    # Eventos guardados pelo summarizer em fontes sem fim definido
+    STREAM_MAX_EVENTS = 1000
+    
+    # FPS do preview quando a fonte ao vivo não informa FPS
+    DEFAULT_STREAM_FPS = 30.0
+    
     def __init__(
         self,
         video_path: str,
         output_video_path: Optional[str] = None,
         save_preview: bool = True,
         face_backend: str = "auto",
-        emotion_backend: str = "auto"
+        face_detect_interval: int = 1,
+        face_full_scan_interval: int = 1,
+        face_tile_size: Optional[int] = None,
+        face_workers: int = 0,
+        face_in_flight: Optional[int] = None,
+        face_batch_size: int = 1,
+        face_batch_wait_ms: float = 20.0,
+        emotion_backend: str = "auto",
+        prefetch: int = 0,
+        frame_stride: int = 1,
+        start_sec: Optional[float] = None,
+        end_sec: Optional[float] = None,
+        analysis_scale: Optional[float] = None,
+        analysis_max_side: Optional[int] = None,
+        use_frame_pool: bool = False,
+        reader_backend: str = "opencv",
+        decode_max_side: Optional[int] = None,
+        decode_fps: Optional[float] = None,
+        reader_pix_fmt: str = "bgr24",
+        use_frame_index: bool = False,
+        source_mode: str = "file",
+        tail_timeout: float = 10.0,
+        writer_queue: int = 0,
+        writer_backend: str = "opencv",
+        writer_crf: Optional[int] = None,
+        writer_preset: Optional[str] = None,
+        writer_threads: Optional[int] = None,
+        preview_mode: str = "full",
+        clip_pre_sec: float = 2.0,
+        clip_post_sec: float = 3.0,
+        clips_dir: Optional[str] = None,
+        preview_fps: Optional[float] = None,
+        preview_max_side: Optional[int] = None,
+        annotations_path: Optional[str] = None,
+        thumbnails_dir: Optional[str] = None,
+        thumbnail_interval: float = 10.0,
+        thumbnail_format: str = "jpg",
+        motion_threshold: Optional[float] = None
     ):
         """
         Inicializa o pipeline de inferência.
@@ -59,22 +111,257 @@ class InferencePipeline:
             output_video_path: Caminho do vídeo de saída (opcional)
             save_preview: Se deve salvar vídeo com anotações
             face_backend: Backend para detecção de faces
+            face_detect_interval: Executar a detecção de faces a cada N
+                                  frames analisados e rastrear as faces
+                                  nos intermediários, com IDs estáveis
+                                  (1 = detectar em todo frame)
+            face_full_scan_interval: Backend opencv: varrer o frame inteiro
+                                     a cada N detecções e, nas demais,
+                                     buscar só ao redor das faces
+                                     anteriores (1 = sempre o frame inteiro)
+            face_tile_size: Se definido, frames de análise maiores que isso
+                            têm as faces detectadas em tiles sobrepostos,
+                            em paralelo (faces pequenas em vídeos 4K)
+            face_workers: Threads que detectam faces em vários frames ao
+                          mesmo tempo, cada uma com o próprio detector
+                          (0 = detecção síncrona, frame a frame)
+            face_in_flight: Frames em detecção simultânea com face_workers
+                            ou face_batch_size (padrão: o dobro do maior
+                            dos dois); os resultados seguem na ordem dos
+                            frames
+            face_batch_size: Backend deepface: frames consecutivos
+                             detectados em uma única chamada (1 = frame a
+                             frame)
+            face_batch_wait_ms: Espera máxima (ms) para completar um lote
             emotion_backend: Backend para classificação de emoções
+            prefetch: Frames decodificados antecipadamente em thread
+                      separada (0 = leitura síncrona)
+            frame_stride: Analisar apenas 1 a cada N frames
+            start_sec: Início da janela de análise em segundos (opcional)
+            end_sec: Fim da janela de análise em segundos (opcional)
+            analysis_scale: Fator de redução dos frames usados na análise
+            analysis_max_side: Lado maior máximo dos frames de análise
+                               (alternativa a analysis_scale). Boxes e
+                               anotações continuam em pixels do original.
+            use_frame_pool: Decodificar em buffers pré-alocados, devolvidos
+                            ao pool após a escrita do frame anotado
+            reader_backend: Backend do VideoReader ('opencv' ou 'ffmpeg')
+            decode_max_side: Resolução máxima decodificada pelo ffmpeg; o
+                             vídeo reduzido passa a ser a referência de
+                             coordenadas e do preview
+            decode_fps: FPS fixo decodificado pelo ffmpeg
+            reader_pix_fmt: Formato de pixel decodificado pelo ffmpeg
+                            ('bgr24' ou 'gray'). Com 'gray', a cascata
+                            Haar recebe o frame sem conversão de cor:
+                            face_backend 'auto' passa a ser 'opencv', e
+                            só os recortes das faces (emoções), as
+                            miniaturas e os frames do preview são
+                            convertidos para BGR
+            use_frame_index: Usar o índice de frames (<video>.fidx) para
+                             timestamps exatos e seek direto na janela
+            source_mode: 'file', 'live' (câmera, pipe, URL) ou 'tail'
+                         (arquivo em gravação). Em 'live'/'tail' a memória
+                         do pipeline fica limitada: o resumo guarda apenas
+                         os STREAM_MAX_EVENTS eventos mais recentes.
+            tail_timeout: Espera máxima (s) por novos dados no modo tail
+            writer_queue: Tamanho da fila de encode do vídeo anotado. Se
+                          > 0, o encode roda em thread separada e a
+                          inferência só espera quando a fila enche.
+            writer_backend: Backend do VideoWriter ('opencv' ou 'ffmpeg').
+                            'ffmpeg' gera H.264, menor e reproduzível no
+                            navegador.
+            writer_crf: CRF do encoder ffmpeg (menor = melhor qualidade)
+            writer_preset: Preset de velocidade do encoder ffmpeg
+            writer_threads: Threads do encoder ffmpeg (0 = automático)
+            preview_mode: 'full' grava o vídeo anotado inteiro; 'clips'
+                          grava apenas clipes curtos em torno de anomalias
+                          e inícios de atividade, indexados no resumo
+            clip_pre_sec: Segundos gravados antes de cada evento
+            clip_post_sec: Segundos gravados depois do último evento
+            clips_dir: Diretório dos clipes (padrão: 'clips' ao lado de
+                       output_video_path)
+            preview_fps: FPS máximo do vídeo anotado (ou dos clipes),
+                         independente da análise. Frames fora do preview
+                         são analisados mas não anotados.
+            preview_max_side: Lado maior máximo do vídeo anotado; o frame é
+                              reduzido uma única vez, depois da anotação
+            annotations_path: Se definido, salva as anotações de cada frame
+                              analisado nesta trilha (.npz), para renderizar
+                              o vídeo depois com AnnotationRenderer
+            thumbnails_dir: Se definido, salva miniaturas de anomalias,
+                            inícios de atividade e a cada
+                            thumbnail_interval segundos, além de folhas de
+                            contato, neste diretório
+            thumbnail_interval: Segundos entre miniaturas periódicas
+                                (0 = apenas eventos)
+            thumbnail_format: Formato das miniaturas ('jpg' ou 'webp')
+            motion_threshold: Se definido, frames em que menos que esta
+                              fração dos pixels mudou não passam pelos
+                              modelos: faces, emoções e keypoints do frame
+                              anterior são reaproveitados (None = desativado)
+        
+        Raises:
+            ValueError: Se preview_mode, preview_fps, preview_max_side,
+                        as opções de face_workers/face_batch_size forem
+                        inválidos ou reader_pix_fmt='gray' for combinado
+                        com um backend de faces que precisa de cor
         """
+        if preview_mode not in ("full", "clips"):
+            raise ValueError(f"preview_mode must be 'full' or 'clips', got {preview_mode}")
+        
+        if preview_fps is not None and preview_fps <= 0:
+            raise ValueError(f"preview_fps must be > 0, got {preview_fps}")
+        
+        if preview_max_side is not None and preview_max_side <= 0:
+            raise ValueError(f"preview_max_side must be > 0, got {preview_max_side}")
+        
+        if face_workers < 0:
+            raise ValueError(f"face_workers must be >= 0, got {face_workers}")
+        
+        if face_batch_size < 1:
+            raise ValueError(f"face_batch_size must be >= 1, got {face_batch_size}")
+        
+        # Frames em cinza: só a cascata Haar (opencv) detecta sem converter
+        if reader_pix_fmt == "gray":
+            if face_backend not in ("auto", "opencv"):
+                raise ValueError(
+                    f"reader_pix_fmt='gray' requires face_backend 'opencv', got {face_backend}"
+                )
+            face_backend = "opencv"
+        
+        # Detecção à frente do processamento (pool de threads ou lotes)
+        detect_ahead = face_workers > 0 or face_batch_size > 1
+        
+        # Rastreamento e busca incremental dependem do frame anterior
+        if detect_ahead and (face_detect_interval > 1 or face_full_scan_interval > 1):
+            raise ValueError(
+                "face_workers and face_batch_size require face_detect_interval=1 "
+                "and face_full_scan_interval=1"
+            )
+        
+        face_in_flight = face_in_flight or 2 * max(face_workers, face_batch_size)
+        if detect_ahead and face_in_flight < 1:
+            raise ValueError(f"face_in_flight must be >= 1, got {face_in_flight}")
+        
         self.video_path = video_path
         self.output_video_path = output_video_path
         self.save_preview = save_preview
+        self.prefetch = prefetch
+        self.frame_stride = frame_stride
+        self.start_sec = start_sec
+        self.end_sec = end_sec
+        self.analysis_scale = analysis_scale
+        self.analysis_max_side = analysis_max_side
+        self.reader_backend = reader_backend
+        self.decode_max_side = decode_max_side
+        self.decode_fps = decode_fps
+        self.reader_pix_fmt = reader_pix_fmt
+        self.use_frame_index = use_frame_index
+        self.source_mode = source_mode
+        self.tail_timeout = tail_timeout
+        self.writer_queue = writer_queue
+        self.writer_backend = writer_backend
+        self.writer_crf = writer_crf
+        self.writer_preset = writer_preset
+        self.writer_threads = writer_threads
+        self.preview_mode = preview_mode
+        self.clip_pre_sec = clip_pre_sec
+        self.clip_post_sec = clip_post_sec
+        self.clips_dir = clips_dir
+        self.preview_fps = preview_fps
+        self.preview_max_side = preview_max_side
+        self.annotations_path = annotations_path
+        self.thumbnails_dir = thumbnails_dir
+        self.thumbnail_interval = thumbnail_interval
+        self.thumbnail_format = thumbnail_format
+        self.motion_threshold = motion_threshold
+        self.face_workers = face_workers
+        self.face_in_flight = face_in_flight
+        self.detect_ahead = detect_ahead
+        
+        # Buffers em uso: fila de prefetch + fila de encode + frame atual
+        # + frame reduzido (+ frames em detecção à frente)
+        self.frame_pool: Optional[FramePool] = None
+        if use_frame_pool:
+            in_flight = face_in_flight if detect_ahead else 0
+            self.frame_pool = FramePool(max_buffers=prefetch + writer_queue + in_flight + 4)
         
         # Inicializar componentes
-        self.video_reader = VideoReader(video_path)
-        self.face_detector = FaceDetector(backend=face_backend)
+        self.video_reader = self._create_video_reader()
+        self.face_detector = FaceDetector(
+            backend=face_backend,
+            full_scan_interval=face_full_scan_interval,
+            tile_size=face_tile_size,
+            frame_workers=face_workers or 1,
+            batch_size=face_batch_size,
+            batch_wait_ms=face_batch_wait_ms
+        )
+        if face_detect_interval > 1:
+            self.face_detector = FaceTracker(
+                self.face_detector, detect_interval=face_detect_interval
+            )
         self.emotion_classifier = EmotionClassifier(backend=emotion_backend)
         self.activity_recognizer = ActivityRecognizer(window_size=30, stride=15)
-        self.anomaly_detector = AnomalyDetector(window_size=50, z_threshold=2.5)
-        self.summarizer = Summarizer(video_path)
         
-        # Video writer (inicializado depois)
+        # Filtro de mudança de cena e resultados do último frame processado
+        self.motion_gate: Optional[MotionGate] = None
+        if motion_threshold is not None:
+            self.motion_gate = MotionGate(threshold=motion_threshold)
+        self._last_faces = FaceBatch.empty()
+        self._last_emotions: list = []
+        
+        # Conversões do frame de análise (cinza, RGB, reduções) feitas uma
+        # vez por frame e compartilhadas entre detecção, tracker e pose; os
+        # buffers passam de um frame para o seguinte. Com detecção à frente,
+        # cada frame em voo usa um contexto próprio, reciclado em
+        # _free_contexts.
+        self._frame_context = FrameContext()
+        self._free_contexts: deque = deque()
+        
+        # Em streams, históricos de eventos são limitados
+        max_events = self.STREAM_MAX_EVENTS if self.video_reader.is_streaming() else None
+        self.anomaly_detector = AnomalyDetector(
+            window_size=50, z_threshold=2.5, max_history=max_events
+        )
+        self.summarizer = Summarizer(video_path, max_events=max_events)
+        
+        # Preview decimado: 1 a cada preview_step frames analisados, com
+        # dimensões preview_size (calculadas uma vez, a partir dos metadados)
+        analysis_fps = (self.video_reader.fps() or self.DEFAULT_STREAM_FPS) / self.frame_stride
+        self.preview_step = 1
+        if preview_fps is not None:
+            self.preview_step = max(1, int(round(analysis_fps / preview_fps)))
+        self._preview_counter = 0
+        self.preview_size: Optional[Tuple[int, int]] = None
+        
+        # Video writer ou clip writer (inicializados depois)
         self.video_writer: Optional[VideoWriter] = None
+        self.clip_writer: Optional[ClipWriter] = None
+        self._last_activity: Optional[str] = None
+        
+        # Trilha de anotações e miniaturas (inicializadas depois)
+        self.annotation_track: Optional[AnnotationTrack] = None
+        self.thumbnail_exporter: Optional[ThumbnailExporter] = None
+    
+    def _create_video_reader(self) -> VideoReader:
+        """Cria o VideoReader com as opções de leitura do pipeline."""
+        return VideoReader(
+            self.video_path,
+            prefetch=self.prefetch,
+            stride=self.frame_stride,
+            start_sec=self.start_sec,
+            end_sec=self.end_sec,
+            scale=self.analysis_scale,
+            max_side=self.analysis_max_side,
+            pool=self.frame_pool,
+            backend=self.reader_backend,
+            decode_max_side=self.decode_max_side,
+            decode_fps=self.decode_fps,
+            pix_fmt=self.reader_pix_fmt,
+            use_index=self.use_frame_index,
+            source_mode=self.source_mode,
+            tail_timeout=self.tail_timeout
+        )
     
     def run(self) -> Dict[str, Any]:
         """
@@ -85,22 +372,49 @@ class InferencePipeline:
         """
         print(f"🎬 Iniciando processamento de: {self.video_path}")
         print(f"📊 FPS: {self.video_reader.fps():.2f}")
-        print(f"🎞️  Total de frames: {self.video_reader.frame_count()}")
-        print(f"⏱️  Duração: {self.video_reader.duration():.2f}s")
+        if self.video_reader.is_streaming():
+            print(f"📡 Fonte contínua ({self.source_mode}): duração desconhecida")
+        else:
+            print(f"🎞️  Total de frames: {self.video_reader.frame_count()}")
+            if self.video_reader.sampled_frame_count() != self.video_reader.frame_count():
+                print(f"🔎 Frames analisados: {self.video_reader.sampled_frame_count()}")
+            print(f"⏱️  Duração: {self.video_reader.duration():.2f}s")
         print()
         
-        # Configurar video writer se necessário
-        if self.save_preview and self.output_video_path:
+        # Configurar video writer (ou clipes de eventos) se necessário
+        if self.save_preview and self.preview_mode == "clips":
+            self._setup_clip_writer()
+        elif self.save_preview and self.output_video_path:
             self._setup_video_writer()
         
+        if self.thumbnails_dir:
+            self._setup_thumbnail_exporter()
+        
+        if self.annotations_path:
+            self.annotation_track = AnnotationTrack(
+                self.video_path,
+                fps=self.video_reader.fps() or self.DEFAULT_STREAM_FPS,
+                frame_size=self.video_reader.frame_size(),
+                stride=self.frame_stride
+            )
+        
         # Processar frames
         try:
             self._process_frames()
         finally:
             # Garantir limpeza de recursos
             self.video_reader.release()
+            self.face_detector.close()
             if self.video_writer:
                 self.video_writer.release()
+            if self.clip_writer:
+                self.clip_writer.release()
+                self.summarizer.add_clips(self.clip_writer.clips)
+            if self.thumbnail_exporter is not None:
+                self.thumbnail_exporter.release()
+            if self.annotation_track is not None:
+                self.annotation_track.save(self.annotations_path)
+                print(f"🗂️  Anotações salvas em: {self.annotations_path}")
         
         # Gerar resumo final
         summary = self.summarizer.generate_summary(
@@ -112,90 +426,308 @@ class InferencePipeline:
         print("✅ Processamento concluído!")
         print(f"📈 Frames processados: {summary.frames_total}")
         print(f"⚠️  Anomalias detectadas: {summary.anomalies_total}")
+        if self.thumbnail_exporter:
+            print(
+                f"🖼️  Miniaturas salvas: {len(self.thumbnail_exporter.thumbnails)} "
+                f"({len(self.thumbnail_exporter.sheets)} folhas de contato)"
+            )
+        if self.clip_writer:
+            print(f"🎞️  Clipes de eventos salvos: {len(summary.clips)}")
+        if self.motion_gate is not None:
+            print(f"⏸️  Frames sem mudança (reaproveitados): {summary.frames_gated}")
+        if isinstance(self.face_detector, FaceTracker):
+            print(
+                f"🔁 Detecção de faces executada em {self.face_detector.detections} "
+                f"de {self.face_detector.frames} frames"
+            )
         
         return summary.to_dict()
     
     def _setup_video_writer(self):
         """Configura o video writer para salvar o vídeo anotado."""
-        # Ler um frame para obter dimensões
-        for idx, frame, ts in self.video_reader:
-            frame_height, frame_width = frame.shape[:2]
-            break
+        self.preview_size = self._compute_preview_size()
         
-        # Reset do video reader
-        self.video_reader.release()
-        self.video_reader = VideoReader(self.video_path)
-        
-        # Criar video writer
+        # Criar video writer (com stride/preview_fps, o preview mantém a
+        # duração real)
         self.video_writer = VideoWriter(
             path=self.output_video_path,
-            fps=self.video_reader.fps(),
-            frame_size=(frame_width, frame_height),
-            codec="mp4v"
+            fps=self._preview_output_fps(),
+            frame_size=self.preview_size,
+            queue_size=self.writer_queue,
+            on_written=self.frame_pool.release if self.frame_pool is not None else None,
+            backend=self.writer_backend,
+            crf=self.writer_crf,
+            preset=self.writer_preset,
+            threads=self.writer_threads
         )
         
         print(f"💾 Vídeo anotado será salvo em: {self.output_video_path}")
         print()
     
+    def _compute_preview_size(self) -> Tuple[int, int]:
+        """Dimensões do preview: as do vídeo, limitadas a preview_max_side."""
+        # Dimensões vêm dos metadados do reader: o vídeo é aberto uma única vez
+        return fit_max_side(self.video_reader.frame_size(), self.preview_max_side)
+    
+    def _preview_output_fps(self) -> float:
+        """FPS do vídeo de preview (após stride e decimação)."""
+        fps = self.video_reader.fps() or self.DEFAULT_STREAM_FPS
+        return fps / self.frame_stride / self.preview_step
+    
+    def _preview_due(self) -> bool:
+        """Indica se o frame analisado atual entra no preview."""
+        due = self._preview_counter % self.preview_step == 0
+        self._preview_counter += 1
+        return due
+    
+    def _resize_for_preview(self, frame: np.ndarray) -> np.ndarray:
+        """Reduz o frame anotado para preview_size (no máximo uma vez)."""
+        height, width = frame.shape[:2]
+        if self.preview_size is None or (width, height) == self.preview_size:
+            return frame
+        
+        preview_width, preview_height = self.preview_size
+        dst = None
+        if self.frame_pool is not None:
+            dst = self.frame_pool.acquire((preview_height, preview_width, 3), frame.dtype)
+        return cv2.resize(frame, self.preview_size, dst=dst, interpolation=cv2.INTER_AREA)
+    
+    def _setup_clip_writer(self):
+        """Configura a gravação de clipes em torno de eventos."""
+        clips_dir = self.clips_dir
+        if clips_dir is None:
+            base_dir = os.path.dirname(self.output_video_path or "") or "outputs"
+            clips_dir = os.path.join(base_dir, "clips")
+        
+        self.preview_size = self._compute_preview_size()
+        self.clip_writer = ClipWriter(
+            clips_dir,
+            fps=self._preview_output_fps(),
+            frame_size=self.preview_size,
+            pre_seconds=self.clip_pre_sec,
+            post_seconds=self.clip_post_sec,
+            on_written=self.frame_pool.release if self.frame_pool is not None else None,
+            queue_size=self.writer_queue,
+            backend=self.writer_backend,
+            crf=self.writer_crf,
+            preset=self.writer_preset,
+            threads=self.writer_threads
+        )
+        
+        print(f"🎞️  Clipes de eventos serão salvos em: {clips_dir}")
+        print()
+    
+    def _frame_events(self, activities: list, anomalies: list) -> List[str]:
+        """
+        Eventos do frame que disparam clipes e miniaturas.
+        
+        Returns:
+            Lista de eventos ('anomaly:<métrica>', 'activity:<label>')
+        """
+        events = [f"anomaly:{anomaly.metric_name}" for anomaly in anomalies]
+        
+        # Janelas consecutivas com o mesmo label são a mesma atividade
+        for activity in activities:
+            label = activity.get('label', 'unknown')
+            if label != self._last_activity:
+                events.append(f"activity:{label}")
+            self._last_activity = label
+        
+        return events
+    
+    def _setup_thumbnail_exporter(self):
+        """Configura a exportação de miniaturas e folhas de contato."""
+        self.thumbnail_exporter = ThumbnailExporter(
+            self.thumbnails_dir,
+            interval_sec=self.thumbnail_interval,
+            image_format=self.thumbnail_format
+        )
+        
+        print(f"🖼️  Miniaturas serão salvas em: {self.thumbnails_dir}")
+        print()
+    
     def _process_frames(self):
         """Processa todos os frames do vídeo."""
-        total_frames = self.video_reader.frame_count()
+        # Em streams o total é desconhecido: barra sem total
+        total_frames = None
+        if not self.video_reader.is_streaming():
+            total_frames = self.video_reader.sampled_frame_count()
         
         # Barra de progresso
         with tqdm(total=total_frames, desc="Processando frames", unit="frame") as pbar:
-            for idx, frame, timestamp in self.video_reader:
+            frames = self.video_reader.iter_full_and_scaled()
+            if self.detect_ahead:
+                frames = self._detect_ahead(frames)
+            else:
+                frames = (item + (None, None, None) for item in frames)
+            
+            for idx, frame, analysis_frame, timestamp, gated, faces, context in frames:
                 # Processar frame
-                annotated_frame = self._process_single_frame(idx, frame, timestamp)
+                annotated_frame = self._process_single_frame(
+                    idx, frame, timestamp, analysis_frame=analysis_frame,
+                    gated=gated, faces=faces, context=context
+                )
+                if context is not None:
+                    self._free_contexts.append(context)
+                
+                # Salvar frame anotado se configurado (o writer devolve o
+                # frame ao pool depois do encode)
+                written = False
+                if annotated_frame is not None and (self.video_writer or self.clip_writer):
+                    preview_frame = self._resize_for_preview(annotated_frame)
+                    if self.video_writer:
+                        self.video_writer.write(preview_frame)
+                    elif self.clip_writer:
+                        self.clip_writer.write(preview_frame, idx, timestamp)
+                    written = preview_frame is frame
                 
-                # Salvar frame anotado se configurado
-                if self.video_writer and annotated_frame is not None:
-                    self.video_writer.write(annotated_frame)
+                # Frame já consumido: devolver buffers ao pool
+                if self.frame_pool is not None:
+                    if not written:
+                        self.frame_pool.release(frame)
+                    if analysis_frame is not frame:
+                        self.frame_pool.release(analysis_frame)
                 
                 # Atualizar barra
                 pbar.update(1)
     
+    def _detect_ahead(self, frames: Iterator[tuple]) -> Iterator[tuple]:
+        """
+        Detecta faces com até face_in_flight frames à frente do processamento.
+        
+        O filtro de movimento é avaliado em ordem, ao agendar cada frame;
+        os frames que passam vão para FaceDetector.submit() (pool de
+        threads ou lotes do deepface). Os
+        estágios seguintes (emoções, atividades, anomalias, resumo) têm
+        estado e recebem os frames na ordem original, já com as faces.
+        
+        Cada frame agendado leva um FrameContext próprio (reciclado de
+        _free_contexts), usado pela detecção e depois pelos estágios
+        seguintes; o chamador o devolve à lista depois de processar o frame.
+        
+        Args:
+            frames: Tuplas (idx, frame, analysis_frame, timestamp) do reader
+        
+        Yields:
+            Tuplas (idx, frame, analysis_frame, timestamp, gated, faces,
+            context)
+        """
+        pending: deque = deque()
+        
+        def resolve(item):
+            *head, gated, future, context = item
+            return (*head, gated, None if future is None else future.result(), context)
+        
+        for idx, frame, analysis_frame, timestamp in frames:
+            analysis = frame if analysis_frame is None else analysis_frame
+            gated = self.motion_gate is not None and not self.motion_gate.changed(analysis)
+            
+            future = context = None
+            if not gated:
+                scale = 1.0 if analysis is frame else self.video_reader.scale_factor()
+                free = self._free_contexts
+                context = (free.popleft() if free else FrameContext()).reset(analysis)
+                future = self.face_detector.submit(analysis, scale=scale, context=context)
+            
+            pending.append((idx, frame, analysis_frame, timestamp, gated, future, context))
+            if len(pending) >= self.face_in_flight:
+                yield resolve(pending.popleft())
+        
+        while pending:
+            yield resolve(pending.popleft())
+    
     def _process_single_frame(
         self,
         idx: int,
         frame: np.ndarray,
-        timestamp: float
+        timestamp: float,
+        analysis_frame: Optional[np.ndarray] = None,
+        gated: Optional[bool] = None,
+        faces: Optional[FaceBatch] = None,
+        context: Optional[FrameContext] = None
     ) -> Optional[np.ndarray]:
         """
         Processa um único frame através de todo o pipeline.
         
         Args:
             idx: Índice do frame
-            frame: Frame a processar
+            frame: Frame a processar (resolução original)
             timestamp: Timestamp em segundos
-            
+            analysis_frame: Versão reduzida do frame para detecção e pose
+                            (opcional; padrão é o próprio frame)
+            gated: Resultado do filtro de movimento, se já avaliado
+            faces: Faces do frame, se já detectadas (_detect_ahead)
+            context: Contexto de conversões de analysis_frame, se já criado
+                     (_detect_ahead); padrão é o contexto reaproveitado do
+                     pipeline
+        
         Returns:
             Frame anotado ou None se não deve salvar
         """
-        # 1. Detectar faces
-        faces = self.face_detector.detect(frame)
-        
-        # 2. Classificar emoções
-        emotions = self.emotion_classifier.predict(frame, faces)
+        scale = 1.0
+        if analysis_frame is None:
+            analysis_frame = frame
+        elif analysis_frame is not frame:
+            scale = self.video_reader.scale_factor()
         
-        # 3. Reconhecer atividades (sliding window)
-        activities = self.activity_recognizer.update(idx, frame)
+        # 0. Frame sem mudança visual: reaproveitar os resultados anteriores
+        if gated is None:
+            gated = self.motion_gate is not None and not self.motion_gate.changed(analysis_frame)
         
-        # 4. Detectar anomalias
-        metrics = {
-            'faces_count': len(faces),
-            'avg_emotion_score': self._compute_avg_emotion_score(emotions)
-        }
-        anomalies = self.anomaly_detector.update(idx, metrics)
+        if gated:
+            faces, emotions = self._last_faces, self._last_emotions
+            activities = self.activity_recognizer.repeat_last(idx)
+            anomalies = []
+        else:
+            if context is None:
+                context = self._frame_context.reset(analysis_frame)
+            
+            # 1. Detectar faces (boxes projetadas para o frame original)
+            if faces is None:
+                faces = self.face_detector.detect_batch(analysis_frame, scale=scale, context=context)
+            
+            # 2. Classificar emoções (recortes na resolução original)
+            emotions = self.emotion_classifier.predict(frame, faces)
+            
+            # 3. Reconhecer atividades (sliding window)
+            activities = self.activity_recognizer.update(idx, analysis_frame, context)
+            
+            # 4. Detectar anomalias
+            metrics = {
+                'faces_count': len(faces),
+                'avg_emotion_score': self._compute_avg_emotion_score(emotions)
+            }
+            anomalies = self.anomaly_detector.update(idx, metrics)
+            
+            self._last_faces, self._last_emotions = faces, emotions
         
         # 5. Adicionar ao summarizer
-        self.summarizer.add_frame_data(idx, faces, emotions)
+        self.summarizer.add_frame_data(idx, faces, emotions, gated=gated)
         if activities:
             self.summarizer.add_activities(activities)
         if anomalies:
             self.summarizer.add_anomalies(anomalies)
+        if self.clip_writer is not None or self.thumbnail_exporter is not None:
+            events = self._frame_events(activities, anomalies)
+            if self.clip_writer is not None:
+                for event in events:
+                    self.clip_writer.trigger(idx, timestamp, event)
+            if self.thumbnail_exporter is not None:
+                # Frame ainda sem anotações
+                self.thumbnail_exporter.capture(frame, idx, timestamp, reasons=events)
+        if self.annotation_track is not None:
+            self.annotation_track.append(
+                idx,
+                timestamp,
+                boxes=faces.boxes.tolist(),
+                emotions=[(emotion.label, emotion.normalized_score) for emotion in emotions],
+                activity=activities[-1]['label'] if activities else None,
+                anomalies_count=len(anomalies),
+                track_ids=faces.track_ids.tolist()
+            )
         
-        # 6. Anotar frame para visualização
-        if self.save_preview:
+        # 6. Anotar frame para visualização (apenas os que entram no preview)
+        if self.save_preview and self._preview_due():
             return self._annotate_frame(
                 frame, idx, timestamp, faces, emotions, activities, anomalies
             )
@@ -215,7 +747,7 @@ class InferencePipeline:
         frame: np.ndarray,
         idx: int,
         timestamp: float,
-        faces: list,
+        faces: FaceBatch,
         emotions: list,
         activities: list,
         anomalies: list
@@ -223,69 +755,40 @@ class InferencePipeline:
         """
         Anota frame com detecções e informações.
         
+        O desenho é feito in-place: o pipeline é dono do frame e não o usa
+        depois da anotação, então nenhuma cópia é necessária.
+        
         Args:
-            frame: Frame original
+            frame: Frame original (será modificado)
             idx: Índice do frame
             timestamp: Timestamp em segundos
-            faces: Lista de faces detectadas
+            faces: Faces detectadas
             emotions: Lista de emoções classificadas
             activities: Lista de atividades detectadas
             anomalies: Lista de anomalias detectadas
-            
+        
         Returns:
             Frame anotado
         """
-        output = frame.copy()
-        
-        # Desenhar faces e emoções
-        for i, face in enumerate(faces):
-            # Determinar label
-            label = f"Face {i+1}"
-            color = COLORS['green']
-            
-            # Adicionar emoção se disponível
-            if i < len(emotions):
-                emotion = emotions[i]
-                label += f" - {emotion.label}"
-                score = emotion.normalized_score
-                label += f" ({score:.2f})"
-                
-                # Cor baseada em emoção
-                emotion_colors = {
-                    'happy': COLORS['green'],
-                    'sad': COLORS['blue'],
-                    'angry': COLORS['red'],
-                    'fear': COLORS['purple'],
-                    'surprise': COLORS['yellow'],
-                    'disgust': COLORS['orange'],
-                    'neutral': COLORS['gray']
-                }
-                color = emotion_colors.get(emotion.label, COLORS['green'])
-            
-            # Desenhar box e label
-            output = draw_box_and_label(output, face.box, label, color=color)
-        
-        # Criar HUD com estatísticas
-        hud_stats = {
-            'Frame': idx,
-            'Time': f"{timestamp:.2f}s",
-            'Faces': len(faces),
-            'FPS': self.video_reader.fps()
-        }
-        
-        # Adicionar atividade atual se houver
-        if activities:
-            last_activity = activities[-1]
-            hud_stats['Activity'] = last_activity['label']
+        if frame.ndim == 2:
+            # Decodificação em cinza: só os frames do preview ganham cor
+            dst = None
+            if self.frame_pool is not None:
+                dst = self.frame_pool.acquire(frame.shape + (3,), frame.dtype)
+            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR, dst=dst)
         
-        # Adicionar indicador de anomalia
-        if anomalies:
-            hud_stats['⚠️ Anomalies'] = len(anomalies)
-        
-        # Desenhar HUD
-        output = put_hud(output, hud_stats, position="top-left")
-        
-        return output
+        return draw_annotations(
+            frame,
+            idx,
+            timestamp,
+            boxes=faces.boxes.tolist(),
+            emotions=[(emotion.label, emotion.normalized_score) for emotion in emotions],
+            fps=self.video_reader.fps(),
+            track_ids=faces.track_id_list(),
+            activity=activities[-1]['label'] if activities else None,
+            anomalies_count=len(anomalies),
+            inplace=True
+        )
     
     def get_summary(self) -> Dict[str, Any]:
         """
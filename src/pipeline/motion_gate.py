@@ -0,0 +1,139 @@
+"""
+Motion Gate Module
+
+Implementa a classe MotionGate, um filtro barato de mudança de cena que
+decide se um frame precisa passar pelos modelos ou se os resultados do
+frame anterior podem ser reaproveitados.
+"""
+
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """
+    Detecta mudança visual por diferença de frames em baixa resolução.
+    
+    Cada frame é reduzido para `width` pixels de largura (INTER_AREA, que
+    também atenua o ruído do sensor) e convertido para cinza. A fração de
+    pixels cuja diferença absoluta para o frame de referência passa de
+    `pixel_threshold` é comparada com `threshold`.
+    
+    A referência é o último frame aceito, não o anterior: mudanças lentas
+    (ex: alguém se aproximando devagar) se acumulam até abrir o filtro.
+    Após `max_gated` frames descartados seguidos, o próximo é aceito de
+    qualquer forma, para que os resultados não fiquem velhos demais.
+    
+    Attributes:
+        threshold (float): Fração mínima de pixels alterados para aceitar
+        frames (int): Frames avaliados
+        gated (int): Frames descartados (sem mudança)
+        last_ratio (float): Fração de pixels alterados no último frame
+    
+    Example:
+        >>> gate = MotionGate(threshold=0.01)
+        >>> for frame in frames:
+        ...     if gate.changed(frame):
+        ...         results = run_models(frame)
+    """
+    
+    def __init__(
+        self,
+        threshold: float = 0.01,
+        pixel_threshold: int = 15,
+        width: int = 64,
+        max_gated: int = 30
+    ) -> None:
+        """
+        Inicializa o filtro.
+        
+        Args:
+            threshold: Fração (0-1) de pixels alterados a partir da qual o
+                       frame é considerado diferente
+            pixel_threshold: Diferença mínima de intensidade (0-255) para
+                             um pixel contar como alterado
+            width: Largura da versão reduzida usada na comparação
+            max_gated: Máximo de frames descartados seguidos
+        
+        Raises:
+            ValueError: Se algum parâmetro for inválido
+        """
+        if not 0.0 <= threshold <= 1.0:
+            raise ValueError(f"threshold must be in [0, 1], got {threshold}")
+        
+        if not 0 <= pixel_threshold <= 255:
+            raise ValueError(f"pixel_threshold must be in [0, 255], got {pixel_threshold}")
+        
+        if width < 8 or max_gated < 1:
+            raise ValueError(f"width must be >= 8 and max_gated >= 1, got {width}, {max_gated}")
+        
+        self.threshold = threshold
+        self.pixel_threshold = pixel_threshold
+        self.width = width
+        self.max_gated = max_gated
+        self.frames = 0
+        self.gated = 0
+        self.last_ratio = 1.0
+        
+        self._reference: Optional[np.ndarray] = None
+        self._streak = 0
+    
+    def _thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        """Versão reduzida em cinza do frame."""
+        height, width = frame.shape[:2]
+        size = (self.width, max(1, int(round(height * self.width / width))))
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        return small if small.ndim == 2 else cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    
+    def changed(self, frame: np.ndarray) -> bool:
+        """
+        Avalia um frame.
+        
+        Args:
+            frame: Frame BGR ou grayscale
+        
+        Returns:
+            True se o frame deve ser processado; False se é igual à
+            referência (resultados anteriores podem ser reaproveitados)
+        """
+        self.frames += 1
+        small = self._thumbnail(frame)
+        
+        if (
+            self._reference is None
+            or self._reference.shape != small.shape
+            or self._streak >= self.max_gated
+        ):
+            self.last_ratio = 1.0
+            self._accept(small)
+            return True
+        
+        diff = cv2.absdiff(small, self._reference)
+        self.last_ratio = np.count_nonzero(diff > self.pixel_threshold) / diff.size
+        
+        if self.last_ratio >= self.threshold:
+            self._accept(small)
+            return True
+        
+        self._streak += 1
+        self.gated += 1
+        return False
+    
+    def _accept(self, small: np.ndarray) -> None:
+        """Torna o frame reduzido a nova referência."""
+        self._reference = small
+        self._streak = 0
+    
+    def reset(self) -> None:
+        """Descarta a referência; o próximo frame é sempre aceito."""
+        self._reference = None
+        self._streak = 0
+    
+    def __repr__(self) -> str:
+        """Representação em string do MotionGate."""
+        return (
+            f"MotionGate(threshold={self.threshold}, frames={self.frames}, "
+            f"gated={self.gated})"
+        )
@@ -0,0 +1,262 @@
+"""
+Renderer Module
+
+Renderiza o vídeo anotado a partir de uma trilha de anotações salva pela
+inferência, relendo o vídeo de origem. Mudar o estilo das anotações ou
+reexportar o vídeo não exige executar os modelos novamente.
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.io.annotation_track import AnnotationTrack
+from src.io.video_reader import VideoReader
+from src.io.writer import VideoWriter
+from src.utils.boxes import scale_boxes
+from src.utils.viz import draw_annotations
+
+
+def fit_max_side(frame_size: Tuple[int, int], max_side: Optional[int]) -> Tuple[int, int]:
+    """
+    Limita as dimensões (width, height) a um lado maior máximo.
+    
+    Args:
+        frame_size: Dimensões originais (width, height)
+        max_side: Lado maior máximo (None = sem limite)
+    
+    Returns:
+        Dimensões reduzidas (pares, exigidas por H.264/yuv420p) ou as
+        originais se já couberem
+    """
+    width, height = frame_size
+    
+    if max_side is None or max(width, height) <= max_side:
+        return (width, height)
+    
+    scale = max_side / max(width, height)
+    return (
+        max(2, int(width * scale) // 2 * 2),
+        max(2, int(height * scale) // 2 * 2)
+    )
+
+
+class AnnotationRenderer:
+    """
+    Desenha uma AnnotationTrack sobre o vídeo de origem.
+    
+    O intervalo anotado é dividido em segmentos contíguos renderizados em
+    paralelo (decode, desenho e encode do OpenCV liberam o GIL), cada um
+    com o próprio VideoReader e VideoWriter. Os segmentos são unidos sem
+    recodificação pelo demuxer concat do ffmpeg; sem ffmpeg no PATH a
+    renderização usa um único segmento.
+    
+    Cada frame recebe as anotações do último frame analisado em ou antes
+    dele. Se o vídeo for decodificado em outra resolução que a da trilha,
+    as boxes são reescaladas.
+    
+    Example:
+        >>> track = AnnotationTrack.load("outputs/annotations.npz")
+        >>> renderer = AnnotationRenderer(track)
+        >>> renderer.render("outputs/rendered.mp4", workers=4, max_side=1280)
+    """
+    
+    def __init__(
+        self,
+        track: AnnotationTrack,
+        video_path: Optional[str] = None,
+        reader_backend: str = "opencv"
+    ) -> None:
+        """
+        Inicializa o renderer.
+        
+        Args:
+            track: Trilha de anotações
+            video_path: Vídeo de origem (padrão: track.video_path)
+            reader_backend: Backend do VideoReader ('opencv' ou 'ffmpeg')
+        
+        Raises:
+            ValueError: Se a trilha estiver vazia
+        """
+        if len(track) == 0:
+            raise ValueError("Annotation track is empty")
+        
+        self.track = track
+        self.video_path = video_path or track.video_path
+        self.reader_backend = reader_backend
+    
+    def _segments(self, workers: int, stride: int) -> List[Tuple[int, int]]:
+        """Divide o intervalo anotado em até `workers` janelas [start, end)."""
+        indices = self.track.frame_indices
+        first, last = int(indices[0]), int(indices[-1])
+        
+        sampled = (last - first) // stride + 1
+        per_segment = -(-sampled // workers)
+        
+        segments = []
+        for start_step in range(0, sampled, per_segment):
+            start = first + start_step * stride
+            end = min(first + (start_step + per_segment) * stride, last + 1)
+            segments.append((start, end))
+        return segments
+    
+    def _render_segment(
+        self,
+        start: int,
+        end: int,
+        path: str,
+        stride: int,
+        max_side: Optional[int],
+        writer_kwargs: Dict[str, Any]
+    ) -> int:
+        """Renderiza os frames [start, end) em `path`; retorna os frames escritos."""
+        track = self.track
+        indices = track.frame_indices
+        frames = 0
+        
+        with VideoReader(
+            self.video_path,
+            stride=stride,
+            start_frame=start,
+            end_frame=end,
+            backend=self.reader_backend
+        ) as reader:
+            frame_size = reader.frame_size()
+            output_size = fit_max_side(frame_size, max_side)
+            box_scale = frame_size[0] / track.frame_size[0]
+            
+            with VideoWriter(
+                path,
+                fps=track.fps / stride,
+                frame_size=output_size,
+                **writer_kwargs
+            ) as writer:
+                for idx, frame, timestamp in reader:
+                    position = int(np.searchsorted(indices, idx, side='right')) - 1
+                    if position >= 0:
+                        record = track.frame(position)
+                        boxes = record['boxes']
+                        if box_scale != 1.0:
+                            boxes = [tuple(box) for box in scale_boxes(boxes, box_scale).tolist()]
+                        
+                        frame = draw_annotations(
+                            frame,
+                            idx,
+                            timestamp,
+                            boxes=boxes,
+                            emotions=record['emotions'],
+                            fps=track.fps,
+                            activity=record['activity'],
+                            anomalies_count=record['anomalies_count'],
+                            inplace=True,
+                            track_ids=record['track_ids']
+                        )
+                    
+                    writer.write(frame)
+                    frames += 1
+        
+        return frames
+    
+    def render(
+        self,
+        output_path: str,
+        workers: int = 1,
+        max_side: Optional[int] = None,
+        fps: Optional[float] = None,
+        **writer_kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        Renderiza o vídeo anotado.
+        
+        Args:
+            output_path: Caminho do vídeo de saída
+            workers: Segmentos renderizados em paralelo
+            max_side: Lado maior máximo do vídeo de saída
+            fps: FPS máximo do vídeo de saída (padrão: o da análise)
+            **writer_kwargs: Opções do VideoWriter (codec, backend, crf, ...)
+        
+        Returns:
+            Dicionário com output_path, frames e segments
+        
+        Raises:
+            ValueError: Se workers ou fps forem inválidos
+            RuntimeError: Se a concatenação dos segmentos falhar
+        """
+        if workers < 1:
+            raise ValueError(f"workers must be >= 1, got {workers}")
+        
+        if fps is not None and fps <= 0:
+            raise ValueError(f"fps must be > 0, got {fps}")
+        
+        stride = self.track.stride
+        if fps is not None:
+            stride *= max(1, int(round(self.track.fps / self.track.stride / fps)))
+        
+        if workers > 1 and shutil.which("ffmpeg") is None:
+            print("⚠️  ffmpeg não encontrado: renderizando em um único segmento")
+            workers = 1
+        
+        segments = self._segments(workers, stride)
+        
+        if len(segments) == 1:
+            start, end = segments[0]
+            frames = self._render_segment(start, end, output_path, stride, max_side, writer_kwargs)
+            return {'output_path': output_path, 'frames': frames, 'segments': 1}
+        
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        os.makedirs(output_dir, exist_ok=True)
+        temp_dir = tempfile.mkdtemp(prefix=".render-", dir=output_dir)
+        extension = os.path.splitext(output_path)[1] or ".mp4"
+        
+        try:
+            paths = [
+                os.path.join(temp_dir, f"segment_{i:04d}{extension}")
+                for i in range(len(segments))
+            ]
+            
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        self._render_segment, start, end, path, stride, max_side, writer_kwargs
+                    )
+                    for (start, end), path in zip(segments, paths)
+                ]
+                frames = sum(future.result() for future in futures)
+            
+            self._concat(paths, output_path, temp_dir)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        
+        return {'output_path': output_path, 'frames': frames, 'segments': len(segments)}
+    
+    @staticmethod
+    def _concat(paths: List[str], output_path: str, temp_dir: str) -> None:
+        """Une os segmentos sem recodificar (demuxer concat do ffmpeg)."""
+        list_path = os.path.join(temp_dir, "segments.txt")
+        with open(list_path, 'w') as f:
+            for path in paths:
+                f.write(f"file '{path}'\n")
+        
+        cmd = [
+            'ffmpeg', '-nostdin', '-hide_banner', '-loglevel', 'error', '-y',
+            '-f', 'concat', '-safe', '0', '-i', list_path, '-c', 'copy'
+        ]
+        if os.path.splitext(output_path)[1].lower() in ('.mp4', '.mov'):
+            cmd += ['-movflags', '+faststart']
+        cmd.append(output_path)
+        
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"Failed to concatenate segments into {output_path}: "
+                f"{result.stderr.decode(errors='replace').strip()}"
+            )
+    
+    def __repr__(self) -> str:
+        """Representação em string do AnnotationRenderer."""
+        return f"AnnotationRenderer(video='{self.video_path}', frames={len(self.track)})"
@@ -6,9 +6,7 @@ Agrega resultados do processamento de vídeo e gera resumos estruturados.
 
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional
-from collections import Counter, defaultdict
-
-import numpy as np
+from collections import Counter, defaultdict, deque
 
 
 @dataclass
@@ -26,6 +24,9 @@ class VideoSummary:
         emotions_distribution: Distribuição de emoções detectadas
         activities_timeline: Timeline de atividades detectadas
         anomalies_by_severity: Anomalias agrupadas por severidade
+        clips: Índice dos clipes de eventos gravados (modo de clipes)
+        frames_gated: Frames analisados sem mudança visual, cujos resultados
+                      foram reaproveitados do frame anterior
     """
     video_path: str
     frames_total: int
@@ -36,6 +37,8 @@ class VideoSummary:
     emotions_distribution: Dict[str, int]
     activities_timeline: List[Dict]
     anomalies_by_severity: Dict[str, int]
+    clips: List[Dict] = field(default_factory=list)
+    frames_gated: int = 0
     
     def to_dict(self) -> dict:
         """Converte para dicionário."""
@@ -48,7 +51,9 @@ class VideoSummary:
             'faces_stats': self.faces_stats,
             'emotions_distribution': self.emotions_distribution,
             'activities_timeline': self.activities_timeline,
-            'anomalies_by_severity': self.anomalies_by_severity
+            'anomalies_by_severity': self.anomalies_by_severity,
+            'clips': self.clips,
+            'frames_gated': self.frames_gated
         }
 
 
@@ -59,6 +64,11 @@ class Summarizer:
     Coleta dados de faces, emoções, atividades e anomalias e gera
     estatísticas agregadas e resumos estruturados.
     
+    Faces e emoções são agregadas de forma incremental (memória constante
+    por frame). Com `max_events`, apenas os eventos mais recentes de
+    atividades e anomalias são guardados; totais e contagens continuam
+    cobrindo o vídeo inteiro, o que mantém a memória limitada em streams.
+    
     Example:
         >>> summarizer = Summarizer("video.mp4")
         >>> summarizer.add_frame_data(frame_idx=0, faces=[...], emotions=[...])
@@ -67,27 +77,38 @@ class Summarizer:
         >>> summary = summarizer.generate_summary(fps=30.0, total_frames=300)
     """
     
-    def __init__(self, video_path: str):
+    def __init__(self, video_path: str, max_events: Optional[int] = None):
         """
         Inicializa o Summarizer.
         
         Args:
             video_path: Caminho do vídeo sendo processado
+            max_events: Máximo de eventos de atividade e de anomalia
+                        guardados (None = todos)
         """
         self.video_path = video_path
+        self.max_events = max_events
         
         # Dados agregados
         self.frames_processed = 0
-        self.faces_per_frame: List[int] = []
-        self.emotions_list: List[str] = []
-        self.activities_list: List[Dict] = []
-        self.anomalies_list: List[Dict] = []
+        self.faces_total = 0
+        self.max_faces_in_frame = 0
+        self.frames_with_faces = 0
+        self.emotions_counter: Counter = Counter()
+        self.activities_list: deque = deque(maxlen=max_events)
+        self.anomalies_list: deque = deque(maxlen=max_events)
+        self.activity_counts: Counter = Counter()
+        self.anomalies_total = 0
+        self.anomalies_severity: Counter = Counter()
+        self.clips_list: List[Dict] = []
+        self.frames_gated = 0
     
     def add_frame_data(
         self,
         frame_idx: int,
         faces: List,
-        emotions: List
+        emotions: List,
+        gated: bool = False
     ) -> None:
         """
         Adiciona dados de um frame processado.
@@ -96,16 +117,23 @@ class Summarizer:
             frame_idx: Índice do frame
             faces: Lista de faces detectadas no frame
             emotions: Lista de emoções classificadas no frame
+            gated: Se os resultados foram reaproveitados do frame anterior
+                   (frame sem mudança visual)
         """
         self.frames_processed += 1
-        self.faces_per_frame.append(len(faces))
+        if gated:
+            self.frames_gated += 1
+        self.faces_total += len(faces)
+        self.max_faces_in_frame = max(self.max_faces_in_frame, len(faces))
+        if faces:
+            self.frames_with_faces += 1
         
         # Adicionar emoções
         for emotion in emotions:
             if hasattr(emotion, 'label'):
-                self.emotions_list.append(emotion.label)
+                self.emotions_counter[emotion.label] += 1
             elif isinstance(emotion, dict) and 'label' in emotion:
-                self.emotions_list.append(emotion['label'])
+                self.emotions_counter[emotion['label']] += 1
     
     def add_activities(self, activities: List[Dict]) -> None:
         """
@@ -115,6 +143,9 @@ class Summarizer:
             activities: Lista de eventos de atividade
         """
         self.activities_list.extend(activities)
+        self.activity_counts.update(
+            activity.get('label', 'unknown') for activity in activities
+        )
     
     def add_anomalies(self, anomalies: List) -> None:
         """
@@ -125,9 +156,23 @@ class Summarizer:
         """
         for anomaly in anomalies:
             if hasattr(anomaly, 'to_dict'):
-                self.anomalies_list.append(anomaly.to_dict())
-            elif isinstance(anomaly, dict):
-                self.anomalies_list.append(anomaly)
+                anomaly = anomaly.to_dict()
+            elif not isinstance(anomaly, dict):
+                continue
+            
+            self.anomalies_list.append(anomaly)
+            self.anomalies_total += 1
+            self.anomalies_severity[anomaly.get('severity', 'medium')] += 1
+    
+    def add_clips(self, clips: List[Dict]) -> None:
+        """
+        Adiciona clipes de eventos gravados.
+        
+        Args:
+            clips: Lista de clipes (path, start/end_frame, start/end_sec,
+                   frames, events)
+        """
+        self.clips_list.extend(clips)
     
     def generate_summary(
         self,
@@ -140,7 +185,7 @@ class Summarizer:
         Args:
             fps: Taxa de frames por segundo do vídeo
             total_frames: Total de frames no vídeo
-            
+        
         Returns:
             Objeto VideoSummary com estatísticas agregadas
         """
@@ -163,16 +208,18 @@ class Summarizer:
             frames_total=total_frames,
             duration_seconds=duration_seconds,
             fps=fps,
-            anomalies_total=len(self.anomalies_list),
+            anomalies_total=self.anomalies_total,
             faces_stats=faces_stats,
             emotions_distribution=emotions_distribution,
             activities_timeline=activities_timeline,
-            anomalies_by_severity=anomalies_by_severity
+            anomalies_by_severity=anomalies_by_severity,
+            clips=list(self.clips_list),
+            frames_gated=self.frames_gated
         )
     
     def _compute_faces_stats(self) -> Dict:
         """Calcula estatísticas de detecção de faces."""
-        if not self.faces_per_frame:
+        if not self.frames_processed:
             return {
                 'total_detections': 0,
                 'avg_faces_per_frame': 0.0,
@@ -181,43 +228,29 @@ class Summarizer:
                 'frames_without_faces': 0
             }
         
-        total_detections = sum(self.faces_per_frame)
-        avg_faces = np.mean(self.faces_per_frame)
-        max_faces = max(self.faces_per_frame)
-        frames_with_faces = sum(1 for count in self.faces_per_frame if count > 0)
-        frames_without_faces = sum(1 for count in self.faces_per_frame if count == 0)
-        
         return {
-            'total_detections': total_detections,
-            'avg_faces_per_frame': float(avg_faces),
-            'max_faces_in_frame': max_faces,
-            'frames_with_faces': frames_with_faces,
-            'frames_without_faces': frames_without_faces
+            'total_detections': self.faces_total,
+            'avg_faces_per_frame': self.faces_total / self.frames_processed,
+            'max_faces_in_frame': self.max_faces_in_frame,
+            'frames_with_faces': self.frames_with_faces,
+            'frames_without_faces': self.frames_processed - self.frames_with_faces
         }
     
     def _compute_emotions_distribution(self) -> Dict[str, int]:
         """Calcula distribuição de emoções detectadas."""
-        if not self.emotions_list:
-            return {}
-        
-        return dict(Counter(self.emotions_list))
+        return dict(self.emotions_counter)
     
     def _process_activities_timeline(self) -> List[Dict]:
         """Processa e organiza timeline de atividades."""
         # Atividades já estão em formato de dicionário
-        return self.activities_list.copy()
+        return list(self.activities_list)
     
     def _compute_anomalies_by_severity(self) -> Dict[str, int]:
         """Agrupa anomalias por severidade."""
-        severity_counter = Counter(
-            anomaly.get('severity', 'medium') 
-            for anomaly in self.anomalies_list
-        )
-        
         return {
-            'low': severity_counter.get('low', 0),
-            'medium': severity_counter.get('medium', 0),
-            'high': severity_counter.get('high', 0)
+            'low': self.anomalies_severity.get('low', 0),
+            'medium': self.anomalies_severity.get('medium', 0),
+            'high': self.anomalies_severity.get('high', 0)
         }
     
     def get_metrics_dict(self, fps: float, total_frames: int) -> Dict:
@@ -227,7 +260,7 @@ class Summarizer:
         Args:
             fps: Taxa de frames por segundo
             total_frames: Total de frames
-            
+        
         Returns:
             Dicionário com métricas principais
         """
@@ -240,15 +273,11 @@ class Summarizer:
         
         Args:
             n: Número de emoções a retornar
-            
+        
         Returns:
             Lista de tuplas (emoção, contagem)
         """
-        if not self.emotions_list:
-            return []
-        
-        counter = Counter(self.emotions_list)
-        return counter.most_common(n)
+        return self.emotions_counter.most_common(n)
     
     def get_activity_summary(self) -> Dict[str, int]:
         """
@@ -257,24 +286,27 @@ class Summarizer:
         Returns:
             Dicionário com contagem de cada tipo de atividade
         """
-        activity_counts = Counter(
-            activity.get('label', 'unknown')
-            for activity in self.activities_list
-        )
-        return dict(activity_counts)
+        return dict(self.activity_counts)
     
     def reset(self):
         """Reseta o summarizer, limpando todos os dados."""
         self.frames_processed = 0
-        self.faces_per_frame.clear()
-        self.emotions_list.clear()
+        self.faces_total = 0
+        self.max_faces_in_frame = 0
+        self.frames_with_faces = 0
+        self.emotions_counter.clear()
         self.activities_list.clear()
         self.anomalies_list.clear()
+        self.activity_counts.clear()
+        self.anomalies_total = 0
+        self.anomalies_severity.clear()
+        self.clips_list.clear()
+        self.frames_gated = 0
     
     def __repr__(self) -> str:
         """Representação em string do Summarizer."""
         return (
             f"Summarizer(video='{self.video_path}', "
             f"frames_processed={self.frames_processed}, "
-            f"anomalies={len(self.anomalies_list)})"
+            f"anomalies={self.anomalies_total})"
         )
@@ -0,0 +1,151 @@
+"""
+Render Script - Tech Challenge Fase 4
+
+Renderiza o vídeo anotado a partir de uma trilha de anotações salva por
+`python -m src.main --annotations`, sem executar os modelos novamente.
+"""
+
+import argparse
+import os
+import sys
+
+from src.io.annotation_track import AnnotationTrack, AnnotationTrackError
+from src.pipeline.renderer import AnnotationRenderer
+
+
+def parse_args():
+    """Parse argumentos da linha de comando."""
+    parser = argparse.ArgumentParser(
+        description="Renderização de anotações - Tech Challenge Fase 4",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos de uso:
+  # Inferência salvando apenas a trilha de anotações
+  python -m src.main --video input.mp4 --annotations
+  
+  # Renderizar depois, em 4 segmentos paralelos, 720p H.264
+  python -m src.render --annotations outputs/annotations.npz --output rendered.mp4 \\
+      --workers 4 --max-side 1280 --writer-backend ffmpeg
+        """
+    )
+    
+    parser.add_argument(
+        '--annotations',
+        type=str,
+        required=True,
+        help='Trilha de anotações (.npz) salva pela inferência'
+    )
+    
+    parser.add_argument(
+        '--video',
+        type=str,
+        default=None,
+        help='Vídeo de origem (default: o registrado na trilha)'
+    )
+    
+    parser.add_argument(
+        '--output',
+        type=str,
+        default='outputs/rendered_video.mp4',
+        help='Caminho do vídeo renderizado (default: outputs/rendered_video.mp4)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Segmentos renderizados em paralelo; > 1 requer ffmpeg no PATH '
+             '(default: número de CPUs)'
+    )
+    
+    parser.add_argument(
+        '--max-side',
+        type=int,
+        default=None,
+        help='Lado maior máximo do vídeo renderizado (default: resolução original)'
+    )
+    
+    parser.add_argument(
+        '--fps',
+        type=float,
+        default=None,
+        help='FPS máximo do vídeo renderizado (default: FPS da análise)'
+    )
+    
+    parser.add_argument(
+        '--reader-backend',
+        type=str,
+        default='opencv',
+        choices=['opencv', 'ffmpeg'],
+        help='Backend de decodificação (default: opencv)'
+    )
+    
+    parser.add_argument(
+        '--writer-backend',
+        type=str,
+        default='opencv',
+        choices=['opencv', 'ffmpeg'],
+        help='Backend de encode (default: opencv)'
+    )
+    
+    parser.add_argument(
+        '--crf',
+        type=int,
+        default=None,
+        help='Qualidade do encode ffmpeg; menor = melhor e maior (default: 23)'
+    )
+    
+    parser.add_argument(
+        '--preset',
+        type=str,
+        default=None,
+        help='Preset de velocidade do encode ffmpeg (default: veryfast)'
+    )
+    
+    return parser.parse_args()
+
+
+def main():
+    """Função principal."""
+    args = parse_args()
+    
+    try:
+        track = AnnotationTrack.load(args.annotations)
+    except (OSError, AnnotationTrackError) as e:
+        print(f"❌ Erro ao carregar anotações: {e}")
+        sys.exit(1)
+    
+    video_path = args.video or track.video_path
+    if not os.path.isfile(video_path):
+        print(f"❌ Erro: Vídeo não encontrado: {video_path}")
+        sys.exit(1)
+    
+    print(f"🎨 Renderizando {len(track)} frames anotados de: {video_path}")
+    
+    try:
+        renderer = AnnotationRenderer(
+            track, video_path=video_path, reader_backend=args.reader_backend
+        )
+        result = renderer.render(
+            args.output,
+            workers=args.workers,
+            max_side=args.max_side,
+            fps=args.fps,
+            backend=args.writer_backend,
+            crf=args.crf,
+            preset=args.preset
+        )
+    except Exception as e:
+        print(f"❌ Erro durante renderização: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    
+    print(
+        f"✅ Vídeo renderizado em: {result['output_path']} "
+        f"({result['frames']} frames, {result['segments']} segmentos)"
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+Box Utilities
+
+Operações vetorizadas sobre bounding boxes no formato (x, y, width, height),
+agrupadas em arrays N×4: IoU, supressão de não-máximos, escala e recorte
+aos limites do frame.
+"""
+
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+
+BoxArray = Union[np.ndarray, Sequence[Tuple[float, float, float, float]]]
+
+
+def as_boxes(boxes: BoxArray) -> np.ndarray:
+    """
+    Converte boxes para um array N×4 de float64.
+    
+    Args:
+        boxes: Array ou sequência de boxes (x, y, width, height)
+    
+    Returns:
+        Array N×4 (0×4 se não houver boxes)
+    """
+    return np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+
+
+def iou_matrix(a: BoxArray, b: BoxArray) -> np.ndarray:
+    """
+    Calcula a interseção sobre união (IoU) entre todos os pares de boxes.
+    
+    Args:
+        a: N boxes (x, y, width, height)
+        b: M boxes (x, y, width, height)
+    
+    Returns:
+        Matriz N×M com o IoU de cada par
+    """
+    a, b = as_boxes(a), as_boxes(b)
+    
+    ax0, ay0 = a[:, 0:1], a[:, 1:2]
+    ax1, ay1 = ax0 + a[:, 2:3], ay0 + a[:, 3:4]
+    bx0, by0 = b[:, 0], b[:, 1]
+    bx1, by1 = bx0 + b[:, 2], by0 + b[:, 3]
+    
+    inter_w = np.clip(np.minimum(ax1, bx1) - np.maximum(ax0, bx0), 0, None)
+    inter_h = np.clip(np.minimum(ay1, by1) - np.maximum(ay0, by0), 0, None)
+    inter = inter_w * inter_h
+    
+    union = (a[:, 2] * a[:, 3])[:, None] + b[:, 2] * b[:, 3] - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+
+def nms(boxes: BoxArray, scores: Sequence[float], iou_threshold: float = 0.3) -> np.ndarray:
+    """
+    Supressão de não-máximos (NMS) gulosa.
+    
+    Percorre as boxes do maior para o menor score e descarta as que se
+    sobrepõem (IoU > iou_threshold) a uma box já mantida. Em caso de
+    empate, a ordem de entrada é preservada.
+    
+    Args:
+        boxes: N boxes (x, y, width, height)
+        scores: N scores
+        iou_threshold: Sobreposição máxima entre boxes mantidas
+    
+    Returns:
+        Índices das boxes mantidas, em ordem decrescente de score
+    
+    Raises:
+        ValueError: Se boxes e scores tiverem tamanhos diferentes
+    """
+    boxes = as_boxes(boxes)
+    scores = np.asarray(scores, dtype=np.float64).reshape(-1)
+    if len(boxes) != len(scores):
+        raise ValueError(f"Got {len(boxes)} boxes and {len(scores)} scores")
+    
+    order = np.argsort(-scores, kind='stable')
+    keep = []
+    while order.size:
+        best = order[0]
+        keep.append(best)
+        overlap = iou_matrix(boxes[best:best + 1], boxes[order[1:]])[0]
+        order = order[1:][overlap <= iou_threshold]
+    
+    return np.asarray(keep, dtype=np.int64)
+
+
+def scale_boxes(boxes: BoxArray, factor: float) -> np.ndarray:
+    """
+    Multiplica as coordenadas das boxes por `factor`.
+    
+    Args:
+        boxes: N boxes (x, y, width, height)
+        factor: Fator multiplicativo (ex: 1 / escala da análise)
+    
+    Returns:
+        Array N×4 int32, arredondado para pixels inteiros
+    """
+    return np.rint(as_boxes(boxes) * factor).astype(np.int32)
+
+
+def clip_boxes(boxes: BoxArray, frame_size: Tuple[int, int]) -> np.ndarray:
+    """
+    Limita as boxes às dimensões do frame.
+    
+    A origem é mantida dentro do frame e largura/altura são reduzidas para
+    não ultrapassar a borda, com no mínimo 1 pixel (recortes nunca vazios).
+    
+    Args:
+        boxes: N boxes (x, y, width, height)
+        frame_size: Dimensões (width, height) do frame
+    
+    Returns:
+        Array N×4 int32
+    """
+    boxes = np.rint(as_boxes(boxes)).astype(np.int32)
+    frame_w, frame_h = frame_size
+    
+    x = np.clip(boxes[:, 0], 0, frame_w - 1)
+    y = np.clip(boxes[:, 1], 0, frame_h - 1)
+    w = np.clip(boxes[:, 2], 1, frame_w - x)
+    h = np.clip(boxes[:, 3], 1, frame_h - y)
+    return np.stack([x, y, w, h], axis=1)
@@ -0,0 +1,204 @@
+"""
+Frame Context
+
+Implementa a classe FrameContext, um cache das imagens derivadas de um
+frame (cinza, RGB e versões redimensionadas), calculadas sob demanda uma
+única vez por frame e compartilhadas entre os estágios do pipeline.
+"""
+
+from typing import Dict, Hashable, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class FrameContext:
+    """
+    Imagens derivadas de um frame, calculadas sob demanda e memorizadas.
+    
+    O primeiro estágio que pede uma conversão (ex: cinza para a cascata
+    Haar, RGB para o face_recognition e o MediaPipe) paga por ela; os
+    seguintes recebem o mesmo array. Ao passar para o próximo frame com
+    reset(), os resultados são descartados mas os buffers ficam: as
+    conversões seguintes escrevem neles (dst=) sem alocar memória, enquanto
+    as dimensões não mudarem.
+    
+    Os arrays devolvidos pertencem ao contexto e são sobrescritos no
+    próximo frame: quem precisa guardá-los além do frame atual deve
+    copiá-los. Um contexto deve ser usado por uma thread de cada vez.
+    
+    Attributes:
+        frame (np.ndarray): Frame atual (BGR ou grayscale)
+        conversions (int): Conversões calculadas desde a criação
+        hits (int): Pedidos atendidos pelo cache
+    
+    Example:
+        >>> context = FrameContext()
+        >>> for frame in frames:
+        ...     context.reset(frame)
+        ...     gray = context.gray()   # converte
+        ...     gray = context.gray()   # mesmo array, sem converter
+        ...     small = context.resized((320, 180), source='gray')
+    """
+    
+    # Fontes aceitas por resized()
+    SOURCES = ('bgr', 'gray', 'rgb')
+    
+    def __init__(self, frame: Optional[np.ndarray] = None) -> None:
+        """
+        Inicializa o contexto.
+        
+        Args:
+            frame: Frame inicial (opcional; ver reset())
+        """
+        self.frame: Optional[np.ndarray] = None
+        self.conversions = 0
+        self.hits = 0
+        
+        self._cache: Dict[Hashable, np.ndarray] = {}
+        self._buffers: Dict[Hashable, np.ndarray] = {}
+        
+        if frame is not None:
+            self.reset(frame)
+    
+    def reset(self, frame: np.ndarray) -> "FrameContext":
+        """
+        Passa para um novo frame, descartando as imagens do anterior.
+        
+        Args:
+            frame: Frame BGR ou grayscale
+        
+        Returns:
+            O próprio contexto
+        
+        Raises:
+            ValueError: Se o frame for inválido
+        """
+        if frame is None or frame.size == 0:
+            raise ValueError("Invalid frame: empty or None")
+        
+        if frame.ndim not in (2, 3):
+            raise ValueError(f"Invalid frame dimensions: {frame.ndim}")
+        
+        self.frame = frame
+        self._cache.clear()
+        return self
+    
+    def _buffer(self, key: Hashable, shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+        """Buffer reaproveitado para `key` (realocado se o formato mudou)."""
+        buffer = self._buffers.get(key)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffers[key] = buffer
+        return buffer
+    
+    def _current(self) -> np.ndarray:
+        """Frame atual (erro se o contexto ainda não tem frame)."""
+        if self.frame is None:
+            raise RuntimeError("FrameContext has no frame; call reset() first")
+        return self.frame
+    
+    def gray(self) -> np.ndarray:
+        """
+        Versão em escala de cinza do frame.
+        
+        Returns:
+            Array 2D uint8 (o próprio frame, se ele já é grayscale)
+        """
+        frame = self._current()
+        if frame.ndim == 2:
+            return frame
+        
+        gray = self._cache.get('gray')
+        if gray is not None:
+            self.hits += 1
+            return gray
+        
+        dst = self._buffer('gray', frame.shape[:2], frame.dtype)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=dst)
+        self.conversions += 1
+        self._cache['gray'] = gray
+        return gray
+    
+    def rgb(self) -> np.ndarray:
+        """
+        Versão RGB do frame (face_recognition, MediaPipe).
+        
+        Returns:
+            Array HxWx3 uint8
+        """
+        frame = self._current()
+        rgb = self._cache.get('rgb')
+        if rgb is not None:
+            self.hits += 1
+            return rgb
+        
+        code = cv2.COLOR_GRAY2RGB if frame.ndim == 2 else cv2.COLOR_BGR2RGB
+        dst = self._buffer('rgb', frame.shape[:2] + (3,), frame.dtype)
+        rgb = cv2.cvtColor(frame, code, dst=dst)
+        self.conversions += 1
+        self._cache['rgb'] = rgb
+        return rgb
+    
+    def source(self, name: str) -> np.ndarray:
+        """
+        Frame na representação `name` ('bgr' = o próprio frame, 'gray', 'rgb').
+        
+        Raises:
+            ValueError: Se a representação for desconhecida
+        """
+        if name == 'bgr':
+            return self._current()
+        if name == 'gray':
+            return self.gray()
+        if name == 'rgb':
+            return self.rgb()
+        raise ValueError(f"source must be one of {self.SOURCES}, got {name!r}")
+    
+    def resized(
+        self,
+        size: Tuple[int, int],
+        source: str = 'bgr',
+        interpolation: int = cv2.INTER_AREA
+    ) -> np.ndarray:
+        """
+        Versão redimensionada do frame (ou de uma conversão dele).
+        
+        Args:
+            size: Dimensões (width, height) de destino
+            source: Representação de origem ('bgr', 'gray' ou 'rgb')
+            interpolation: Interpolação do cv2.resize
+        
+        Returns:
+            Imagem redimensionada (a própria origem, se já tem o tamanho)
+        
+        Raises:
+            ValueError: Se size ou source forem inválidos
+        """
+        width, height = size
+        if width < 1 or height < 1:
+            raise ValueError(f"size must be positive, got {size}")
+        
+        image = self.source(source)
+        if image.shape[1] == width and image.shape[0] == height:
+            return image
+        
+        key = ('resized', source, width, height, interpolation)
+        resized = self._cache.get(key)
+        if resized is not None:
+            self.hits += 1
+            return resized
+        
+        dst = self._buffer(key, (height, width) + image.shape[2:], image.dtype)
+        resized = cv2.resize(image, (width, height), dst=dst, interpolation=interpolation)
+        self.conversions += 1
+        self._cache[key] = resized
+        return resized
+    
+    def __repr__(self) -> str:
+        """Representação em string do FrameContext."""
+        shape = None if self.frame is None else self.frame.shape
+        return (
+            f"FrameContext(frame={shape}, conversions={self.conversions}, "
+            f"hits={self.hits})"
+        )
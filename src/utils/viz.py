@@ -5,7 +5,7 @@ Funções para desenhar anotações em frames de vídeo, incluindo bounding boxe
 labels e HUD (heads-up display) com informações.
 """
 
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Sequence, Tuple
 
 import cv2
 import numpy as np
@@ -26,6 +26,43 @@ COLORS = {
     'purple': (128, 0, 128),
 }
 
+# Cor das boxes por emoção
+EMOTION_COLORS = {
+    'happy': COLORS['green'],
+    'sad': COLORS['blue'],
+    'angry': COLORS['red'],
+    'fear': COLORS['purple'],
+    'surprise': COLORS['yellow'],
+    'disgust': COLORS['orange'],
+    'neutral': COLORS['gray']
+}
+
+
+def _blend_rect(
+    image: np.ndarray,
+    top_left: Tuple[int, int],
+    bottom_right: Tuple[int, int],
+    color: Tuple[int, int, int],
+    alpha: float
+) -> None:
+    """
+    Preenche um retângulo com `color` e transparência `alpha`, in-place.
+    
+    Equivalente a desenhar o retângulo em uma cópia do frame e combinar com
+    cv2.addWeighted, mas opera apenas na região do retângulo.
+    """
+    height, width = image.shape[:2]
+    x0, y0 = max(0, top_left[0]), max(0, top_left[1])
+    x1, y1 = min(width, bottom_right[0] + 1), min(height, bottom_right[1] + 1)
+    
+    if x0 >= x1 or y0 >= y1:
+        return
+    
+    roi = image[y0:y1, x0:x1]
+    fill = np.empty_like(roi)
+    fill[:] = color if roi.ndim == 3 else color[0]
+    cv2.addWeighted(fill, alpha, roi, 1 - alpha, 0, roi)
+
 
 def draw_box_and_label(
     frame: np.ndarray,
@@ -35,7 +72,8 @@ def draw_box_and_label(
     thickness: int = 2,
     font_scale: float = 0.6,
     font_thickness: int = 2,
-    background_alpha: float = 0.7
+    background_alpha: float = 0.7,
+    inplace: bool = False
 ) -> np.ndarray:
     """
     Desenha uma bounding box e label em um frame.
@@ -49,10 +87,11 @@ def draw_box_and_label(
         font_scale: Escala da fonte do texto
         font_thickness: Espessura da fonte
         background_alpha: Transparência do fundo do label (0.0 a 1.0)
-        
+        inplace: Se True, desenha diretamente em `frame` sem copiá-lo
+    
     Returns:
         Frame com a box e label desenhados
-        
+    
     Example:
         >>> frame = np.zeros((480, 640, 3), dtype=np.uint8)
         >>> box = (100, 100, 200, 150)
@@ -65,7 +104,7 @@ def draw_box_and_label(
         raise ValueError("Box must have 4 values: (x, y, width, height)")
     
     # Fazer cópia para não modificar o original
-    output = frame.copy()
+    output = frame if inplace else frame.copy()
     
     x, y, w, h = box
     
@@ -101,18 +140,8 @@ def draw_box_and_label(
         bg_top_left = (label_x - padding, label_y - text_height - padding)
         bg_bottom_right = (label_x + text_width + padding, label_y + baseline + padding)
         
-        # Criar overlay para transparência
-        overlay = output.copy()
-        cv2.rectangle(
-            overlay,
-            bg_top_left,
-            bg_bottom_right,
-            color,
-            -1  # Preenchido
-        )
-        
-        # Aplicar transparência
-        cv2.addWeighted(overlay, background_alpha, output, 1 - background_alpha, 0, output)
+        # Fundo com transparência (apenas na região do label)
+        _blend_rect(output, bg_top_left, bg_bottom_right, color, background_alpha)
         
         # Desenhar texto
         cv2.putText(
@@ -139,7 +168,8 @@ def put_hud(
     background_color: Tuple[int, int, int] = (0, 0, 0),
     text_color: Tuple[int, int, int] = COLORS['white'],
     background_alpha: float = 0.6,
-    padding: int = 10
+    padding: int = 10,
+    inplace: bool = False
 ) -> np.ndarray:
     """
     Desenha um HUD (heads-up display) com estatísticas no frame.
@@ -156,10 +186,11 @@ def put_hud(
         text_color: Cor do texto
         background_alpha: Transparência do fundo (0.0 a 1.0)
         padding: Padding interno do HUD
-        
+        inplace: Se True, desenha diretamente em `frame` sem copiá-lo
+    
     Returns:
         Frame com o HUD desenhado
-        
+    
     Example:
         >>> frame = np.zeros((480, 640, 3), dtype=np.uint8)
         >>> stats = {'FPS': 30.0, 'Frame': 120, 'Faces': 2, 'Timestamp': '00:04'}
@@ -172,7 +203,7 @@ def put_hud(
         return frame
     
     # Fazer cópia para não modificar o original
-    output = frame.copy()
+    output = frame if inplace else frame.copy()
     
     # Preparar linhas de texto
     lines = []
@@ -229,18 +260,14 @@ def put_hud(
     y_start = max(0, min(y_start, frame_height - hud_height))
     
     # Desenhar fundo do HUD com transparência
-    overlay = output.copy()
-    cv2.rectangle(
-        overlay,
+    _blend_rect(
+        output,
         (x_start, y_start),
         (x_start + hud_width, y_start + hud_height),
         background_color,
-        -1
+        background_alpha
     )
     
-    # Aplicar transparência
-    cv2.addWeighted(overlay, background_alpha, output, 1 - background_alpha, 0, output)
-    
     # Desenhar borda
     cv2.rectangle(
         output,
@@ -273,7 +300,8 @@ def draw_landmarks(
     landmarks: Dict[str, Tuple[int, int]],
     color: Tuple[int, int, int] = COLORS['cyan'],
     radius: int = 3,
-    thickness: int = -1
+    thickness: int = -1,
+    inplace: bool = False
 ) -> np.ndarray:
     """
     Desenha landmarks faciais no frame.
@@ -284,7 +312,8 @@ def draw_landmarks(
         color: Cor dos pontos
         radius: Raio dos círculos
         thickness: Espessura (-1 para preenchido)
-        
+        inplace: Se True, desenha diretamente em `frame` sem copiá-lo
+    
     Returns:
         Frame com landmarks desenhados
     """
@@ -294,7 +323,7 @@ def draw_landmarks(
     if not landmarks:
         return frame
     
-    output = frame.copy()
+    output = frame if inplace else frame.copy()
     
     for name, (x, y) in landmarks.items():
         cv2.circle(output, (int(x), int(y)), radius, color, thickness)
@@ -302,13 +331,82 @@ def draw_landmarks(
     return output
 
 
+def draw_annotations(
+    frame: np.ndarray,
+    idx: int,
+    timestamp: float,
+    boxes: Sequence[Tuple[int, int, int, int]],
+    emotions: Sequence[Tuple[str, float]],
+    fps: float,
+    activity: Optional[str] = None,
+    anomalies_count: int = 0,
+    inplace: bool = False,
+    track_ids: Sequence[Optional[int]] = ()
+) -> np.ndarray:
+    """
+    Desenha as anotações de um frame analisado: faces, emoções e HUD.
+    
+    Usado tanto na anotação durante a inferência quanto na renderização
+    posterior a partir de uma trilha de anotações.
+    
+    Args:
+        frame: Frame de imagem (numpy array BGR)
+        idx: Índice do frame
+        timestamp: Timestamp em segundos
+        boxes: Boxes das faces no formato (x, y, width, height)
+        emotions: Pares (label, score normalizado 0-1), alinhados com
+                  `boxes` (pode ser mais curta)
+        fps: FPS do vídeo, exibido no HUD
+        activity: Atividade atual (opcional)
+        anomalies_count: Anomalias detectadas no frame
+        inplace: Se True, desenha diretamente em `frame` sem copiá-lo
+        track_ids: IDs de rastreamento das faces, alinhados com `boxes`;
+                   quando presentes, substituem a numeração do label
+    
+    Returns:
+        Frame anotado
+    """
+    output = frame if inplace else frame.copy()
+    
+    # Desenhar faces e emoções
+    for i, box in enumerate(boxes):
+        label = f"Face {i+1}"
+        if i < len(track_ids) and track_ids[i] is not None:
+            label = f"Face #{track_ids[i]}"
+        color = COLORS['green']
+        
+        # Adicionar emoção se disponível (cor baseada na emoção)
+        if i < len(emotions):
+            emotion_label, score = emotions[i]
+            label += f" - {emotion_label} ({score:.2f})"
+            color = EMOTION_COLORS.get(emotion_label, COLORS['green'])
+        
+        output = draw_box_and_label(output, box, label, color=color, inplace=True)
+    
+    # Criar HUD com estatísticas
+    hud_stats = {
+        'Frame': idx,
+        'Time': f"{timestamp:.2f}s",
+        'Faces': len(boxes),
+        'FPS': fps
+    }
+    
+    if activity:
+        hud_stats['Activity'] = activity
+    
+    if anomalies_count:
+        hud_stats['⚠️ Anomalies'] = anomalies_count
+    
+    return put_hud(output, hud_stats, position="top-left", inplace=True)
+
+
 def format_timestamp(seconds: float) -> str:
     """
     Formata timestamp em segundos para MM:SS.
     
     Args:
         seconds: Tempo em segundos
-        
+    
     Returns:
         String formatada "MM:SS"
     """
@@ -323,7 +421,7 @@ def create_color_palette(n_colors: int) -> list[Tuple[int, int, int]]:
     
     Args:
         n_colors: Número de cores a gerar
-        
+    
     Returns:
         Lista de cores em formato BGR
     """
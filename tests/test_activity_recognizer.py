@@ -95,6 +95,17 @@ class TestActivityRecognizer:
         assert recognizer.stride == 15
         assert recognizer.get_buffer_size() == 0
     
+    def test_repeat_last_reuses_keypoints(self, recognizer, dummy_frame):
+        """Test repeat_last extends the window without a new frame."""
+        recognizer.update(0, dummy_frame)
+        
+        events = recognizer.repeat_last(1)
+        
+        assert isinstance(events, list)
+        assert recognizer.get_buffer_size() == 2
+        assert recognizer.keypoints_buffer[1] == recognizer.keypoints_buffer[0]
+        assert list(recognizer.frame_indices) == [0, 1]
+    
     def test_update_invalid_frame_none(self, recognizer):
         """Test error with None frame."""
         with pytest.raises(ValueError, match="Frame is None or empty"):
@@ -0,0 +1,201 @@
+"""
+Tests for AnnotationTrack and AnnotationRenderer
+"""
+
+import shutil
+
+import cv2
+import numpy as np
+import pytest
+
+from src.io.annotation_track import AnnotationTrack, AnnotationTrackError
+from src.pipeline import renderer
+from src.pipeline.renderer import AnnotationRenderer, fit_max_side
+from src.utils.viz import draw_annotations
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    """Create a 20-frame MJPEG video with a per-frame gray level."""
+    path = tmp_path / "source.avi"
+    out = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 10.0, (160, 120))
+    for i in range(20):
+        out.write(np.full((120, 160, 3), i * 10, dtype=np.uint8))
+    out.release()
+    return path
+
+
+def _build_track(video_path, stride=1, frames=20):
+    """Build a track with one face on even frames and an anomaly on frame 10."""
+    track = AnnotationTrack(str(video_path), fps=10.0, frame_size=(160, 120), stride=stride)
+    for idx in range(0, frames, stride):
+        boxes = [(100, 70, 40, 40)] if idx % 2 == 0 else []
+        emotions = [("happy", 0.8)] if idx % 2 == 0 else []
+        track.append(
+            idx, idx / 10.0, boxes=boxes, emotions=emotions,
+            activity="walking" if idx >= 10 else None,
+            anomalies_count=1 if idx == 10 else 0
+        )
+    return track
+
+
+def _count_frames(path):
+    """Count decodable frames in a video file."""
+    cap = cv2.VideoCapture(str(path))
+    count = 0
+    while cap.read()[0]:
+        count += 1
+    cap.release()
+    return count
+
+
+class TestAnnotationTrack:
+    """Test suite for AnnotationTrack."""
+    
+    def test_save_load_roundtrip(self, tmp_path, video_path):
+        """Test every per-frame record survives save/load."""
+        track = _build_track(video_path)
+        track.append(20, 2.0, boxes=[(1, 2, 3, 4), (5, 6, 7, 8)], emotions=[("sad", 0.5)])
+        
+        path = tmp_path / "annotations.npz"
+        track.save(str(path))
+        loaded = AnnotationTrack.load(str(path))
+        
+        assert len(loaded) == len(track) == 21
+        assert loaded.video_path == str(video_path)
+        assert loaded.frame_size == (160, 120)
+        assert loaded.fps == 10.0
+        for position in range(len(track)):
+            assert loaded.frame(position) == pytest.approx(track.frame(position))
+        
+        assert loaded.frame(20)['boxes'] == [(1, 2, 3, 4), (5, 6, 7, 8)]
+        assert loaded.frame(20)['emotions'] == [("sad", 0.5)]
+        assert loaded.frame(10)['activity'] == "walking"
+        assert loaded.frame(10)['anomalies_count'] == 1
+    
+    def test_find(self, video_path):
+        """Test lookup of track positions by video frame index."""
+        track = _build_track(video_path, stride=3)
+        
+        assert track.find(9) == 3
+        assert track.find(10) is None
+    
+    def test_loaded_track_is_read_only(self, tmp_path, video_path):
+        """Test appending to a loaded track is rejected."""
+        path = tmp_path / "annotations.npz"
+        _build_track(video_path).save(str(path))
+        
+        with pytest.raises(AnnotationTrackError):
+            AnnotationTrack.load(str(path)).append(99, 9.9, boxes=[])
+    
+    def test_track_ids_roundtrip(self, tmp_path, video_path):
+        """Test track IDs survive save/load, with -1/None meaning no ID."""
+        track = AnnotationTrack(str(video_path), fps=10.0, frame_size=(160, 120))
+        track.append(0, 0.0, boxes=[(1, 2, 3, 4), (5, 6, 7, 8)], track_ids=[7, -1])
+        track.append(1, 0.1, boxes=[(1, 2, 3, 4)], track_ids=[None])
+        track.append(2, 0.2, boxes=[(1, 2, 3, 4)])
+        
+        path = tmp_path / "annotations.npz"
+        track.save(str(path))
+        loaded = AnnotationTrack.load(str(path))
+        
+        assert loaded.frame(0)['track_ids'] == [7, None]
+        assert loaded.frame(1)['track_ids'] == [None]
+        assert loaded.frame(2)['track_ids'] == [None]
+    
+    def test_load_without_track_ids(self, tmp_path, video_path):
+        """Test tracks saved before the track ID column still load."""
+        path = tmp_path / "annotations.npz"
+        _build_track(video_path).save(str(path))
+        with np.load(str(path)) as data:
+            arrays = {name: data[name] for name in data.files if name != 'track_id'}
+        np.savez_compressed(str(path), **arrays)
+        
+        loaded = AnnotationTrack.load(str(path))
+        
+        assert loaded.frame(0)['track_ids'] == [None]
+    
+    def test_invalid_file(self, tmp_path):
+        """Test a non-track file raises AnnotationTrackError."""
+        path = tmp_path / "bogus.npz"
+        path.write_bytes(b"not a track")
+        
+        with pytest.raises(AnnotationTrackError):
+            AnnotationTrack.load(str(path))
+
+
+class TestAnnotationRenderer:
+    """Test suite for AnnotationRenderer."""
+    
+    def test_render_draws_annotations(self, tmp_path, video_path):
+        """Test rendering writes every analyzed frame with boxes drawn."""
+        output = tmp_path / "rendered.avi"
+        
+        result = AnnotationRenderer(_build_track(video_path)).render(str(output), codec="MJPG")
+        
+        assert result['frames'] == 20
+        assert result['segments'] == 1
+        
+        cap = cv2.VideoCapture(str(output))
+        ret, frame = cap.read()
+        cap.release()
+        
+        # Box verde desenhada na borda esquerda da face do frame 0
+        assert ret
+        edge = frame[80:100, 98:103].max(axis=1).mean(axis=0)
+        assert edge[1] > 100 and edge[1] > edge[2] + 50
+    
+    def test_render_draws_track_ids(self, tmp_path, video_path, monkeypatch):
+        """Test a saved track with IDs is rendered with the same labels as the live overlay."""
+        track = AnnotationTrack(str(video_path), fps=10.0, frame_size=(160, 120))
+        for idx in range(20):
+            track.append(idx, idx / 10.0, boxes=[(10, 10, 30, 30), (100, 70, 40, 40)], track_ids=[3, -1])
+        path = tmp_path / "annotations.npz"
+        track.save(str(path))
+        
+        calls = []
+        
+        def recording_draw(frame, *args, **kwargs):
+            calls.append(kwargs.get('track_ids'))
+            return draw_annotations(frame, *args, **kwargs)
+        
+        monkeypatch.setattr(renderer, "draw_annotations", recording_draw)
+        result = AnnotationRenderer(AnnotationTrack.load(str(path))).render(
+            str(tmp_path / "ids.avi"), codec="MJPG"
+        )
+        
+        assert result['frames'] == 20
+        assert calls == [[3, None]] * 20
+    
+    def test_render_with_stride_and_max_side(self, tmp_path, video_path):
+        """Test the render follows the track stride and limits the output size."""
+        output = tmp_path / "small.avi"
+        
+        result = AnnotationRenderer(_build_track(video_path, stride=2)).render(
+            str(output), max_side=80, codec="MJPG"
+        )
+        
+        assert result['frames'] == 10
+        cap = cv2.VideoCapture(str(output))
+        assert (cap.get(cv2.CAP_PROP_FRAME_WIDTH), cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) == (80, 60)
+        cap.release()
+    
+    @pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not available")
+    def test_parallel_segments_concatenate(self, tmp_path, video_path):
+        """Test segments rendered in parallel are joined in order."""
+        output = tmp_path / "parallel.avi"
+        
+        result = AnnotationRenderer(_build_track(video_path)).render(
+            str(output), workers=3, codec="MJPG"
+        )
+        
+        assert result['segments'] == 3
+        assert _count_frames(output) == 20
+        assert not list(tmp_path.glob(".render-*"))
+    
+    def test_fit_max_side(self):
+        """Test max-side fitting keeps aspect ratio with even dimensions."""
+        assert fit_max_side((1920, 1080), 1280) == (1280, 720)
+        assert fit_max_side((641, 481), 321) == (320, 240)
+        assert fit_max_side((640, 480), None) == (640, 480)
+        assert fit_max_side((640, 480), 1280) == (640, 480)
@@ -0,0 +1,83 @@
+"""
+Tests for box utilities
+"""
+
+import numpy as np
+import pytest
+
+from src.utils.boxes import as_boxes, clip_boxes, iou_matrix, nms, scale_boxes
+
+
+class TestIouMatrix:
+    """Tests for iou_matrix."""
+    
+    def test_shape_and_values(self):
+        a = [(0, 0, 10, 10), (100, 100, 10, 10)]
+        b = [(0, 0, 10, 10), (5, 0, 10, 10), (50, 50, 5, 5)]
+        
+        iou = iou_matrix(a, b)
+        
+        assert iou.shape == (2, 3)
+        assert iou[0, 0] == pytest.approx(1.0)
+        assert iou[0, 1] == pytest.approx(50 / 150)
+        assert iou[0, 2] == 0.0
+        assert not iou[1].any()
+    
+    def test_empty_inputs(self):
+        assert iou_matrix([], [(0, 0, 1, 1)]).shape == (0, 1)
+        assert as_boxes([]).shape == (0, 4)
+    
+    def test_degenerate_boxes(self):
+        """Zero-area boxes have IoU 0 instead of NaN."""
+        assert iou_matrix([(5, 5, 0, 0)], [(5, 5, 0, 0)])[0, 0] == 0.0
+
+
+class TestNms:
+    """Tests for nms."""
+    
+    def test_suppresses_overlapping_boxes(self):
+        boxes = [(0, 0, 10, 10), (1, 1, 10, 10), (50, 50, 10, 10)]
+        scores = [0.7, 0.9, 0.8]
+        
+        keep = nms(boxes, scores, iou_threshold=0.3)
+        
+        assert keep.tolist() == [1, 2]
+    
+    def test_ties_keep_input_order(self):
+        boxes = [(0, 0, 10, 10), (0, 0, 10, 10)]
+        
+        assert nms(boxes, [0.8, 0.8]).tolist() == [0]
+    
+    def test_empty(self):
+        assert nms(np.zeros((0, 4)), []).tolist() == []
+    
+    def test_mismatched_lengths(self):
+        with pytest.raises(ValueError):
+            nms([(0, 0, 1, 1)], [0.5, 0.6])
+
+
+class TestScaleAndClip:
+    """Tests for scale_boxes and clip_boxes."""
+    
+    def test_scale_boxes_rounds_to_int(self):
+        scaled = scale_boxes([(10, 20, 30, 41)], 0.5)
+        
+        assert scaled.dtype == np.int32
+        assert scaled.tolist() == [[5, 10, 15, 20]]
+    
+    def test_clip_boxes_to_frame(self):
+        boxes = [(-10, -5, 50, 50), (630, 470, 40, 40), (100, 100, 20, 20)]
+        
+        clipped = clip_boxes(boxes, (640, 480))
+        
+        assert clipped.tolist() == [
+            [0, 0, 50, 50],
+            [630, 470, 10, 10],
+            [100, 100, 20, 20]
+        ]
+    
+    def test_clip_boxes_never_empty(self):
+        """Boxes fully outside the frame shrink to 1 pixel at the border."""
+        clipped = clip_boxes([(700, 500, 10, 10)], (640, 480))
+        
+        assert clipped.tolist() == [[639, 479, 1, 1]]
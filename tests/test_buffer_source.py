@@ -0,0 +1,87 @@
+"""
+Tests for BufferSource
+"""
+
+import io
+import os
+
+import pytest
+
+from src.io.buffer_source import BufferSource
+
+
+class TestBufferSource:
+    """Test suite for BufferSource."""
+    
+    @pytest.mark.skipif(not hasattr(os, "memfd_create"), reason="memfd not available")
+    def test_memfd_from_bytes(self):
+        """Test bytes handed over are exposed through an in-memory file."""
+        data = os.urandom(10000)
+        
+        with BufferSource(data, name="clip.mp4", owns_data=True) as source:
+            assert source.method == "memfd"
+            assert source.size == len(data)
+            with open(source.path, 'rb') as f:
+                assert f.read() == data
+    
+    def test_auto_uses_file_without_ownership(self, tmp_path):
+        """Test auto mode does not duplicate data the caller keeps in RAM."""
+        data = io.BytesIO(os.urandom(4000))
+        
+        with BufferSource(data, temp_dir=str(tmp_path)) as source:
+            assert source.method == "file"
+            assert source.path.startswith(str(tmp_path))
+        
+        assert data.getvalue()
+    
+    @pytest.mark.skipif(not hasattr(os, "memfd_create"), reason="memfd not available")
+    def test_owned_data_is_released(self):
+        """Test buffers handed over are freed once copied to the memfd."""
+        data = bytearray(os.urandom(4000))
+        stream = io.BytesIO(bytes(data))
+        
+        with BufferSource(data, owns_data=True) as source:
+            assert source.method == "memfd"
+            assert source.size == 4000
+            assert len(data) == 0
+        
+        with BufferSource(stream, owns_data=True) as source:
+            assert os.path.getsize(source.path) == 4000
+            assert stream.closed
+    
+    def test_file_fallback_is_chunked_and_removed(self, tmp_path, monkeypatch):
+        """Test the temp-file fallback writes in chunks and cleans up."""
+        monkeypatch.setattr(BufferSource, "CHUNK_SIZE", 1024)
+        data = os.urandom(5000)
+        
+        source = BufferSource(io.BytesIO(data), name="clip.avi", method="file", temp_dir=str(tmp_path))
+        
+        assert source.path.endswith(".avi")
+        with open(source.path, 'rb') as f:
+            assert f.read() == data
+        
+        source.close()
+        assert not os.path.exists(source.path)
+    
+    def test_auto_uses_file_above_limit(self, tmp_path):
+        """Test auto mode falls back to a temp file for large inputs."""
+        with BufferSource(b"x" * 2048, memfd_max_bytes=1024, temp_dir=str(tmp_path)) as source:
+            assert source.method == "file"
+    
+    def test_readinto_stream(self, tmp_path):
+        """Test file-like objects without getbuffer are copied with readinto."""
+        data = os.urandom(3000)
+        path = tmp_path / "raw.bin"
+        path.write_bytes(data)
+        
+        with open(path, 'rb') as f, BufferSource(f, method="file", temp_dir=str(tmp_path)) as source:
+            with open(source.path, 'rb') as copy:
+                assert copy.read() == data
+    
+    def test_invalid_input(self):
+        """Test invalid method and data types are rejected."""
+        with pytest.raises(ValueError):
+            BufferSource(b"data", method="pipe")
+        
+        with pytest.raises(TypeError):
+            BufferSource(12345, method="file")
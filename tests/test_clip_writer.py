@@ -0,0 +1,110 @@
+"""
+Tests for ClipWriter
+"""
+
+import cv2
+import numpy as np
+import pytest
+
+from src.io.clip_writer import ClipWriter
+
+
+def _frame(level, size=(160, 120)):
+    """Generate a BGR frame with a uniform gray level."""
+    width, height = size
+    return np.full((height, width, 3), level, dtype=np.uint8)
+
+
+def _count_frames(path):
+    """Count decodable frames in a video file."""
+    cap = cv2.VideoCapture(str(path))
+    count = 0
+    while cap.read()[0]:
+        count += 1
+    cap.release()
+    return count
+
+
+class TestClipWriter:
+    """Test suite for ClipWriter."""
+    
+    def test_no_events_writes_nothing(self, tmp_path):
+        """Test uneventful footage produces no clips and releases every frame."""
+        released = []
+        
+        with ClipWriter(
+            str(tmp_path), fps=10.0, frame_size=(160, 120), codec="MJPG",
+            extension=".avi", on_written=released.append
+        ) as clips:
+            for i in range(50):
+                clips.write(_frame(i), i, i / 10.0)
+        
+        assert clips.clips == []
+        assert list(tmp_path.iterdir()) == []
+        assert len(released) == 50
+    
+    def test_clip_has_pre_and_post_roll(self, tmp_path):
+        """Test a clip spans pre_seconds before and post_seconds after the event."""
+        with ClipWriter(
+            str(tmp_path), fps=10.0, frame_size=(160, 120), pre_seconds=1.0,
+            post_seconds=0.5, codec="MJPG", extension=".avi"
+        ) as clips:
+            for i in range(100):
+                if i == 40:
+                    clips.trigger(i, i / 10.0, "anomaly:faces_count")
+                clips.write(_frame(i), i, i / 10.0)
+        
+        assert len(clips.clips) == 1
+        clip = clips.clips[0]
+        
+        assert clip['start_frame'] == 30
+        assert clip['end_frame'] == 45
+        assert clip['frames'] == 16
+        assert clip['start_sec'] == pytest.approx(3.0)
+        assert clip['events'] == [
+            {'frame_idx': 40, 'timestamp': 4.0, 'reason': 'anomaly:faces_count'}
+        ]
+        assert _count_frames(clip['path']) == 16
+    
+    def test_overlapping_events_extend_clip(self, tmp_path):
+        """Test events inside the post-roll extend the same clip."""
+        with ClipWriter(
+            str(tmp_path), fps=10.0, frame_size=(160, 120), pre_seconds=0.5,
+            post_seconds=1.0, codec="MJPG", extension=".avi"
+        ) as clips:
+            for i in range(100):
+                if i in (20, 25, 70):
+                    clips.trigger(i, i / 10.0, f"event:{i}")
+                clips.write(_frame(i), i, i / 10.0)
+        
+        assert len(clips.clips) == 2
+        first, second = clips.clips
+        
+        assert (first['start_frame'], first['end_frame']) == (15, 35)
+        assert [e['frame_idx'] for e in first['events']] == [20, 25]
+        assert (second['start_frame'], second['end_frame']) == (65, 80)
+        assert first['path'] != second['path']
+    
+    def test_release_closes_open_clip(self, tmp_path):
+        """Test a clip still recording at the end is finalized by release()."""
+        clips = ClipWriter(
+            str(tmp_path), fps=10.0, frame_size=(160, 120), codec="MJPG", extension=".avi"
+        )
+        
+        for i in range(10):
+            if i == 8:
+                clips.trigger(i, i / 10.0, "activity:walking")
+            clips.write(_frame(i), i, i / 10.0)
+        clips.release()
+        
+        assert len(clips.clips) == 1
+        assert clips.clips[0]['end_frame'] == 9
+        assert _count_frames(clips.clips[0]['path']) == 10
+    
+    def test_invalid_options(self, tmp_path):
+        """Test invalid fps and roll durations are rejected."""
+        with pytest.raises(ValueError):
+            ClipWriter(str(tmp_path), fps=0, frame_size=(160, 120))
+        
+        with pytest.raises(ValueError):
+            ClipWriter(str(tmp_path), fps=10.0, frame_size=(160, 120), pre_seconds=-1)
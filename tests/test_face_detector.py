@@ -6,7 +6,8 @@ import numpy as np
 import pytest
 import cv2
 
-from src.face.detector import Face, FaceDetector
+from src.face.detector import Face, FaceBatch, FaceDetector, scale_faces
+from src.utils.frame_context import FrameContext
 
 
 def _is_face_recognition_available() -> bool:
@@ -77,6 +78,119 @@ class TestFaceDataclass:
         face = Face(box=(0, 0, 100, 150), score=0.9)
         
         assert face.area == 15000
+    
+    def test_face_scaled(self):
+        """Test Face.scaled maps box and landmarks to another resolution."""
+        face = Face(
+            box=(10, 20, 30, 40),
+            score=0.9,
+            landmarks={'nose': (25, 40)}
+        )
+        
+        scaled = face.scaled(2.0)
+        
+        assert scaled.box == (20, 40, 60, 80)
+        assert scaled.landmarks == {'nose': (50, 80)}
+        assert scaled.score == face.score
+        assert face.box == (10, 20, 30, 40)  # Original não é alterado
+    
+    def test_face_scaled_keeps_track_id(self):
+        """Test Face.scaled preserves the tracking ID."""
+        face = Face(box=(10, 20, 30, 40), score=0.9, track_id=7)
+        
+        assert face.scaled(0.5).track_id == 7
+    
+    def test_scale_faces_matches_scaled(self):
+        """Test the batched scale_faces agrees with Face.scaled."""
+        faces = [
+            Face(box=(10, 20, 30, 40), score=0.9, landmarks={'nose': (25, 40)}, track_id=1),
+            Face(box=(101, 51, 33, 33), score=0.5)
+        ]
+        
+        assert scale_faces(faces, 1.5) == [face.scaled(1.5) for face in faces]
+        assert scale_faces([], 2.0) == []
+
+
+class TestFaceBatch:
+    """Tests for FaceBatch class."""
+    
+    @pytest.fixture
+    def faces(self):
+        return [
+            Face(box=(10, 20, 30, 40), score=0.9, landmarks={'nose': (25, 40)}),
+            Face(box=(100, 50, 20, 20), score=0.5, track_id=3),
+            Face(box=(5, 5, 8, 8), score=0.7, landmarks={'left_eye': (7, 7), 'nose': (9, 9)})
+        ]
+    
+    def test_round_trip(self, faces):
+        batch = FaceBatch.from_faces(faces)
+        
+        assert len(batch) == 3
+        assert batch.boxes.dtype == np.int32 and batch.boxes.shape == (3, 4)
+        assert batch.scores.dtype == np.float32
+        assert batch.landmarks.shape == (3, 2, 2)
+        assert batch.track_id_list() == [None, 3, None]
+        
+        for original, view in zip(faces, batch.to_faces()):
+            assert view.box == original.box
+            assert view.score == pytest.approx(original.score)
+            assert view.landmarks == original.landmarks
+            assert view.track_id == original.track_id
+    
+    def test_empty(self):
+        batch = FaceBatch.from_faces([])
+        
+        assert len(batch) == 0
+        assert not batch
+        assert batch.to_faces() == []
+        assert batch.boxes.shape == (0, 4)
+    
+    def test_invalid_arrays(self):
+        with pytest.raises(ValueError):
+            FaceBatch([(0, 0, 10, 10)], [0.5, 0.6])
+        
+        with pytest.raises(ValueError):
+            FaceBatch([(0, 0, 10, 10)], [1.5])
+        
+        with pytest.raises(ValueError):
+            FaceBatch([(0, 0, 10, 10)], [0.5], track_ids=[1, 2])
+    
+    def test_indexing(self, faces):
+        batch = FaceBatch.from_faces(faces)
+        
+        assert batch[-1].box == (5, 5, 8, 8)
+        with pytest.raises(IndexError):
+            batch[3]
+    
+    def test_scaled_matches_faces(self, faces):
+        batch = FaceBatch.from_faces(faces).scaled(2.5)
+        expected = scale_faces(faces, 2.5)
+        
+        assert [face.box for face in batch] == [face.box for face in expected]
+        assert [face.landmarks for face in batch] == [face.landmarks for face in expected]
+    
+    def test_translate_concatenate_select(self, faces):
+        first = FaceBatch.from_faces(faces[:1]).translated(100, 200)
+        rest = FaceBatch.from_faces(faces[1:])
+        
+        merged = FaceBatch.concatenate([first, FaceBatch.empty(), rest])
+        assert merged.landmark_names == ('nose', 'left_eye')
+        assert merged[0].box == (110, 220, 30, 40)
+        assert merged[0].landmarks == {'nose': (125, 240)}
+        assert merged[2].landmarks == {'left_eye': (7, 7), 'nose': (9, 9)}
+        
+        picked = merged.select([2, 1])
+        assert [face.box for face in picked] == [(5, 5, 8, 8), (100, 50, 20, 20)]
+        assert picked.track_id_list() == [None, 3]
+    
+    def test_detect_batch_matches_detect(self):
+        detector = FaceDetector(backend="opencv")
+        frame = np.random.randint(0, 255, (120, 160, 3), dtype=np.uint8)
+        
+        batch = detector.detect_batch(frame, scale=0.5)
+        
+        assert isinstance(batch, FaceBatch)
+        assert batch.to_faces() == detector.detect(frame, scale=0.5)
 
 
 class TestFaceDetector:
@@ -214,6 +328,33 @@ class TestFaceDetector:
         faces = detector.detect(dummy_frame)
         assert isinstance(faces, list)
     
+    def test_detect_scale_projects_boxes(self, dummy_frame, monkeypatch):
+        """Test detect(scale=...) maps boxes back to source coordinates."""
+        detector = FaceDetector(backend="opencv")
+        monkeypatch.setattr(
+            detector,
+            "_detect_opencv",
+            lambda frame, context=None: [Face(box=(50, 25, 40, 40), score=0.8)]
+        )
+        
+        faces = detector.detect(dummy_frame, scale=0.5)
+        
+        assert faces[0].box == (100, 50, 80, 80)
+    
+    def test_detect_opencv_grayscale_frame(self, dummy_frame):
+        """Test OpenCV backend accepts frames already in grayscale."""
+        detector = FaceDetector(backend="opencv")
+        gray = cv2.cvtColor(dummy_frame, cv2.COLOR_BGR2GRAY)
+        
+        assert detector.detect(gray) == detector.detect(dummy_frame)
+    
+    def test_detect_invalid_scale(self, dummy_frame):
+        """Test detect rejects non-positive scale."""
+        detector = FaceDetector(backend="opencv")
+        
+        with pytest.raises(ValueError, match="Scale"):
+            detector.detect(dummy_frame, scale=0)
+    
     def test_multiple_detections(self, dummy_frame):
         """Test detector can be called multiple times."""
         detector = FaceDetector(backend="opencv")
@@ -224,3 +365,491 @@ class TestFaceDetector:
         # Both should succeed
         assert isinstance(faces1, list)
         assert isinstance(faces2, list)
+    
+    def test_invalid_full_scan_interval(self):
+        """Test full_scan_interval must be >= 1."""
+        with pytest.raises(ValueError, match="full_scan_interval"):
+            FaceDetector(backend="opencv", full_scan_interval=0)
+
+
+class RecordingCascade:
+    """Cascata de teste: registra as chamadas e devolve uma face fixa."""
+    
+    def __init__(self, box=(100, 80, 60, 60)):
+        self.box = box
+        self.calls = []
+        self.found = True
+    
+    def detectMultiScale(self, image, **kwargs):
+        self.calls.append((image.shape, kwargs))
+        if not self.found:
+            return ()
+        if image.shape[:2] == (480, 640):
+            return np.array([self.box])
+        # Janela de busca: margem de 30 px ao redor da face
+        return np.array([(30, 30, 60, 60)])
+
+
+class TestFaceDetectorRoiSearch:
+    """Tests for the incremental (ROI) search of the OpenCV backend."""
+    
+    @pytest.fixture
+    def frame(self):
+        return np.zeros((480, 640, 3), dtype=np.uint8)
+    
+    def test_roi_search_between_full_scans(self, frame):
+        """Only every N-th call scans the whole frame."""
+        detector = FaceDetector(backend="opencv", full_scan_interval=3)
+        cascade = RecordingCascade()
+        detector._detector = cascade
+        
+        for _ in range(4):
+            faces = detector.detect(frame)
+            assert [face.box for face in faces] == [(100, 80, 60, 60)]
+        
+        shapes = [shape[:2] for shape, _ in cascade.calls]
+        assert shapes == [(480, 640), (120, 120), (120, 120), (480, 640)]
+        assert detector.full_scans == 2
+        
+        # Janela limitada ao tamanho da face anterior
+        _, kwargs = cascade.calls[1]
+        assert kwargs['minSize'] == (42, 42)
+        assert kwargs['maxSize'] == (84, 84)
+    
+    def test_lost_face_falls_back_to_full_scan(self, frame):
+        detector = FaceDetector(backend="opencv", full_scan_interval=10)
+        cascade = RecordingCascade()
+        detector._detector = cascade
+        
+        detector.detect(frame)
+        cascade.found = False
+        faces = detector.detect(frame)
+        
+        assert faces == []
+        shapes = [shape[:2] for shape, _ in cascade.calls]
+        assert shapes == [(480, 640), (120, 120), (480, 640)]
+    
+    def test_no_previous_faces_waits_for_full_scan(self, frame):
+        """Without faces, nothing is searched until the next full scan."""
+        detector = FaceDetector(backend="opencv", full_scan_interval=3)
+        cascade = RecordingCascade()
+        cascade.found = False
+        detector._detector = cascade
+        
+        for _ in range(4):
+            assert detector.detect(frame) == []
+        
+        assert len(cascade.calls) == 2
+        assert detector.full_scans == 2
+    
+    def test_default_always_scans_full_frame(self, frame):
+        detector = FaceDetector(backend="opencv")
+        cascade = RecordingCascade()
+        detector._detector = cascade
+        
+        detector.detect(frame)
+        detector.detect(frame)
+        
+        assert [shape[:2] for shape, _ in cascade.calls] == [(480, 640), (480, 640)]
+
+
+def _find_squares(image):
+    """Detector de teste: quadrados brancos que não tocam a borda da imagem."""
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    _, mask = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY)
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    
+    height, width = gray.shape[:2]
+    faces = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if x > 0 and y > 0 and x + w < width and y + h < height:
+            faces.append(Face(box=(x, y, w, h), score=0.8))
+    return faces
+
+
+class TestFaceDetectorTiles:
+    """Tests for tiled detection."""
+    
+    @pytest.fixture
+    def frame(self):
+        """1000x1400 frame with small squares (one on a tile seam) and a large one."""
+        frame = np.zeros((1000, 1400, 3), dtype=np.uint8)
+        for x, y in [(50, 50), (380, 120), (900, 700), (1300, 900)]:
+            frame[y:y + 40, x:x + 40] = 255
+        frame[400:760, 300:660] = 255
+        return frame
+    
+    def test_invalid_tile_options(self):
+        with pytest.raises(ValueError):
+            FaceDetector(backend="opencv", tile_size=10)
+        
+        with pytest.raises(ValueError):
+            FaceDetector(backend="opencv", tile_size=400, tile_overlap=1.0)
+        
+        with pytest.raises(ValueError):
+            FaceDetector(backend="opencv", tile_size=400, tile_overlap=0.0)
+        
+        with pytest.raises(ValueError):
+            FaceDetector(backend="opencv", tile_size=400, tile_workers=0)
+    
+    def test_tile_windows_cover_frame(self):
+        detector = FaceDetector(backend="opencv", tile_size=420, tile_overlap=0.25)
+        
+        windows = detector._tile_windows(1000, 1400)
+        
+        coverage = np.zeros((1000, 1400), dtype=bool)
+        for x0, y0, x1, y1 in windows:
+            assert x1 - x0 <= 420 and y1 - y0 <= 420
+            coverage[y0:y1, x0:x1] = True
+        assert coverage.all()
+    
+    def test_tiled_detection_merges_seams(self, frame, monkeypatch):
+        detector = FaceDetector(backend="opencv", tile_size=420, tile_workers=4)
+        calls = []
+        
+        def scan(image, max_side=None):
+            calls.append(image.shape[:2])
+            faces = _find_squares(image)
+            if max_side is not None:
+                # Tiles: apenas faces que cabem na sobreposição
+                assert max_side == 105
+                faces = [face for face in faces if face.box[2] <= max_side]
+            return faces
+        
+        monkeypatch.setattr(detector, "_scan_opencv", scan)
+        
+        faces = detector.detect(frame)
+        detector.close()
+        
+        boxes = sorted(face.box for face in faces)
+        assert len(boxes) == 5
+        
+        # Quadrados pequenos: detectados nos tiles, sem duplicatas na emenda
+        # (o quadrado em x=380 está inteiro em dois tiles vizinhos)
+        small = [box for box in boxes if box[2] == 40]
+        assert small == [(50, 50, 40, 40), (380, 120, 40, 40), (900, 700, 40, 40), (1300, 900, 40, 40)]
+        
+        # Quadrado grande: cortado pelos tiles, detectado na passada reduzida
+        large = [box for box in boxes if box[2] != 40][0]
+        assert np.allclose(large, (300, 400, 360, 360), atol=4)
+        
+        # Tiles na resolução original + passada reduzida
+        windows = detector._tile_windows(1000, 1400)
+        assert len(calls) == len(windows) + 1
+        assert calls.count((420, 420)) == len(windows)
+        assert (300, 420) in calls
+    
+    @pytest.mark.parametrize("shape, tile_size, overlap", [
+        ((1080, 1920), 256, 0.25),
+        ((2160, 3840), 640, 0.25),
+        ((2160, 3840), 960, 0.1),
+        ((1000, 1400), 420, 0.25),
+        ((720, 1280), 64, 0.5),
+    ])
+    def test_tiles_and_coarse_pass_cover_all_face_sizes(self, shape, tile_size, overlap):
+        """Faces too large for the tiles are large enough for the coarse pass."""
+        detector = FaceDetector(backend="opencv", tile_size=tile_size, tile_overlap=overlap)
+        height, width = shape
+        tile = detector._tile_size_for(height, width)
+        
+        assert tile >= tile_size
+        if tile >= max(shape):
+            return
+        
+        # Maior face dos tiles (lado maior do tile = tile)
+        max_tile_face = max(detector.MIN_FACE_SIZE, tile - detector._tile_step(tile))
+        # Menor face da passada reduzida, em pixels do frame
+        min_coarse_face = detector.MIN_FACE_SIZE * max(shape) / tile
+        assert max_tile_face >= min_coarse_face
+        
+        # Toda face até max_tile_face cabe inteira em algum tile
+        windows = detector._tile_windows(height, width)
+        xs = sorted({x0 for x0, _, _, _ in windows})
+        assert all(b - a <= tile - max_tile_face for a, b in zip(xs, xs[1:]))
+    
+    def test_tile_size_raised_for_large_frames(self, monkeypatch):
+        """Tile 256 on 1080p would leave 64-225 px faces to no pass."""
+        detector = FaceDetector(backend="opencv", tile_size=256)
+        calls = []
+        
+        def scan(image, max_side=None):
+            calls.append((image.shape[:2], max_side))
+            return []
+        
+        monkeypatch.setattr(detector, "_scan_opencv", scan)
+        detector.detect(np.zeros((1080, 1920), dtype=np.uint8))
+        detector.close()
+        
+        tile = detector._tile_size_for(1080, 1920)
+        assert tile == 480
+        tile_max = {max_side for _, max_side in calls if max_side is not None}
+        assert tile_max == {120}
+        assert ((270, 480), None) in calls
+    
+    def test_small_frames_are_not_tiled(self, monkeypatch):
+        detector = FaceDetector(backend="opencv", tile_size=800)
+        calls = []
+        monkeypatch.setattr(
+            detector, "_scan_opencv", lambda image, max_side=None: calls.append(image.shape) or []
+        )
+        
+        detector.detect(np.zeros((480, 640, 3), dtype=np.uint8))
+        
+        assert calls == [(480, 640)]
+
+
+class TestFaceDetectorMany:
+    """Tests for multi-frame detection."""
+    
+    @pytest.fixture
+    def frames(self):
+        """Frames with one white square each, at a different position."""
+        frames = []
+        for i in range(9):
+            frame = np.zeros((240, 320, 3), dtype=np.uint8)
+            frame[50:90, 10 + 30 * i:50 + 30 * i] = 255
+            frames.append(frame)
+        return frames
+    
+    @pytest.fixture(autouse=True)
+    def fake_scan(self, monkeypatch):
+        """Replace the Haar scan in every instance, including per-thread ones."""
+        monkeypatch.setattr(
+            FaceDetector, "_scan_opencv", lambda self, image, max_side=None: _find_squares(image)
+        )
+    
+    def test_results_in_frame_order(self, frames):
+        detector = FaceDetector(backend="opencv", frame_workers=3)
+        
+        results = list(detector.detect_many(frames, scale=0.5, in_flight=4))
+        
+        assert [faces.boxes.tolist() for faces in results] == [
+            [[20 + 60 * i, 100, 80, 80]] for i in range(len(frames))
+        ]
+        
+        # Um detector por thread do pool, separado do principal
+        assert 1 <= len(detector._frame_detectors) <= 3
+        assert all(clone is not detector for clone in detector._frame_detectors)
+        
+        detector.close()
+        assert detector._frame_detectors == []
+    
+    def test_frames_consumed_on_demand(self, frames):
+        detector = FaceDetector(backend="opencv", frame_workers=2)
+        pulled = []
+        
+        def source():
+            for frame in frames:
+                pulled.append(frame)
+                yield frame
+        
+        results = detector.detect_many(source(), in_flight=3)
+        next(results)
+        assert len(pulled) == 3
+        
+        assert len(list(results)) == len(frames) - 1
+        detector.close()
+    
+    def test_invalid_parameters(self, frames):
+        with pytest.raises(ValueError):
+            FaceDetector(backend="opencv", frame_workers=0)
+        
+        detector = FaceDetector(backend="opencv")
+        with pytest.raises(ValueError):
+            list(detector.detect_many(frames, in_flight=-1))
+        
+        with pytest.raises(ValueError):
+            detector.submit(None)
+
+
+class FakeDeepFace:
+    """DeepFace de teste: uma face por imagem, com x = valor do pixel (0, 0)."""
+    
+    def __init__(self, accepts_lists=True):
+        self.accepts_lists = accepts_lists
+        self.calls = []
+    
+    def _faces(self, image):
+        x = int(image[0, 0, 0])
+        return [{'facial_area': {'x': x, 'y': 10, 'w': 40, 'h': 40}, 'confidence': 0.9}]
+    
+    def extract_faces(self, img_path, **kwargs):
+        self.calls.append(len(img_path) if isinstance(img_path, list) else 1)
+        if isinstance(img_path, list):
+            if not self.accepts_lists:
+                raise ValueError("img_path must be a str or numpy array")
+            return [self._faces(image) for image in img_path]
+        return self._faces(img_path)
+
+
+def _deepface_detector(fake, **kwargs):
+    """FaceDetector com o backend deepface simulado."""
+    detector = FaceDetector(backend="opencv", **kwargs)
+    detector.backend = "deepface"
+    detector._deepface = fake
+    return detector
+
+
+class TestFaceDetectorDeepFaceBatches:
+    """Tests for micro-batched deepface detection."""
+    
+    @pytest.fixture
+    def frames(self):
+        return [np.full((120, 160, 3), 10 * i, dtype=np.uint8) for i in range(10)]
+    
+    def test_batches_split_per_frame(self, frames):
+        fake = FakeDeepFace()
+        detector = _deepface_detector(fake, batch_size=4, batch_wait_ms=200)
+        
+        results = list(detector.detect_many(frames, scale=0.5))
+        detector.close()
+        
+        assert [faces.boxes[0, 0] for faces in results] == [20 * i for i in range(10)]
+        assert all(faces.boxes[0, 2] == 80 for faces in results)
+        assert max(fake.calls) == 4
+        assert sum(fake.calls) == 10
+        assert len(fake.calls) < 10
+    
+    def test_falls_back_without_list_support(self, frames):
+        fake = FakeDeepFace(accepts_lists=False)
+        detector = _deepface_detector(fake, batch_size=5, batch_wait_ms=200)
+        
+        results = list(detector.detect_many(frames))
+        detector.close()
+        
+        assert [faces.boxes[0, 0] for faces in results] == [10 * i for i in range(10)]
+        assert detector._deepface_accepts_lists is False
+        
+        # Uma tentativa com lista; depois, sempre frame a frame
+        assert fake.calls.count(1) == 10
+        assert len([size for size in fake.calls if size > 1]) == 1
+    
+    def test_batch_size_one_is_synchronous(self, frames):
+        fake = FakeDeepFace()
+        detector = _deepface_detector(fake)
+        
+        future = detector.submit(frames[3])
+        
+        assert future.done()
+        assert future.result().boxes.tolist() == [[30, 10, 40, 40]]
+        assert detector._batcher is None
+    
+    def test_invalid_batch_parameters(self):
+        with pytest.raises(ValueError):
+            FaceDetector(backend="opencv", batch_size=0)
+        
+        with pytest.raises(ValueError):
+            FaceDetector(backend="opencv", batch_wait_ms=-1)
+
+
+class FakeFaceRecognition:
+    """face_recognition de teste: duas faces, a segunda sem landmarks de lábios."""
+    
+    LOCATIONS = [(20, 80, 70, 30), (100, 210, 160, 150)]
+    
+    def face_locations(self, image, model="hog"):
+        return list(self.LOCATIONS)
+    
+    def face_landmarks(self, image, face_locations=None):
+        first = {
+            'chin': [(30, 60)] * 17,
+            'left_eye': [(40, 30), (45, 29), (50, 31), (45, 33), (41, 32), (43, 31)],
+            'right_eye': [(60, 30), (65, 29), (70, 31), (65, 33), (61, 32), (63, 31)],
+            'nose_tip': [(50, 45), (52, 46), (55, 47), (58, 46), (60, 45)],
+            'top_lip': [(45 + i, 55) for i in range(12)],
+            'bottom_lip': [(45 + i, 62) for i in range(12)],
+        }
+        second = {
+            'left_eye': [(160, 115), (170, 117)],
+            'right_eye': [(180, 115), (191, 118)],
+            'nose_tip': [(175, 130)],
+        }
+        return [first, second]
+
+
+class TestFaceRecognitionLandmarks:
+    """Tests for the vectorized face_recognition conversion."""
+    
+    @pytest.fixture
+    def detector(self):
+        detector = FaceDetector(backend="opencv")
+        detector.backend = "face_recognition"
+        detector._face_recognition = FakeFaceRecognition()
+        return detector
+    
+    def test_boxes_and_landmark_array(self, detector):
+        batch = detector.detect_batch(np.zeros((240, 320, 3), dtype=np.uint8))
+        
+        assert batch.boxes.tolist() == [[30, 20, 50, 50], [150, 100, 60, 60]]
+        assert batch.landmark_names == FaceDetector.LANDMARK_NAMES
+        assert batch.landmarks.shape == (2, 5, 2)
+        assert np.isnan(batch.landmarks[1, 3:]).all()
+    
+    def test_dict_view_matches_representative_points(self, detector):
+        faces = detector.detect(np.zeros((240, 320, 3), dtype=np.uint8))
+        
+        assert faces[0].landmarks == {
+            'left_eye': (44, 31),
+            'right_eye': (64, 31),
+            'nose': (55, 47),
+            'mouth_top': (51, 55),
+            'mouth_bottom': (51, 62),
+        }
+        assert faces[1].landmarks == {
+            'left_eye': (165, 116),
+            'right_eye': (185, 116),
+            'nose': (175, 130),
+        }
+    
+    def test_landmarks_failure_keeps_boxes(self, detector, monkeypatch):
+        def failing(image, face_locations=None):
+            raise RuntimeError("shape predictor missing")
+        
+        monkeypatch.setattr(detector._face_recognition, "face_landmarks", failing)
+        faces = detector.detect(np.zeros((240, 320, 3), dtype=np.uint8))
+        
+        assert [face.box for face in faces] == [(30, 20, 50, 50), (150, 100, 60, 60)]
+        assert all(face.landmarks is None for face in faces)
+
+
+
+class TestFaceDetectorFrameContext:
+    """Tests for detection with a shared FrameContext."""
+    
+    def test_opencv_reuses_gray(self):
+        detector = FaceDetector(backend="opencv")
+        frame = np.random.randint(0, 255, (120, 160, 3), dtype=np.uint8)
+        context = FrameContext(frame)
+        context.gray()
+        
+        batch = detector.detect_batch(frame, context=context)
+        
+        assert batch.to_faces() == detector.detect(frame)
+        assert context.conversions == 1
+        assert context.hits >= 1
+    
+    def test_face_recognition_reuses_rgb(self):
+        detector = FaceDetector(backend="opencv")
+        detector.backend = "face_recognition"
+        detector._face_recognition = FakeFaceRecognition()
+        frame = np.zeros((240, 320, 3), dtype=np.uint8)
+        context = FrameContext(frame)
+        context.rgb()
+        
+        batch = detector.detect_batch(frame, context=context)
+        
+        assert len(batch) == 2
+        assert context.conversions == 1
+        assert context.hits == 1
+    
+    def test_context_of_other_frame_rejected(self):
+        detector = FaceDetector(backend="opencv")
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        context = FrameContext(frame.copy())
+        
+        with pytest.raises(ValueError):
+            detector.detect_batch(frame, context=context)
+        
+        with pytest.raises(ValueError):
+            detector.submit(frame, context=context)
@@ -0,0 +1,189 @@
+"""
+Tests for Face Tracker
+"""
+
+import cv2
+import numpy as np
+import pytest
+
+from src.face.detector import Face, FaceBatch
+from src.face.tracker import FaceTracker
+
+
+class StaticDetector:
+    """Detector de teste que devolve boxes fixas e conta as chamadas."""
+    
+    def __init__(self, boxes, landmarks=None):
+        self.boxes = list(boxes)
+        self.landmarks = landmarks
+        self.calls = 0
+    
+    def detect_batch(self, frame, scale=1.0):
+        self.calls += 1
+        return FaceBatch.from_faces(
+            [Face(box=box, score=0.9, landmarks=self.landmarks) for box in self.boxes]
+        )
+
+
+def _textured_frame(offset=(0, 0), size=(240, 320), patch_size=60):
+    """Frame cinza suave com um patch texturizado em (100, 80) + offset."""
+    rng = np.random.default_rng(0)
+    patch = rng.integers(0, 255, size=(60, 60), dtype=np.uint8)
+    patch = np.kron(patch[::4, ::4], np.ones((4, 4), dtype=np.uint8))
+    
+    frame = np.full(size, 90, dtype=np.uint8)
+    x, y = 100 + offset[0], 80 + offset[1]
+    if patch_size != 60:
+        # Zoom em torno do centro do patch
+        patch = cv2.resize(patch, (patch_size, patch_size), interpolation=cv2.INTER_LINEAR)
+        x, y = x + 30 - patch_size // 2, y + 30 - patch_size // 2
+    frame[y:y + patch_size, x:x + patch_size] = patch
+    return frame
+
+
+class TestFaceTracker:
+    """Tests for FaceTracker class."""
+    
+    def test_invalid_parameters(self):
+        detector = StaticDetector([])
+        
+        with pytest.raises(ValueError):
+            FaceTracker(detector, detect_interval=0)
+        
+        with pytest.raises(ValueError):
+            FaceTracker(detector, iou_threshold=1.5)
+        
+        with pytest.raises(ValueError):
+            FaceTracker(detector, min_confidence=-0.1)
+    
+    def test_invalid_frame(self):
+        tracker = FaceTracker(StaticDetector([]))
+        
+        with pytest.raises(ValueError):
+            tracker.detect(None)
+        
+        with pytest.raises(ValueError):
+            tracker.detect(np.zeros((10, 10, 3, 1), dtype=np.uint8))
+    
+    def test_detects_every_n_frames(self):
+        """Static scene: detection runs once per interval, IDs are stable."""
+        detector = StaticDetector([(100, 80, 60, 60)])
+        tracker = FaceTracker(detector, detect_interval=5)
+        frame = _textured_frame()
+        
+        ids = set()
+        for _ in range(12):
+            faces = tracker.detect(frame)
+            assert len(faces) == 1
+            ids.add(faces[0].track_id)
+        
+        assert detector.calls == 3  # frames 0, 5 e 10
+        assert tracker.detections == 3
+        assert tracker.frames == 12
+        assert ids == {0}
+    
+    def test_interval_one_detects_every_frame(self):
+        detector = StaticDetector([(100, 80, 60, 60)])
+        tracker = FaceTracker(detector, detect_interval=1)
+        frame = _textured_frame()
+        
+        for _ in range(4):
+            tracker.detect(frame)
+        
+        assert detector.calls == 4
+    
+    def test_propagates_moving_face(self):
+        """Between detections, the box follows the textured patch."""
+        detector = StaticDetector([(100, 80, 60, 60)])
+        tracker = FaceTracker(detector, detect_interval=10)
+        
+        tracker.detect(_textured_frame())
+        for step in range(1, 4):
+            faces = tracker.detect(_textured_frame(offset=(3 * step, 2 * step)))
+        
+        assert detector.calls == 1
+        x, y, w, h = faces[0].box
+        assert abs(x - 109) <= 1
+        assert abs(y - 86) <= 1
+        assert abs(w - 60) <= 2
+        assert faces[0].track_id == 0
+    
+    def test_landmarks_follow_box_scale(self):
+        """A face approaching the camera scales its landmarks with the box."""
+        detector = StaticDetector([(100, 80, 60, 60)], landmarks={'left_eye': (110, 90)})
+        tracker = FaceTracker(detector, detect_interval=10)
+        
+        tracker.detect(_textured_frame())
+        for size in (62, 64, 66, 68):
+            faces = tracker.detect(_textured_frame(patch_size=size))
+        
+        assert detector.calls == 1
+        x, y, w, h = faces[0].box
+        ratio = w / 60
+        assert ratio > 1.08
+        
+        # Olho a (-20, -20) do centro (130, 110): deslocamento × escala
+        eye_x, eye_y = faces[0].landmarks['left_eye']
+        assert abs(eye_x - (x + w / 2 - 20 * ratio)) <= 2
+        assert abs(eye_y - (y + h / 2 - 20 * ratio)) <= 2
+        assert eye_x < 109 and eye_y < 89
+    
+    def test_lost_track_triggers_detection(self):
+        """A frame without texture drops confidence and forces a detection."""
+        detector = StaticDetector([(100, 80, 60, 60)])
+        tracker = FaceTracker(detector, detect_interval=10)
+        
+        tracker.detect(_textured_frame())
+        tracker.detect(np.full((240, 320), 90, dtype=np.uint8))
+        
+        assert detector.calls == 2
+    
+    def test_association_keeps_ids(self):
+        """Matched faces keep their ID; new faces get new IDs; lost ones end."""
+        detector = StaticDetector([(10, 10, 40, 40), (200, 100, 40, 40)])
+        tracker = FaceTracker(detector, detect_interval=1)
+        frame = _textured_frame()
+        
+        first = {face.box: face.track_id for face in tracker.detect(frame)}
+        assert sorted(first.values()) == [0, 1]
+        
+        detector.boxes = [(204, 102, 40, 40), (120, 30, 40, 40)]
+        second = {face.box: face.track_id for face in tracker.detect(frame)}
+        
+        assert second[(204, 102, 40, 40)] == first[(200, 100, 40, 40)]
+        assert second[(120, 30, 40, 40)] == 2
+    
+    def test_scale_projects_boxes(self):
+        detector = StaticDetector([(100, 80, 60, 60)])
+        tracker = FaceTracker(detector, detect_interval=5)
+        
+        faces = tracker.detect(_textured_frame(), scale=0.5)
+        
+        assert faces[0].box == (200, 160, 120, 120)
+        assert faces[0].track_id == 0
+    
+    def test_detect_batch_is_columnar(self):
+        """detect_batch returns a FaceBatch built from the track arrays."""
+        detector = StaticDetector([(100, 80, 60, 60)], landmarks={'nose': (130, 110)})
+        tracker = FaceTracker(detector, detect_interval=5)
+        
+        tracker.detect_batch(_textured_frame())
+        batch = tracker.detect_batch(_textured_frame(offset=(2, 0)))
+        
+        assert isinstance(batch, FaceBatch)
+        assert detector.calls == 1
+        assert batch.track_ids.tolist() == [0]
+        assert batch.landmark_names == ('nose',)
+        assert abs(batch.boxes[0, 0] - 102) <= 1
+        assert abs(batch.landmarks[0, 0, 0] - 132) <= 1
+    
+    def test_reset_forces_detection(self):
+        detector = StaticDetector([(100, 80, 60, 60)])
+        tracker = FaceTracker(detector, detect_interval=5)
+        frame = _textured_frame()
+        
+        tracker.detect(frame)
+        tracker.reset()
+        tracker.detect(frame)
+        
+        assert detector.calls == 2
@@ -0,0 +1,99 @@
+"""
+Tests for FrameContext
+"""
+
+import cv2
+import numpy as np
+import pytest
+
+from src.utils.frame_context import FrameContext
+
+
+def _frame(seed=0, size=(48, 64)):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 255, size=size + (3,), dtype=np.uint8)
+
+
+class TestFrameContext:
+    """Tests for FrameContext class."""
+    
+    def test_gray_and_rgb_match_cv2(self):
+        frame = _frame()
+        context = FrameContext(frame)
+        
+        assert np.array_equal(context.gray(), cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+        assert np.array_equal(context.rgb(), cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    
+    def test_conversions_are_memoized(self):
+        context = FrameContext(_frame())
+        
+        first = context.gray()
+        second = context.gray()
+        
+        assert second is first
+        assert context.conversions == 1
+        assert context.hits == 1
+    
+    def test_buffers_reused_across_frames(self):
+        """Test reset drops results but keeps buffers of the same shape."""
+        context = FrameContext(_frame(0))
+        gray = context.gray()
+        small = context.resized((32, 24))
+        
+        context.reset(_frame(1))
+        
+        assert context.gray() is gray
+        assert context.resized((32, 24)) is small
+        assert context.conversions == 4
+        assert context.hits == 0
+        assert np.array_equal(gray, cv2.cvtColor(_frame(1), cv2.COLOR_BGR2GRAY))
+    
+    def test_shape_change_reallocates(self):
+        context = FrameContext(_frame(size=(48, 64)))
+        gray = context.gray()
+        
+        context.reset(_frame(size=(24, 32)))
+        
+        assert context.gray() is not gray
+        assert context.gray().shape == (24, 32)
+    
+    def test_gray_frame_passthrough(self):
+        frame = np.zeros((48, 64), dtype=np.uint8)
+        context = FrameContext(frame)
+        
+        assert context.gray() is frame
+        assert context.rgb().shape == (48, 64, 3)
+        assert context.conversions == 1
+    
+    def test_resized_keyed_by_size_and_source(self):
+        frame = _frame()
+        context = FrameContext(frame)
+        
+        small_bgr = context.resized((32, 24))
+        small_gray = context.resized((32, 24), source='gray')
+        
+        assert small_bgr.shape == (24, 32, 3)
+        assert small_gray.shape == (24, 32)
+        assert context.resized((32, 24), source='gray') is small_gray
+        assert context.resized((64, 48)) is frame
+        assert np.array_equal(
+            small_bgr, cv2.resize(frame, (32, 24), interpolation=cv2.INTER_AREA)
+        )
+    
+    def test_invalid_inputs(self):
+        with pytest.raises(ValueError):
+            FrameContext(np.zeros((0, 0, 3), dtype=np.uint8))
+        
+        with pytest.raises(ValueError):
+            FrameContext(np.zeros((4, 4, 3, 1), dtype=np.uint8))
+        
+        context = FrameContext(_frame())
+        with pytest.raises(ValueError):
+            context.resized((0, 10))
+        
+        with pytest.raises(ValueError):
+            context.resized((10, 10), source='hsv')
+    
+    def test_no_frame(self):
+        with pytest.raises(RuntimeError):
+            FrameContext().gray()
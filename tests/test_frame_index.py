@@ -0,0 +1,99 @@
+"""
+Tests for FrameIndex
+"""
+
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from src.io.frame_index import FrameIndex, FrameIndexError
+
+
+@pytest.fixture
+def dummy_video_path(tmp_path):
+    """Create a 12-frame dummy video at 30 fps."""
+    video_path = tmp_path / "test_video.mp4"
+    
+    out = cv2.VideoWriter(
+        str(video_path), cv2.VideoWriter_fourcc(*'mp4v'), 30.0, (160, 120)
+    )
+    for i in range(12):
+        frame = np.full((120, 160, 3), i * 20, dtype=np.uint8)
+        out.write(frame)
+    out.release()
+    
+    return str(video_path)
+
+
+class TestFrameIndex:
+    """Test suite for FrameIndex."""
+    
+    def test_build_counts_frames(self, dummy_video_path):
+        """Test build indexes every frame with increasing timestamps."""
+        index = FrameIndex.build(dummy_video_path)
+        
+        assert index.frame_count == 12
+        assert index.timestamp(0) == pytest.approx(0.0)
+        assert np.all(np.diff(index.pts) > 0)
+        assert index.frame_interval == pytest.approx(1 / 30, rel=1e-3)
+        assert index.matches(dummy_video_path)
+    
+    def test_save_load_roundtrip(self, tmp_path):
+        """Test the binary sidecar round-trip."""
+        keyframes = np.array([True, False, False, True, False])
+        index = FrameIndex(
+            pts=np.arange(5) * 0.04, keyframes=keyframes,
+            video_size=123, video_mtime_ns=456
+        )
+        path = str(tmp_path / "v.fidx")
+        
+        index.save(path)
+        loaded = FrameIndex.load(path)
+        
+        assert np.array_equal(loaded.pts, index.pts)
+        assert np.array_equal(loaded.keyframes, keyframes)
+        assert loaded.has_keyframes
+        assert (loaded.video_size, loaded.video_mtime_ns) == (123, 456)
+    
+    def test_lookups(self):
+        """Test frame_at and keyframe_before on irregular timestamps."""
+        index = FrameIndex(
+            pts=np.array([0.0, 0.03, 0.07, 0.10, 0.18]),
+            keyframes=np.array([True, False, False, True, False])
+        )
+        
+        assert index.frame_at(0.0) == 0
+        assert index.frame_at(0.05) == 2
+        assert index.frame_at(0.10) == 3
+        assert index.frame_at(1.0) == 5
+        assert index.keyframe_before(2) == 0
+        assert index.keyframe_before(3) == 3
+        assert index.keyframe_before(4) == 3
+    
+    def test_load_or_build_rebuilds_stale_sidecar(self, dummy_video_path):
+        """Test a sidecar for another version of the video is rebuilt."""
+        sidecar = FrameIndex.sidecar_path(dummy_video_path)
+        FrameIndex(pts=np.arange(3) * 0.1, video_size=1).save(sidecar)
+        
+        index = FrameIndex.load_or_build(dummy_video_path)
+        
+        assert index.frame_count == 12
+        assert FrameIndex.load(sidecar).frame_count == 12
+    
+    def test_load_truncated_raises(self, tmp_path):
+        """Test truncated sidecars are rejected."""
+        path = str(tmp_path / "v.fidx")
+        FrameIndex(pts=np.arange(8) * 0.1).save(path)
+        
+        with open(path, 'r+b') as f:
+            f.truncate(os.path.getsize(path) - 4)
+        
+        with pytest.raises(FrameIndexError):
+            FrameIndex.load(path)
+    
+    def test_empty_index_raises(self):
+        """Test an index needs at least one frame."""
+        with pytest.raises(FrameIndexError):
+            FrameIndex(pts=np.array([]))
@@ -0,0 +1,96 @@
+"""
+Tests for FramePool
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from src.io.frame_pool import FramePool
+
+
+class TestFramePool:
+    """Tests for FramePool class."""
+    
+    def test_acquire_allocates_shape_and_dtype(self):
+        """Test acquire returns a buffer with the requested format."""
+        pool = FramePool()
+        
+        buffer = pool.acquire((48, 64, 3))
+        
+        assert buffer.shape == (48, 64, 3)
+        assert buffer.dtype == np.uint8
+        assert pool.allocations == 1
+    
+    def test_release_and_reuse(self):
+        """Test released buffers are returned by the next acquire."""
+        pool = FramePool()
+        buffer = pool.acquire((48, 64, 3))
+        
+        pool.release(buffer)
+        
+        assert len(pool) == 1
+        assert pool.acquire((48, 64, 3)) is buffer
+        assert pool.allocations == 1
+    
+    def test_buffers_are_keyed_by_shape(self):
+        """Test a buffer is only reused for the same shape."""
+        pool = FramePool()
+        pool.release(np.empty((48, 64, 3), dtype=np.uint8))
+        
+        buffer = pool.acquire((24, 32, 3))
+        
+        assert buffer.shape == (24, 32, 3)
+        assert len(pool) == 1
+    
+    def test_max_buffers_limit(self):
+        """Test that at most max_buffers free buffers are retained."""
+        pool = FramePool(max_buffers=2)
+        
+        for _ in range(5):
+            pool.release(np.empty((8, 8, 3), dtype=np.uint8))
+        
+        assert len(pool) == 2
+    
+    def test_release_ignores_views_and_duplicates(self):
+        """Test views are not pooled and a buffer is not pooled twice."""
+        pool = FramePool()
+        buffer = np.empty((8, 8, 3), dtype=np.uint8)
+        
+        pool.release(buffer[:4])
+        pool.release(buffer)
+        pool.release(buffer)
+        pool.release(None)
+        
+        assert len(pool) == 1
+    
+    def test_thread_safety(self):
+        """Test concurrent acquire/release does not lose buffers."""
+        pool = FramePool(max_buffers=16)
+        
+        def worker():
+            for _ in range(200):
+                pool.release(pool.acquire((8, 8, 3)))
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert pool.allocations <= 4
+    
+    def test_clear(self):
+        """Test clear drops all free buffers."""
+        pool = FramePool()
+        pool.release(np.empty((8, 8, 3), dtype=np.uint8))
+        
+        pool.clear()
+        
+        assert len(pool) == 0
+    
+    def test_invalid_max_buffers(self):
+        """Test that max_buffers must be positive."""
+        with pytest.raises(ValueError):
+            FramePool(max_buffers=0)
@@ -0,0 +1,92 @@
+"""
+Tests for Micro Batcher
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.face.batcher import MicroBatcher
+
+
+class RecordingFn:
+    """Função de lote de teste: dobra os itens e registra cada lote."""
+    
+    def __init__(self, gate=None):
+        self.batches = []
+        self.gate = gate
+    
+    def __call__(self, items):
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        self.batches.append(list(items))
+        return [item * 2 for item in items]
+
+
+class TestMicroBatcher:
+    """Tests for MicroBatcher class."""
+    
+    def test_invalid_parameters(self):
+        with pytest.raises(ValueError):
+            MicroBatcher(RecordingFn(), max_batch=0)
+        
+        with pytest.raises(ValueError):
+            MicroBatcher(RecordingFn(), max_wait_ms=-1)
+    
+    def test_full_batches_and_order(self):
+        """Items already queued form full batches; results follow items."""
+        gate = threading.Event()
+        fn = RecordingFn(gate)
+        batcher = MicroBatcher(fn, max_batch=4, max_wait_ms=200)
+        
+        # O primeiro lote segura a thread enquanto os demais itens chegam
+        futures = [batcher.submit(i) for i in range(9)]
+        gate.set()
+        
+        assert [future.result(timeout=5) for future in futures] == [2 * i for i in range(9)]
+        batcher.close()
+        
+        assert fn.batches == [[0, 1, 2, 3], [4, 5, 6, 7], [8]]
+        assert batcher.mean_batch_size() == 3.0
+    
+    def test_deadline_flushes_partial_batch(self):
+        fn = RecordingFn()
+        batcher = MicroBatcher(fn, max_batch=8, max_wait_ms=20)
+        
+        start = time.monotonic()
+        assert batcher.submit(5).result(timeout=5) == 10
+        
+        assert time.monotonic() - start < 2.0
+        assert fn.batches == [[5]]
+        batcher.close()
+    
+    def test_exception_reaches_every_future(self):
+        def failing(items):
+            raise RuntimeError("model failed")
+        
+        batcher = MicroBatcher(failing, max_batch=2, max_wait_ms=50)
+        futures = [batcher.submit(i) for i in range(2)]
+        
+        for future in futures:
+            with pytest.raises(RuntimeError, match="model failed"):
+                future.result(timeout=5)
+        batcher.close()
+    
+    def test_result_count_mismatch(self):
+        batcher = MicroBatcher(lambda items: [], max_batch=1)
+        
+        with pytest.raises(RuntimeError):
+            batcher.submit(1).result(timeout=5)
+        batcher.close()
+    
+    def test_close_flushes_and_rejects(self):
+        fn = RecordingFn()
+        batcher = MicroBatcher(fn, max_batch=8, max_wait_ms=5000)
+        future = batcher.submit(3)
+        
+        batcher.close()
+        
+        assert future.result(timeout=0) == 6
+        with pytest.raises(RuntimeError):
+            batcher.submit(1)
@@ -0,0 +1,102 @@
+"""
+Tests for Motion Gate
+"""
+
+import numpy as np
+import pytest
+
+from src.pipeline.motion_gate import MotionGate
+
+
+@pytest.fixture
+def frame():
+    """Static 480x640 scene with some structure."""
+    frame = np.full((480, 640, 3), 80, dtype=np.uint8)
+    frame[100:300, 200:400] = 200
+    return frame
+
+
+class TestMotionGate:
+    """Tests for MotionGate class."""
+    
+    def test_invalid_parameters(self):
+        with pytest.raises(ValueError):
+            MotionGate(threshold=1.5)
+        
+        with pytest.raises(ValueError):
+            MotionGate(pixel_threshold=300)
+        
+        with pytest.raises(ValueError):
+            MotionGate(max_gated=0)
+    
+    def test_first_frame_always_changed(self, frame):
+        gate = MotionGate()
+        
+        assert gate.changed(frame)
+        assert gate.gated == 0
+    
+    def test_static_frames_are_gated(self, frame):
+        gate = MotionGate(threshold=0.01)
+        gate.changed(frame)
+        
+        for _ in range(5):
+            assert not gate.changed(frame.copy())
+        
+        assert gate.frames == 6
+        assert gate.gated == 5
+    
+    def test_sensor_noise_is_gated(self, frame):
+        """Small per-pixel noise is averaged out by the downscale."""
+        rng = np.random.default_rng(0)
+        gate = MotionGate(threshold=0.01)
+        gate.changed(frame)
+        
+        noise = rng.integers(-10, 11, size=frame.shape)
+        noisy = np.clip(frame.astype(int) + noise, 0, 255).astype(np.uint8)
+        
+        assert not gate.changed(noisy)
+    
+    def test_motion_opens_gate(self, frame):
+        gate = MotionGate(threshold=0.01)
+        gate.changed(frame)
+        
+        moved = frame.copy()
+        moved[300:400, 0:120] = 255
+        
+        assert gate.changed(moved)
+        assert gate.last_ratio >= 0.01
+    
+    def test_slow_change_accumulates_against_reference(self, frame):
+        """The reference is the last accepted frame, so drift adds up."""
+        gate = MotionGate(threshold=0.05, max_gated=100)
+        gate.changed(frame)
+        
+        results = []
+        for step in range(1, 11):
+            drifted = frame.copy()
+            drifted[300:300 + 10 * step, 0:200] = 255
+            results.append(gate.changed(drifted))
+        
+        assert not results[0]
+        assert any(results)
+    
+    def test_max_gated_forces_refresh(self, frame):
+        gate = MotionGate(threshold=0.01, max_gated=3)
+        
+        results = [gate.changed(frame) for _ in range(6)]
+        
+        assert results == [True, False, False, False, True, False]
+    
+    def test_grayscale_frames(self, frame):
+        gate = MotionGate()
+        gray = frame[:, :, 0].copy()
+        
+        assert gate.changed(gray)
+        assert not gate.changed(gray)
+    
+    def test_reset(self, frame):
+        gate = MotionGate()
+        gate.changed(frame)
+        gate.reset()
+        
+        assert gate.changed(frame)
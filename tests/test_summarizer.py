@@ -0,0 +1,107 @@
+"""
+Tests for Summarizer
+"""
+
+import pytest
+
+from src.pipeline.anomaly_detector import Anomaly, AnomalyDetector
+from src.pipeline.summarizer import Summarizer
+
+
+class TestSummarizer:
+    """Test suite for Summarizer."""
+    
+    def test_faces_and_emotions_aggregation(self):
+        """Test incremental face statistics and emotion counts."""
+        summarizer = Summarizer("video.mp4")
+        
+        summarizer.add_frame_data(0, faces=[object(), object()], emotions=[{'label': 'happy'}])
+        summarizer.add_frame_data(1, faces=[], emotions=[])
+        summarizer.add_frame_data(2, faces=[object()], emotions=[{'label': 'happy'}, {'label': 'sad'}])
+        
+        summary = summarizer.generate_summary(fps=30.0, total_frames=3)
+        
+        assert summary.faces_stats == {
+            'total_detections': 3,
+            'avg_faces_per_frame': pytest.approx(1.0),
+            'max_faces_in_frame': 2,
+            'frames_with_faces': 2,
+            'frames_without_faces': 1
+        }
+        assert summary.emotions_distribution == {'happy': 2, 'sad': 1}
+        assert summarizer.get_top_emotions(1) == [('happy', 2)]
+    
+    def test_max_events_bounds_history_but_keeps_totals(self):
+        """Test max_events keeps only recent events while totals cover everything."""
+        summarizer = Summarizer("stream", max_events=3)
+        
+        for i in range(10):
+            summarizer.add_activities([{'label': 'walking', 'start': i}])
+            summarizer.add_anomalies([
+                Anomaly(frame_idx=i, metric_name='faces_count', value=5.0,
+                        expected_range=(0.0, 1.0), z_score=3.5, severity='medium')
+            ])
+        
+        summary = summarizer.generate_summary(fps=30.0, total_frames=10)
+        
+        assert [a['start'] for a in summary.activities_timeline] == [7, 8, 9]
+        assert summary.anomalies_total == 10
+        assert summary.anomalies_by_severity['medium'] == 10
+        assert summarizer.get_activity_summary() == {'walking': 10}
+        assert len(summarizer.anomalies_list) == 3
+    
+    def test_reset(self):
+        """Test reset clears aggregates."""
+        summarizer = Summarizer("video.mp4")
+        summarizer.add_frame_data(0, faces=[object()], emotions=[{'label': 'happy'}])
+        
+        summarizer.reset()
+        
+        summary = summarizer.generate_summary(fps=30.0, total_frames=0)
+        assert summary.faces_stats['total_detections'] == 0
+        assert summary.emotions_distribution == {}
+    
+    def test_clips_are_indexed_in_summary(self):
+        """Test event clips end up in the summary dictionary."""
+        summarizer = Summarizer("video.mp4")
+        clip = {'path': 'clips/clip_000_f000040.mp4', 'start_frame': 30, 'end_frame': 45}
+        
+        summarizer.add_clips([clip])
+        
+        assert summarizer.get_metrics_dict(fps=30.0, total_frames=100)['clips'] == [clip]
+        
+        summarizer.reset()
+        assert summarizer.generate_summary(fps=30.0, total_frames=0).clips == []
+    
+    def test_gated_frames_are_counted(self):
+        """Test frames with reused results are counted in the summary."""
+        summarizer = Summarizer("test.mp4")
+        
+        summarizer.add_frame_data(0, faces=[], emotions=[])
+        summarizer.add_frame_data(1, faces=[], emotions=[], gated=True)
+        summarizer.add_frame_data(2, faces=[], emotions=[], gated=True)
+        
+        summary = summarizer.get_metrics_dict(fps=30.0, total_frames=3)
+        assert summary['frames_gated'] == 2
+        assert summarizer.frames_processed == 3
+        
+        summarizer.reset()
+        assert summarizer.frames_gated == 0
+
+
+class TestAnomalyDetectorHistory:
+    """Tests for AnomalyDetector history bound."""
+    
+    def test_max_history(self):
+        """Test only the last max_history anomalies are kept."""
+        detector = AnomalyDetector(window_size=20, z_threshold=2.0, min_samples=5, max_history=2)
+        
+        detected = 0
+        for i in range(40):
+            value = 100.0 if i % 10 == 9 else float(i % 2)
+            detected += len(detector.update(i, {'faces_count': value}))
+        
+        anomalies = detector.get_all_anomalies()
+        assert detected > 2
+        assert isinstance(anomalies, list)
+        assert len(anomalies) == 2
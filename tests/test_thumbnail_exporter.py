@@ -0,0 +1,107 @@
+"""
+Tests for ThumbnailExporter
+"""
+
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+from src.io.thumbnail_exporter import ThumbnailExporter, ThumbnailExportError
+
+
+def _frame(level, size=(640, 360)):
+    """Generate a BGR frame with a uniform gray level."""
+    width, height = size
+    return np.full((height, width, 3), level, dtype=np.uint8)
+
+
+class TestThumbnailExporter:
+    """Test suite for ThumbnailExporter."""
+    
+    def test_interval_and_event_thumbnails(self, tmp_path):
+        """Test periodic and event-driven captures with their reasons."""
+        with ThumbnailExporter(str(tmp_path), interval_sec=1.0, max_side=160) as exporter:
+            for i in range(30):
+                reasons = ["anomaly:faces_count"] if i == 13 else []
+                exporter.capture(_frame(i), i, i / 10.0, reasons=reasons)
+        
+        captured = [(t['frame_idx'], t['reasons']) for t in exporter.thumbnails]
+        assert captured == [
+            (0, ["interval"]),
+            (10, ["interval"]),
+            (13, ["anomaly:faces_count"]),
+            (20, ["interval"])
+        ]
+        
+        image = cv2.imread(exporter.thumbnails[0]['path'])
+        assert image.shape == (90, 160, 3)
+    
+    def test_frame_can_be_reused_after_capture(self, tmp_path):
+        """Test the exporter copies the frame before the caller reuses it."""
+        frame = _frame(200)
+        
+        with ThumbnailExporter(str(tmp_path), interval_sec=1.0) as exporter:
+            exporter.capture(frame, 0, 0.0)
+            frame[:] = 0
+        
+        assert cv2.imread(exporter.thumbnails[0]['path']).mean() > 150
+    
+    def test_contact_sheets_and_index(self, tmp_path):
+        """Test full sheets are written as they fill and the remainder at release."""
+        with ThumbnailExporter(
+            str(tmp_path), interval_sec=0, sheet_columns=2, sheet_rows=2, tile_width=80,
+            image_format="webp"
+        ) as exporter:
+            for i in range(6):
+                exporter.capture(_frame(i * 40), i, float(i), reasons=["activity:walking"])
+        
+        assert [sheet['frames'] for sheet in exporter.sheets] == [[0, 1, 2, 3], [4, 5]]
+        
+        full_sheet = cv2.imread(exporter.sheets[0]['path'])
+        assert full_sheet.shape == (90, 160, 3)
+        assert exporter.sheets[1]['path'].endswith(".webp")
+        
+        with open(tmp_path / "index.json") as f:
+            index = json.load(f)
+        assert len(index['thumbnails']) == 6
+        assert len(index['contact_sheets']) == 2
+    
+    def test_gray_frames(self, tmp_path):
+        """Test grayscale frames (ffmpeg pix_fmt='gray') produce color thumbnails and sheets."""
+        with ThumbnailExporter(
+            str(tmp_path), interval_sec=0, sheet_columns=2, sheet_rows=1, tile_width=80
+        ) as exporter:
+            for i in range(2):
+                exporter.capture(_frame(100)[..., 0].copy(), i, float(i), reasons=["anomaly:x"])
+        
+        assert cv2.imread(exporter.thumbnails[0]['path']).ndim == 3
+        assert len(exporter.sheets) == 1
+    
+    def test_no_reason_no_capture(self, tmp_path):
+        """Test frames without events are skipped when the interval is disabled."""
+        with ThumbnailExporter(str(tmp_path), interval_sec=0) as exporter:
+            assert exporter.capture(_frame(10), 0, 0.0) is False
+        
+        assert exporter.thumbnails == []
+        assert exporter.sheets == []
+    
+    def test_write_failure_raises(self, tmp_path):
+        """Test encoding errors surface on release."""
+        # Um diretório no caminho da miniatura impede a escrita
+        (tmp_path / "thumb_f000000.jpg").mkdir()
+        
+        exporter = ThumbnailExporter(str(tmp_path), interval_sec=1.0)
+        exporter.capture(_frame(10), 0, 0.0)
+        
+        with pytest.raises(ThumbnailExportError):
+            exporter.release()
+    
+    def test_invalid_options(self, tmp_path):
+        """Test invalid options are rejected."""
+        with pytest.raises(ValueError):
+            ThumbnailExporter(str(tmp_path), image_format="png")
+        
+        with pytest.raises(ValueError):
+            ThumbnailExporter(str(tmp_path), quality=0)
@@ -2,14 +2,65 @@
 Tests for VideoReader class
 """
 
+import io
 import os
+import shutil
+import threading
+import time
 from pathlib import Path
 
 import cv2
 import numpy as np
 import pytest
 
-from src.io.video_reader import VideoReader, VideoNotFoundError, VideoOpenError
+from src.io.ffmpeg_capture import FFmpegCapture
+from src.io.frame_index import FrameIndex
+from src.io.frame_pool import FramePool
+from src.io.video_reader import (
+    VideoReader, VideoNotFoundError, VideoOpenError, VideoReaderError
+)
+
+
+class OvershootingCapture:
+    """
+    Captura de teste cujo seek por tempo passa do ponto.
+    
+    Um seek para o PTS de um keyframe real cai exatamente nele; qualquer
+    outro PTS cai um frame depois do próximo keyframe. POS_MSEC devolve o
+    PTS do último frame lido, como no OpenCV.
+    """
+    
+    def __init__(self, pts, keyframe_interval):
+        self.pts = pts
+        self.keyframe_interval = keyframe_interval
+        self.position = 0
+        self.grabs = 0
+    
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            self.position = int(value)
+        elif prop == cv2.CAP_PROP_POS_MSEC:
+            frame = int(np.searchsorted(self.pts, value / 1000.0 - 1e-6))
+            if frame % self.keyframe_interval == 0:
+                self.position = frame
+            else:
+                next_keyframe = -(-frame // self.keyframe_interval) * self.keyframe_interval
+                self.position = min(next_keyframe + 1, len(self.pts))
+        return True
+    
+    def get(self, prop):
+        assert prop == cv2.CAP_PROP_POS_MSEC
+        return self.pts[self.position - 1] * 1000.0 if self.position > 0 else 0.0
+    
+    def grab(self):
+        if self.position >= len(self.pts):
+            return False
+        self.position += 1
+        self.grabs += 1
+        return True
+    
+    def release(self):
+        pass
 
 
 class TestVideoReader:
@@ -165,6 +216,439 @@ class TestVideoReader:
         assert first_iteration_count == reader.frame_count()
         
         reader.release()
+    
+    def test_prefetch_yields_same_frames(self, dummy_video_path):
+        """Test that prefetch mode yields the same frames in the same order."""
+        with VideoReader(str(dummy_video_path)) as reader:
+            expected = [(idx, frame.copy(), ts) for idx, frame, ts in reader]
+        
+        with VideoReader(str(dummy_video_path), prefetch=3) as reader:
+            actual = [(idx, frame, ts) for idx, frame, ts in reader]
+        
+        assert len(actual) == len(expected)
+        for (idx_a, frame_a, ts_a), (idx_e, frame_e, ts_e) in zip(actual, expected):
+            assert idx_a == idx_e
+            assert ts_a == ts_e
+            assert np.array_equal(frame_a, frame_e)
+    
+    def test_prefetch_early_break_stops_thread(self, dummy_video_path):
+        """Test that breaking out of a prefetch iteration stops the worker."""
+        reader = VideoReader(str(dummy_video_path), prefetch=2)
+        
+        for idx, frame, ts in reader:
+            if idx == 1:
+                break
+        
+        assert reader._prefetch_thread is None
+        
+        # Deve ser possível iterar novamente do início
+        assert sum(1 for _ in reader) == reader.frame_count()
+        
+        reader.release()
+    
+    def test_prefetch_release_during_iteration(self, dummy_video_path):
+        """Test that release() stops the prefetch worker mid-iteration."""
+        reader = VideoReader(str(dummy_video_path), prefetch=2)
+        iterator = iter(reader)
+        
+        next(iterator)
+        thread = reader._prefetch_thread
+        reader.release()
+        
+        assert thread is not None
+        assert not thread.is_alive()
+    
+    def test_stride_yields_original_indices(self, dummy_video_path):
+        """Test that stride skips frames but keeps source indices and timestamps."""
+        with VideoReader(str(dummy_video_path), stride=3) as reader:
+            items = [(idx, ts) for idx, _, ts in reader]
+            fps = reader.fps()
+            
+            assert [idx for idx, _ in items] == [0, 3, 6, 9]
+            assert len(items) == reader.sampled_frame_count()
+        
+        for idx, ts in items:
+            assert ts == pytest.approx(idx / fps)
+    
+    def test_stride_frames_match_full_decode(self, dummy_video_path):
+        """Test that strided frames have the same content as a full decode."""
+        with VideoReader(str(dummy_video_path)) as reader:
+            full = {idx: frame.copy() for idx, frame, _ in reader}
+        
+        with VideoReader(str(dummy_video_path), stride=4) as reader:
+            for idx, frame, _ in reader:
+                assert np.array_equal(frame, full[idx])
+    
+    def test_frame_window(self, dummy_video_path):
+        """Test start_frame/end_frame window (end exclusive)."""
+        with VideoReader(str(dummy_video_path), start_frame=2, end_frame=7, stride=2) as reader:
+            indices = [idx for idx, _, _ in reader]
+            
+            assert indices == [2, 4, 6]
+            assert reader.sampled_frame_count() == 3
+    
+    def test_seconds_window(self, dummy_video_path):
+        """Test start_sec/end_sec window is converted using FPS."""
+        with VideoReader(str(dummy_video_path), start_sec=0.1, end_sec=0.2) as reader:
+            indices = [idx for idx, _, _ in reader]
+        
+        # 30 fps: 0.1s -> frame 3, 0.2s -> frame 6
+        assert indices == [3, 4, 5]
+    
+    def test_long_gap_uses_seek(self, dummy_video_path, monkeypatch):
+        """Test that gaps above SEEK_MIN_GAP seek instead of grabbing."""
+        monkeypatch.setattr(VideoReader, "SEEK_MIN_GAP", 2)
+        
+        with VideoReader(str(dummy_video_path), stride=4) as reader:
+            indices = [idx for idx, _, _ in reader]
+        
+        assert indices == [0, 4, 8]
+    
+    def test_invalid_window_raises(self, dummy_video_path):
+        """Test invalid stride and window arguments."""
+        with pytest.raises(ValueError):
+            VideoReader(str(dummy_video_path), stride=0)
+        
+        with pytest.raises(ValueError):
+            VideoReader(str(dummy_video_path), start_frame=5, end_frame=5)
+        
+        with pytest.raises(ValueError):
+            VideoReader(str(dummy_video_path), start_frame=1, start_sec=0.5)
+    
+    def test_max_side_downscales_frames(self, dummy_video_path):
+        """Test that max_side yields reduced frames and exposes the factor."""
+        with VideoReader(str(dummy_video_path), max_side=320) as reader:
+            assert reader.scale_factor() == pytest.approx(0.5)
+            
+            for idx, frame, ts in reader:
+                assert frame.shape == (240, 320, 3)
+    
+    def test_iter_full_and_scaled(self, dummy_video_path):
+        """Test iterating original and reduced frames together."""
+        with VideoReader(str(dummy_video_path), scale=0.25, stride=5) as reader:
+            items = list(reader.iter_full_and_scaled())
+        
+        assert [item[0] for item in items] == [0, 5]
+        for idx, full, scaled, ts in items:
+            assert full.shape == (480, 640, 3)
+            assert scaled.shape == (120, 160, 3)
+    
+    def test_no_scale_returns_same_frame(self, dummy_video_path):
+        """Test that without scaling both frames are the same object."""
+        with VideoReader(str(dummy_video_path)) as reader:
+            assert reader.scale_factor() == 1.0
+            for idx, full, scaled, ts in reader.iter_full_and_scaled():
+                assert scaled is full
+                break
+    
+    def test_invalid_scale_raises(self, dummy_video_path):
+        """Test invalid scale arguments."""
+        with pytest.raises(ValueError):
+            VideoReader(str(dummy_video_path), scale=1.5)
+        
+        with pytest.raises(ValueError):
+            VideoReader(str(dummy_video_path), scale=0.5, max_side=320)
+    
+    def test_pool_reuses_buffers(self, dummy_video_path):
+        """Test that released frames are reused for the next decodes."""
+        pool = FramePool(max_buffers=2)
+        
+        with VideoReader(str(dummy_video_path)) as reader:
+            expected = [frame.copy() for _, frame, _ in reader]
+        
+        with VideoReader(str(dummy_video_path), pool=pool) as reader:
+            for idx, frame, ts in reader:
+                assert np.array_equal(frame, expected[idx])
+                pool.release(frame)
+        
+        # 1º frame alocado pelo OpenCV + 1 buffer do pool
+        assert pool.allocations <= 1
+    
+    def test_pool_reuses_full_buffers_when_downscaling(self, dummy_video_path):
+        """Test full-resolution buffers go back to the pool when only scaled frames are yielded."""
+        pool = FramePool(max_buffers=4)
+        
+        with VideoReader(str(dummy_video_path), max_side=320, pool=pool) as reader:
+            for _ in range(3):
+                for idx, frame, ts in reader:
+                    assert frame.shape == (240, 320, 3)
+                    pool.release(frame)
+        
+        # 1 buffer em resolução original + 1 reduzido (30 frames decodificados)
+        assert pool.allocations <= 2
+    
+    def test_frame_size_from_metadata(self, dummy_video_path):
+        """Test frame_size returns (width, height) of the source video."""
+        with VideoReader(str(dummy_video_path), max_side=320) as reader:
+            assert reader.frame_size() == (640, 480)
+    
+    def test_frame_size_fallback_reads_first_frame(self, dummy_video_path):
+        """Test fallback when the container does not report dimensions."""
+        with VideoReader(str(dummy_video_path)) as reader:
+            reader._frame_size = None
+            
+            assert reader.frame_size() == (640, 480)
+            
+            # A iteração seguinte continua começando do frame 0
+            assert [idx for idx, _, _ in reader][0] == 0
+            assert sum(1 for _ in reader) == reader.frame_count()
+    
+    def test_prefetch_negative_raises(self, dummy_video_path):
+        """Test that a negative prefetch depth is rejected."""
+        with pytest.raises(ValueError):
+            VideoReader(str(dummy_video_path), prefetch=-1)
+    
+    def test_live_mode_unknown_length(self, dummy_video_path):
+        """Test live mode: unknown length, counts grow and wall-clock timestamps."""
+        with VideoReader(str(dummy_video_path), source_mode="live", stride=2) as reader:
+            assert reader.is_streaming()
+            assert reader.frame_count() == 0
+            
+            frames = list(reader)
+            
+            assert reader.frame_count() == 9
+            with pytest.raises(VideoReaderError):
+                reader.read_frame(0)
+        
+        timestamps = [ts for _, _, ts in frames]
+        assert [idx for idx, _, _ in frames] == [0, 2, 4, 6, 8]
+        assert timestamps == sorted(timestamps)
+        assert reader.duration() == pytest.approx(timestamps[-1])
+    
+    def test_live_device_index_not_validated_as_file(self):
+        """Test a camera index is opened directly instead of checked as a path."""
+        with pytest.raises(VideoOpenError):
+            VideoReader("99", source_mode="live")
+    
+    def test_tail_mode_follows_growing_file(self, tmp_path, monkeypatch):
+        """Test tail mode keeps reading while the file grows."""
+        monkeypatch.setattr(VideoReader, "TAIL_POLL_INTERVAL", 0.05)
+        
+        full_path = tmp_path / "full.avi"
+        out = cv2.VideoWriter(str(full_path), cv2.VideoWriter_fourcc(*'MJPG'), 10.0, (160, 120))
+        for i in range(30):
+            out.write(np.full((120, 160, 3), i * 8, dtype=np.uint8))
+        out.release()
+        
+        data = full_path.read_bytes()
+        growing = tmp_path / "growing.avi"
+        growing.write_bytes(data[:len(data) // 2])
+        
+        def append_rest():
+            time.sleep(0.3)
+            with open(growing, 'ab') as f:
+                f.write(data[len(data) // 2:])
+        
+        thread = threading.Thread(target=append_rest)
+        thread.start()
+        
+        with VideoReader(str(growing), source_mode="tail", tail_timeout=1.0) as reader:
+            frames = [(idx, int(frame[0, 0, 0])) for idx, frame, _ in reader]
+        thread.join()
+        
+        assert [idx for idx, _ in frames] == list(range(30))
+        for idx, value in frames:
+            assert abs(value - idx * 8) < 4
+        assert reader.frame_count() == 30
+    
+    def test_streaming_invalid_options(self, dummy_video_path):
+        """Test options that need a seekable file are rejected in streaming modes."""
+        with pytest.raises(ValueError):
+            VideoReader(str(dummy_video_path), source_mode="camera")
+        
+        with pytest.raises(ValueError):
+            VideoReader(str(dummy_video_path), source_mode="live", start_sec=1.0)
+        
+        with pytest.raises(ValueError):
+            VideoReader(str(dummy_video_path), source_mode="tail", use_index=True)
+    
+    def test_from_buffer(self, dummy_video_path):
+        """Test reading a video held in memory and releasing its source."""
+        with VideoReader(str(dummy_video_path)) as reader:
+            expected = [frame.copy() for _, frame, _ in reader]
+        
+        data = io.BytesIO(dummy_video_path.read_bytes())
+        reader = VideoReader.from_buffer(data, name="upload.mp4")
+        source_path = reader.path
+        
+        frames = [frame for _, frame, _ in reader]
+        reader.release()
+        
+        assert len(frames) == len(expected)
+        for frame, frame_expected in zip(frames, expected):
+            assert np.array_equal(frame, frame_expected)
+        assert not os.path.exists(source_path) or source_path.startswith("/proc/")
+    
+    def test_use_index_builds_sidecar(self, dummy_video_path):
+        """Test use_index creates the sidecar and uses indexed timestamps."""
+        with VideoReader(str(dummy_video_path), use_index=True) as reader:
+            assert reader.frame_count() == 10
+            frames = list(reader)
+        
+        assert os.path.isfile(str(dummy_video_path) + ".fidx")
+        assert [idx for idx, _, _ in frames] == list(range(10))
+        for idx, _, ts in frames:
+            assert ts == pytest.approx(reader.index.timestamp(idx))
+    
+    def test_read_frame_random_access(self, dummy_video_path):
+        """Test read_frame returns the same content as a full decode."""
+        with VideoReader(str(dummy_video_path)) as reader:
+            full = [frame.copy() for _, frame, _ in reader]
+        
+        with VideoReader(str(dummy_video_path), use_index=True) as reader:
+            for idx in (7, 2, 9, 0, 1, 5):
+                assert np.array_equal(reader.read_frame(idx), full[idx])
+            
+            with pytest.raises(IndexError):
+                reader.read_frame(10)
+    
+    def test_index_seek_lands_on_target(self, dummy_video_path, monkeypatch):
+        """Test indexed seeks inside strided iteration land on the right frame."""
+        monkeypatch.setattr(VideoReader, "SEEK_MIN_GAP", 2)
+        
+        with VideoReader(str(dummy_video_path)) as reader:
+            full = [frame.copy() for _, frame, _ in reader]
+        
+        with VideoReader(str(dummy_video_path), use_index=True, stride=3, start_frame=2) as reader:
+            frames = [(idx, frame.copy()) for idx, frame, _ in reader]
+        
+        assert [idx for idx, _ in frames] == [2, 5, 8]
+        for idx, frame in frames:
+            assert np.array_equal(frame, full[idx])
+    
+    
+    @pytest.mark.parametrize("known_keyframes", [True, False])
+    def test_overshooting_seek_steps_back(self, dummy_video_path, known_keyframes):
+        """Test an overshooting seek retries from an earlier point, not frame 0."""
+        pts = np.arange(900) / 30.0
+        keyframes = (np.arange(900) % 30 == 0) if known_keyframes else None
+        
+        with VideoReader(str(dummy_video_path), use_index=True) as reader:
+            reader._cap.release()
+            reader._cap = capture = OvershootingCapture(pts, keyframe_interval=30)
+            reader.index = FrameIndex(pts, keyframes)
+            
+            reader._seek(850)
+        
+        assert capture.position == 850
+        # Linear a partir do início seriam 850 grabs
+        limit = 30 if known_keyframes else 2 * VideoReader.SEEK_MIN_GAP
+        assert capture.grabs <= limit
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not available")
+class TestVideoReaderFFmpegBackend:
+    """Tests for the ffmpeg subprocess backend."""
+    
+    @pytest.fixture
+    def dummy_video_path(self, tmp_path):
+        """Create a 20-frame dummy video with per-frame colors."""
+        video_path = tmp_path / "test_video.avi"
+        
+        out = cv2.VideoWriter(
+            str(video_path), cv2.VideoWriter_fourcc(*'MJPG'), 10.0, (320, 240)
+        )
+        for i in range(20):
+            frame = np.zeros((240, 320, 3), dtype=np.uint8)
+            frame[:, :] = (i * 12, 100, 255 - i * 12)
+            out.write(frame)
+        out.release()
+        
+        return video_path
+    
+    def test_ffmpeg_matches_opencv(self, dummy_video_path):
+        """Test ffmpeg backend yields the same frames and metadata as OpenCV."""
+        with VideoReader(str(dummy_video_path)) as reader:
+            expected = [(idx, frame.copy(), ts) for idx, frame, ts in reader]
+        
+        with VideoReader(str(dummy_video_path), backend="ffmpeg") as reader:
+            assert reader.frame_size() == (320, 240)
+            assert reader.fps() == pytest.approx(10.0)
+            actual = list(reader)
+        
+        assert len(actual) == len(expected)
+        for (idx_a, frame_a, ts_a), (idx_e, frame_e, ts_e) in zip(actual, expected):
+            assert idx_a == idx_e
+            assert ts_a == pytest.approx(ts_e)
+            assert np.abs(frame_a.astype(int) - frame_e).mean() < 3
+    
+    def test_ffmpeg_gray_scaled(self, dummy_video_path):
+        """Test ffmpeg decoding straight to low-resolution grayscale."""
+        with VideoReader(
+            str(dummy_video_path), backend="ffmpeg", pix_fmt="gray", decode_max_side=160
+        ) as reader:
+            assert reader.frame_size() == (160, 120)
+            
+            for idx, frame, ts in reader:
+                assert frame.shape == (120, 160)
+                assert frame.dtype == np.uint8
+    
+    def test_ffmpeg_decode_fps(self, dummy_video_path):
+        """Test ffmpeg fixed output FPS conversion."""
+        with VideoReader(str(dummy_video_path), backend="ffmpeg", decode_fps=5.0) as reader:
+            assert reader.fps() == pytest.approx(5.0)
+            frames = list(reader)
+        
+        assert len(frames) == reader.frame_count() == 10
+        assert frames[1][2] == pytest.approx(0.2)
+    
+    def test_ffmpeg_stride_window_and_pool(self, dummy_video_path):
+        """Test stride, windows and buffer reuse on the ffmpeg backend."""
+        pool = FramePool(max_buffers=2)
+        
+        with VideoReader(
+            str(dummy_video_path), backend="ffmpeg", stride=3,
+            start_frame=4, end_frame=15, pool=pool
+        ) as reader:
+            indices = []
+            for idx, frame, ts in reader:
+                indices.append(idx)
+                pool.release(frame)
+        
+        assert indices == [4, 7, 10, 13]
+        assert pool.allocations <= 1
+    
+    def test_ffmpeg_stride_skips_in_decoder(self, dummy_video_path, monkeypatch):
+        """Test skipped frames are dropped by ffmpeg instead of crossing the pipe."""
+        with VideoReader(str(dummy_video_path)) as reader:
+            expected = {idx: frame.copy() for idx, frame, _ in reader}
+        
+        grabs = []
+        original_grab = FFmpegCapture.grab
+        
+        def counting_grab(self):
+            grabs.append(self._pos)
+            return original_grab(self)
+        
+        monkeypatch.setattr(FFmpegCapture, "grab", counting_grab)
+        
+        with VideoReader(
+            str(dummy_video_path), backend="ffmpeg", stride=4, start_frame=2
+        ) as reader:
+            assert reader.sampled_frame_count() == 5
+            actual = [(idx, frame.copy()) for idx, frame, _ in reader]
+        
+        assert [idx for idx, _ in actual] == [2, 6, 10, 14, 18]
+        for idx, frame in actual:
+            assert np.abs(frame.astype(int) - expected[idx]).mean() < 3
+        assert grabs == []
+    
+    def test_ffmpeg_index_seek(self, dummy_video_path):
+        """Test indexed random access on the ffmpeg backend."""
+        with VideoReader(str(dummy_video_path), backend="ffmpeg") as reader:
+            full = [frame.copy() for _, frame, _ in reader]
+        
+        with VideoReader(str(dummy_video_path), backend="ffmpeg", use_index=True) as reader:
+            for idx in (13, 4, 19):
+                assert np.abs(reader.read_frame(idx).astype(int) - full[idx]).mean() < 3
+    
+    def test_ffmpeg_options_require_backend(self, dummy_video_path):
+        """Test ffmpeg-only options are rejected on the OpenCV backend."""
+        with pytest.raises(ValueError):
+            VideoReader(str(dummy_video_path), pix_fmt="gray")
+        
+        with pytest.raises(ValueError):
+            VideoReader(str(dummy_video_path), backend="gstreamer")
 
 
 class TestVideoReaderWithRealVideo:
@@ -35,6 +35,17 @@ class TestDrawBoxAndLabel:
         assert result.shape == blank_frame.shape
         assert not np.array_equal(result, blank_frame)  # Should have changed
     
+    def test_draw_box_inplace(self, blank_frame):
+        """Test inplace drawing modifies and returns the same frame."""
+        expected = draw_box_and_label(blank_frame, (100, 100, 200, 150), "Label")
+        
+        result = draw_box_and_label(
+            blank_frame, (100, 100, 200, 150), "Label", inplace=True
+        )
+        
+        assert result is blank_frame
+        assert np.array_equal(result, expected)
+    
     def test_draw_box_without_label(self, blank_frame):
         """Test drawing box without label."""
         box = (50, 50, 100, 100)
@@ -305,6 +316,17 @@ class TestIntegration:
         assert frame is not None
         assert frame.shape == (480, 640, 3)
     
+    def test_put_hud_inplace(self):
+        """Test inplace HUD matches the copying version."""
+        frame = np.ones((480, 640, 3), dtype=np.uint8) * 128
+        stats = {'FPS': 30.0, 'Frame': 1}
+        expected = put_hud(frame, stats, position="bottom-right")
+        
+        result = put_hud(frame, stats, position="bottom-right", inplace=True)
+        
+        assert result is frame
+        assert np.array_equal(result, expected)
+    
     def test_multiple_boxes(self):
         """Test drawing multiple boxes on same frame."""
         frame = np.ones((480, 640, 3), dtype=np.uint8) * 128
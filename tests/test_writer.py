@@ -0,0 +1,183 @@
+"""
+Tests for VideoWriter
+"""
+
+import shutil
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from src.io.writer import VideoWriter, VideoWriterError
+
+
+def _frames(count, size=(160, 120)):
+    """Generate BGR frames with a per-frame gray level."""
+    width, height = size
+    return [np.full((height, width, 3), i * 10, dtype=np.uint8) for i in range(count)]
+
+
+def _read_levels(path):
+    """Read back the mean gray level of every frame."""
+    cap = cv2.VideoCapture(str(path))
+    levels = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        levels.append(float(frame.mean()))
+    cap.release()
+    return levels
+
+
+class TestVideoWriter:
+    """Test suite for VideoWriter."""
+    
+    def test_sync_write(self, tmp_path):
+        """Test synchronous writing produces all frames."""
+        path = tmp_path / "sync.avi"
+        
+        with VideoWriter(str(path), fps=10.0, frame_size=(160, 120), codec="MJPG") as writer:
+            for frame in _frames(5):
+                writer.write(frame)
+        
+        assert len(_read_levels(path)) == 5
+        assert writer.frames_written == 5
+    
+    def test_async_write_keeps_order(self, tmp_path):
+        """Test the async encoder writes every frame in order and notifies on_written."""
+        path = tmp_path / "async.avi"
+        done = []
+        
+        with VideoWriter(
+            str(path), fps=10.0, frame_size=(160, 120), codec="MJPG",
+            queue_size=2, on_written=done.append
+        ) as writer:
+            frames = _frames(12)
+            for frame in frames:
+                writer.write(frame)
+        
+        levels = _read_levels(path)
+        assert len(levels) == 12
+        assert levels == sorted(levels)
+        assert [id(f) for f in done] == [id(f) for f in frames]
+    
+    def test_async_drop_policy(self, tmp_path):
+        """Test on_full='drop' discards frames instead of blocking."""
+        path = tmp_path / "drop.avi"
+        gate = threading.Event()
+        
+        def slow_encoder(frame):
+            # Segura apenas a thread de encode; descartes chegam no chamador
+            if threading.current_thread() is not threading.main_thread():
+                gate.wait()
+        
+        writer = VideoWriter(
+            str(path), fps=10.0, frame_size=(160, 120), codec="MJPG",
+            queue_size=1, on_full="drop", on_written=slow_encoder
+        )
+        
+        for frame in _frames(6):
+            writer.write(frame)
+        gate.set()
+        writer.release()
+        
+        assert writer.frames_dropped > 0
+        assert writer.frames_written + writer.frames_dropped == 6
+    
+    def test_async_error_surfaces(self, tmp_path):
+        """Test encode errors are raised on the next write or on release."""
+        path = tmp_path / "error.avi"
+        
+        def fail(frame):
+            raise RuntimeError("encoder failed")
+        
+        writer = VideoWriter(
+            str(path), fps=10.0, frame_size=(160, 120), codec="MJPG",
+            queue_size=4, on_written=fail
+        )
+        writer.write(_frames(1)[0])
+        
+        with pytest.raises(VideoWriterError, match="encoder failed"):
+            writer.flush()
+        
+        writer.write(_frames(1)[0])
+        with pytest.raises(VideoWriterError):
+            writer.release()
+    
+    def test_invalid_queue_options(self, tmp_path):
+        """Test invalid async options are rejected."""
+        with pytest.raises(ValueError):
+            VideoWriter(str(tmp_path / "x.avi"), 10.0, (160, 120), codec="MJPG", queue_size=-1)
+        
+        with pytest.raises(ValueError):
+            VideoWriter(str(tmp_path / "x.avi"), 10.0, (160, 120), codec="MJPG", on_full="skip")
+    
+    def test_ffmpeg_options_require_backend(self, tmp_path):
+        """Test ffmpeg-only options are rejected on the OpenCV backend."""
+        with pytest.raises(ValueError):
+            VideoWriter(str(tmp_path / "x.avi"), 10.0, (160, 120), codec="MJPG", crf=23)
+        
+        with pytest.raises(ValueError):
+            VideoWriter(str(tmp_path / "x.avi"), 10.0, (160, 120), backend="gstreamer")
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not available")
+class TestVideoWriterFFmpegBackend:
+    """Test suite for the ffmpeg encoder backend."""
+    
+    def test_h264_roundtrip(self, tmp_path):
+        """Test H.264 output decodes back with all frames in order."""
+        path = tmp_path / "h264.mp4"
+        
+        with VideoWriter(
+            str(path), fps=10.0, frame_size=(160, 120), backend="ffmpeg",
+            crf=18, preset="ultrafast", threads=1
+        ) as writer:
+            for frame in _frames(12):
+                writer.write(frame)
+        
+        levels = _read_levels(path)
+        assert len(levels) == 12
+        assert levels == sorted(levels)
+        assert abs(levels[-1] - 110) < 5
+    
+    def test_odd_size_is_padded(self, tmp_path):
+        """Test odd frame sizes are padded to even for yuv420p."""
+        path = tmp_path / "odd.mp4"
+        
+        with VideoWriter(str(path), fps=10.0, frame_size=(161, 121), backend="ffmpeg") as writer:
+            for frame in _frames(5, size=(161, 121)):
+                writer.write(frame)
+        
+        cap = cv2.VideoCapture(str(path))
+        ret, frame = cap.read()
+        cap.release()
+        
+        assert ret
+        assert frame.shape[:2] == (122, 162)
+    
+    def test_async_queue(self, tmp_path):
+        """Test the ffmpeg backend with the async encode queue."""
+        path = tmp_path / "async.mp4"
+        
+        with VideoWriter(
+            str(path), fps=10.0, frame_size=(160, 120), backend="ffmpeg", queue_size=4
+        ) as writer:
+            for frame in _frames(12):
+                writer.write(frame)
+        
+        assert writer.frames_written == 12
+        assert len(_read_levels(path)) == 12
+    
+    def test_encoder_failure_raises(self, tmp_path):
+        """Test an invalid encoder surfaces as VideoWriterError."""
+        with pytest.raises(VideoWriterError):
+            writer = VideoWriter(
+                str(tmp_path / "bad.mp4"), fps=10.0, frame_size=(160, 120),
+                backend="ffmpeg", codec="no-such-encoder"
+            )
+            for frame in _frames(12):
+                writer.write(frame)
+            writer.release()